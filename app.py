@@ -3,205 +3,545 @@
 
 import os
 import re
-import csv
 import json
 import io
-from bs4 import BeautifulSoup
-from flask import Flask, render_template, request, send_file, flash, redirect, url_for, jsonify
+import uuid
+import time
+import queue
+import shutil
+import threading
+import multiprocessing
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from flask import Flask, Response, render_template, request, flash, redirect, url_for, jsonify, send_file
 from werkzeug.utils import secure_filename
 import zipfile
-from pathlib import Path
+import zlib
+
+from irsaliye import (
+    Aggregator, CsvRecordWriter, IrsaliyeStore, JsonArrayRecordWriter, JsonLinesRecordWriter, ResultCache,
+    build_line_index, iter_export_chunks, parse, read_records_page
+)
+from irsaliye.aggregate import AGGREGATE_GROUPS, write_group_csv
+from irsaliye.extract import parse_with_metrics
+from irsaliye.fields import fields_signature, import_field_modules
+from irsaliye.metrics import ParseMetrics
+from irsaliye.prefilter import BatchFilter
+from irsaliye.service import ParseServiceClient, ServiceBusyError
+from irsaliye.columnar import COLUMNAR_FORMATS, ColumnarDocumentWriter, columnar_available, columnar_paths
 
 app = Flask(__name__)
 app.secret_key = 'yga_irsaliye_parser_secret_key_2025'
-app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB limit
+# ZIP'ler diske kaydedilip üye üye okunduğundan yükleme sınırı belleğe bağlı değildir
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_UPLOAD_MB', 4096)) * 1024 * 1024
 
 UPLOAD_FOLDER = 'uploads'
 RESULTS_FOLDER = 'results'
+CACHE_FOLDER = 'cache'
+JOBS_FOLDER = 'jobs'
 ALLOWED_EXTENSIONS = {'html', 'zip'}
 
+# Arka planda aynı anda işlenen yükleme sayısı (process başına)
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+JOB_PROGRESS_INTERVAL = 0.5  # saniye
+JOB_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+# İş sonuçlarının saklanma süresi ve temizlik aralığı
+RESULT_TTL = int(os.environ.get('RESULT_TTL_HOURS', 24)) * 3600
+CLEANUP_INTERVAL = 600  # saniye
+# Sonuç sayfasında sayfa başına gösterilen kayıt; /jobs/<id>/records için varsayılan ve üst sınır
+RESULTS_PAGE_SIZE = 50
+RECORDS_DEFAULT_LIMIT = 100
+RECORDS_MAX_LIMIT = 1000
+# Sonuç sayfasında malzeme / adres / gün toplamlarından gösterilen satır
+SUMMARY_TOP = 10
+# İndirmelerde diskten okunan / gzip'e verilen parça boyutu
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Parse worker process sayısı ve aynı anda bellekte bekleyebilecek belge sayısı
+PARSE_WORKERS = int(os.environ.get('PARSE_WORKERS', os.cpu_count() or 1))
+PARSE_WINDOW = PARSE_WORKERS * 4
+
+# IRSALIYE_SERVICE_SOCKET verilirse belgeler bu process'te havuz açmak yerine paylaşılan
+# parse servisine (python -m irsaliye.service) gönderilir; PARSE_WORKERS sadece pencereyi belirler
+IRSALIYE_SERVICE_SOCKET = os.environ.get('IRSALIYE_SERVICE_SOCKET')
+IRSALIYE_SERVICE_TIMEOUT = float(os.environ.get('IRSALIYE_SERVICE_TIMEOUT', 70))
+
+# register_field ile ek alan kaydeden modüller (virgülle ayrılmış); spawn ile başlayan parse worker'ları
+# sadece __main__'i yeniden yükler, bu modüller hem burada hem worker'larda yüklenir
+FIELD_MODULES = [module.strip() for module in os.environ.get('IRSALIYE_FIELD_MODULES', '').split(',')
+                 if module.strip()]
+import_field_modules(FIELD_MODULES)
+
+# Zip bombası korumaları
+ZIP_MAX_MEMBERS = int(os.environ.get('ZIP_MAX_MEMBERS', 200000))
+ZIP_MAX_MEMBER_SIZE = 32 * 1024 * 1024  # tek HTML için açılmış boyut
+ZIP_MAX_RATIO = 200  # açılmış / sıkıştırılmış boyut
+ZIP_MAX_TOTAL_SIZE = int(os.environ.get('ZIP_MAX_TOTAL_GB', 50)) * 1024 * 1024 * 1024
+
 # Klasörleri oluştur
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(RESULTS_FOLDER, exist_ok=True)
+os.makedirs(CACHE_FOLDER, exist_ok=True)
+os.makedirs(JOBS_FOLDER, exist_ok=True)
+
+# Tekrar yüklenen irsaliyeler hash ile tanınır ve yeniden parse edilmez
+result_cache = ResultCache(os.path.join(CACHE_FOLDER, 'irsaliye_cache.sqlite3'))
+
+# IRSALIYE_DB verilirse tüm işlerin irsaliyeleri bu SQLite deposunda birikir ve /query ile sorgulanır
+IRSALIYE_DB = os.environ.get('IRSALIYE_DB')
+irsaliye_store = IrsaliyeStore(IRSALIYE_DB) if IRSALIYE_DB else None
+QUERY_MAX_LIMIT = 10000
+
+# Process ömrü boyunca aşama süreleri ve sayaçlar; /metrics ile Prometheus'a açılır
+parse_metrics = ParseMetrics()
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 class IrsaliyeParserWeb:
-    def __init__(self):
-        self.parsed_data = []
+    def __init__(self, cache=None, metrics=None):
+        self.cache = cache
+        self.metrics = metrics
     
-    def extract_text_from_cell(self, element):
-        """HTML elementinden temiz metin çıkarır"""
-        if element is None:
-            return ""
-        return element.get_text(strip=True)
-    
-    def parse_html_content(self, content, filename):
-        """HTML içeriğini parse eder"""
+    def parse_html_bytes(self, raw, filename):
+        """Ham HTML baytlarından Irsaliye döndürür (hata durumunda None); önbellekte varsa soup oluşturulmaz"""
         try:
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # İrsaliye verileri
-            irsaliye_data = {
-                'dosya_adi': filename,
-                'irsaliye_no': '',
-                'irsaliye_tarihi': '',
-                'sevk_adresi': '',
-                'sevk_edilen_kisi': '',
-                'sevk_edilen_tel': '',
-                'malzeme_kodu': '',
-                'malzeme_aciklama': '',
-                'adeti': '',
-                'not_bilgileri': ''
-            }
-            
-            # QR code div içindeki JSON veriyi bul
-            qr_div = soup.find('div', id='qrvalue')
-            if qr_div and qr_div.get_text(strip=True):
-                try:
-                    json_text = qr_div.get_text(strip=True)
-                    qr_data = json.loads(json_text)
-                    
-                    # JSON'dan temel bilgileri al
-                    irsaliye_data['irsaliye_no'] = qr_data.get('no', '')
-                    irsaliye_data['irsaliye_tarihi'] = qr_data.get('tarih', '')
-                    
-                except json.JSONDecodeError as e:
-                    print(f"JSON parse hatası: {e}")
-            
-            # Sevk edilen kişi bilgisini bul (customerPartyTable'dan)
-            customer_table = soup.find('table', id='customerPartyTable')
-            if customer_table:
-                # "SAYIN" sonrası kısmı bul
-                sayin_found = False
-                for row in customer_table.find_all('tr'):
-                    cell_text = self.extract_text_from_cell(row.find('td'))
-                    if 'SAYIN' in cell_text:
-                        sayin_found = True
-                        continue
-                    
-                    # SAYIN'dan sonraki satırda isim var
-                    if sayin_found and cell_text and cell_text.strip():
-                        # HTML etiketlerini temizle ve ismi al
-                        clean_text = cell_text.strip()
-                        if clean_text and len(clean_text) > 2:  # Çok kısa metinleri atla
-                            irsaliye_data['sevk_edilen_kisi'] = clean_text
-                            break
-            
-            # Sevk Adresi'ni bul
-            sevk_adresi_pattern = r'Sevk Adresi:(.*?)</span>'
-            match = re.search(sevk_adresi_pattern, content)
-            if match:
-                sevk_adresi_raw = match.group(1).strip()
-                # HTML etiketlerini temizle
-                sevk_adresi_clean = BeautifulSoup(sevk_adresi_raw, 'html.parser').get_text(strip=True)
-                
-                # Telefon numarasını ayır
-                tel_pattern = r'Tel:(\d+)'
-                tel_match = re.search(tel_pattern, sevk_adresi_clean)
-                if tel_match:
-                    irsaliye_data['sevk_edilen_tel'] = tel_match.group(1)
-                    # Telefon numarasını adresten çıkar
-                    irsaliye_data['sevk_adresi'] = re.sub(r'\s*Tel:\d+', '', sevk_adresi_clean).strip()
-                else:
-                    irsaliye_data['sevk_adresi'] = sevk_adresi_clean
-            
-            # Malzeme tablosunu bul ve parse et
-            tables = soup.find_all('table')
-            malzeme_bulundu = False
-            
-            for table in tables:
-                # Malzeme tablosunu tanımla (Malzeme Kodu başlığı olan tablo)
-                headers = table.find_all('th') or table.find_all('td')
-                header_texts = [self.extract_text_from_cell(th) for th in headers]
-                
-                if any('Malzeme Kodu' in header for header in header_texts):
-                    # Bu malzeme tablosu
-                    rows = table.find_all('tr')[1:]  # İlk satır başlık
-                    
-                    for row in rows:
-                        cells = row.find_all('td')
-                        if len(cells) >= 3:
-                            malzeme_kodu = self.extract_text_from_cell(cells[1])  # 2. sütun
-                            malzeme_aciklama = self.extract_text_from_cell(cells[2])  # 3. sütun
-                            miktar_cell = self.extract_text_from_cell(cells[3]) if len(cells) > 3 else ""  # 4. sütun
-                            
-                            # Miktarı temizle (sadece sayıları al)
-                            miktar_match = re.search(r'(\d+)', miktar_cell)
-                            miktar = miktar_match.group(1) if miktar_match else ""
-                            
-                            if malzeme_kodu:  # Boş satırları atla
-                                irsaliye_entry = irsaliye_data.copy()
-                                irsaliye_entry['malzeme_kodu'] = malzeme_kodu
-                                irsaliye_entry['malzeme_aciklama'] = malzeme_aciklama
-                                irsaliye_entry['adeti'] = miktar
-                                self.parsed_data.append(irsaliye_entry)
-                                malzeme_bulundu = True
-            
-            # Açıklamalar tablosunu bul
-            for table in tables:
-                headers = table.find_all('th')
-                if any('Açıklamalar' in self.extract_text_from_cell(th) for th in headers):
-                    rows = table.find_all('tr')[1:]  # İlk satır başlık
-                    for row in rows:
-                        cells = row.find_all('td')
-                        if len(cells) >= 2:
-                            not_label = self.extract_text_from_cell(cells[0])
-                            not_content = self.extract_text_from_cell(cells[1])
-                            if 'Not:' in not_label and not_content:
-                                # Bu not bilgisini tüm malzeme satırlarına ekle
-                                for entry in self.parsed_data:
-                                    if entry['dosya_adi'] == filename:
-                                        entry['not_bilgileri'] = not_content
-            
-            # Eğer malzeme bulunamadıysa, en azından temel bilgileri kaydet
-            if not malzeme_bulundu:
-                self.parsed_data.append(irsaliye_data)
-                
+            return parse(raw, filename, self.cache, self.metrics)
         except Exception as e:
+            if self.metrics:
+                self.metrics.count('errors')
             print(f"Hata: {filename} dosyası işlenirken hata oluştu: {str(e)}")
-            return False
-        
-        return True
+            return None
+
+@app.route('/')
+def index():
+    return render_template('index.html')
+
+def job_state_path(job_id):
+    return os.path.join(JOBS_FOLDER, f'{job_id}.json')
+
+def load_job(job_id):
+    """İş durumunu diskten okur; iş yoksa veya id geçersizse None döndürür"""
+    if not JOB_ID_RE.match(job_id):
+        return None
+    try:
+        with open(job_state_path(job_id), encoding='utf-8') as job_file:
+            return json.load(job_file)
+    except FileNotFoundError:
+        return None
+
+def save_job(job):
+    """İş durumunu diske atomik olarak yazar (tüm gunicorn worker'ları okuyabilir)"""
+    job['updated_at'] = time.time()
+    # Thread kimlikleri gunicorn worker'ları arasında tekrar edebilir; process kimliği de eklenir
+    tmp_path = f'{job_state_path(job["id"])}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as job_file:
+        json.dump(job, job_file, ensure_ascii=False)
+    os.replace(tmp_path, job_state_path(job['id']))
+
+def job_status(job):
+    """İşin önizleme hariç durum özetini döndürür"""
+    status = {key: value for key, value in job.items() if key not in ('preview', 'files')}
+    status['status_url'] = url_for('job_status_view', job_id=job['id'])
+    status['results_url'] = url_for('job_results', job_id=job['id'])
+    return status
+
+class JobQueue:
+    """Yükleme işlerini arka plandaki worker thread'lerinde işleyen yerel kuyruk (harici broker yok)"""
     
-    def parse_single_html_file(self, file_path_or_content, filename):
-        """Tek bir HTML dosyasını parse eder"""
-        try:
-            if isinstance(file_path_or_content, str) and os.path.isfile(file_path_or_content):
-                # Dosya yolu verildi
-                encodings = ['utf-16', 'utf-8', 'utf-16-le', 'utf-16-be', 'latin-1', 'cp1252']
-                content = ""
-                
-                for encoding in encodings:
-                    try:
-                        with open(file_path_or_content, 'r', encoding=encoding) as file:
-                            content = file.read()
-                        break  # Başarılı okuma
-                    except UnicodeDecodeError:
-                        continue
-                
-                if not content:
-                    return False
-            else:
-                # İçerik direkt verildi
-                content = file_path_or_content
+    def __init__(self, worker_count, handler):
+        self.worker_count = worker_count
+        self.handler = handler
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._started_pid = None
+    
+    def submit(self, job_id):
+        self._ensure_workers()
+        self._queue.put(job_id)
+    
+    def _ensure_workers(self):
+        # Thread'ler fork sonrası aktarılmaz; her process kendi worker'larını başlatır
+        with self._lock:
+            if self._started_pid == os.getpid():
+                return
+            for _ in range(self.worker_count):
+                threading.Thread(target=self._work, daemon=True).start()
+            self._started_pid = os.getpid()
+    
+    def _work(self):
+        while True:
+            job_id = self._queue.get()
+            try:
+                self.handler(job_id)
+            except Exception as e:
+                parse_metrics.count_labeled('jobs', 'state', 'failed')
+                job = load_job(job_id)
+                if job:
+                    job['state'] = 'failed'
+                    job['error'] = str(e)
+                    save_job(job)
+            finally:
+                self._queue.task_done()
+
+def iter_zip_documents(path, messages):
+    """ZIP üyelerini tek tek açıp (dosya adı, ham içerik) üretir; arşiv belleğe alınmaz
+    
+    Zip bombalarına karşı üye sayısı, üye boyutu, sıkıştırma oranı ve toplam açılmış
+    boyut sınırlanır.
+    """
+    with zipfile.ZipFile(path, 'r') as zip_ref:
+        members = [info for info in zip_ref.infolist() if info.filename.endswith('.html') and not info.is_dir()]
+        if len(members) > ZIP_MAX_MEMBERS:
+            messages.append(f'ZIP dosyasında {len(members)} HTML var, en fazla {ZIP_MAX_MEMBERS} işlenebilir.')
+            return
+        
+        skipped = 0
+        total_size = 0
+        for info in members:
+            if info.file_size > ZIP_MAX_MEMBER_SIZE or info.file_size > info.compress_size * ZIP_MAX_RATIO:
+                skipped += 1
+                continue
             
-            return self.parse_html_content(content, filename)
+            # Başlıktaki boyuta güvenmeden okumayı sınırla
+            with zip_ref.open(info) as member:
+                raw = member.read(ZIP_MAX_MEMBER_SIZE + 1)
+            if len(raw) > ZIP_MAX_MEMBER_SIZE:
+                skipped += 1
+                continue
             
-        except Exception as e:
-            print(f"Hata: {filename} dosyası işlenirken hata oluştu: {str(e)}")
-            return False
+            total_size += len(raw)
+            if total_size > ZIP_MAX_TOTAL_SIZE:
+                messages.append('ZIP dosyasının açılmış boyutu sınırı aştı, kalan dosyalar işlenmedi.')
+                break
+            yield info.filename, raw
+        
+        if skipped:
+            messages.append(f'ZIP dosyasındaki {skipped} HTML boyut veya sıkıştırma oranı sınırını aştığı için atlandı.')
+
+def iter_uploaded_documents(job_folder, uploaded_files, messages):
+    """Kaydedilen HTML ve ZIP dosyalarından (dosya adı, ham içerik) çiftlerini sırayla üretir"""
+    for uploaded in uploaded_files:
+        path = os.path.join(job_folder, uploaded['path'])
+        
+        if uploaded['name'].endswith('.zip'):
+            # ZIP dosyasını işle
+            try:
+                yield from iter_zip_documents(path, messages)
+            except Exception as e:
+                messages.append(f'ZIP dosyası işlenirken hata: {str(e)}')
+        
+        elif uploaded['name'].endswith('.html'):
+            # Tek HTML dosyasını işle
+            with open(path, 'rb') as html_file:
+                yield uploaded['name'], html_file.read()
+
+def count_uploaded_documents(job_folder, uploaded_files):
+    """İlerleme için toplam HTML sayısını bulur (ZIP'lerde sadece merkezi dizin okunur)"""
+    total = 0
+    for uploaded in uploaded_files:
+        if uploaded['name'].endswith('.zip'):
+            try:
+                with zipfile.ZipFile(os.path.join(job_folder, uploaded['path']), 'r') as zip_ref:
+                    total += sum(1 for name in zip_ref.namelist() if name.endswith('.html'))
+            except zipfile.BadZipFile:
+                continue
+        else:
+            total += 1
+    return total
+
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+def get_parse_pool():
+    """Process başına paylaşılan parse havuzunu döndürür (PARSE_WORKERS <= 1 ise None)"""
+    global _parse_pool
+    if PARSE_WORKERS <= 1:
+        return None
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            # İş thread'leri çalışırken fork güvenli değil; worker'lar spawn ile başlatılır.
+            # Ek alanlar worker'larda da kaydedilir; kayıtlar bu process'tekinden farklıysa worker
+            # başlamaz, eksik alanlı belgeler önbelleğe bu process'in anahtarıyla yazılmaz
+            _parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS,
+                                              mp_context=multiprocessing.get_context('spawn'),
+                                              initializer=import_field_modules,
+                                              initargs=(FIELD_MODULES, fields_signature()))
+        return _parse_pool
+
+def submit_to_parse_pool(raw, filename):
+    """Belgeyi paylaşılan parse havuzuna verir; havuz bozulmuşsa (bir worker öldüyse) yenisini açar"""
+    global _parse_pool
+    pool = get_parse_pool()
+    try:
+        return pool.submit(parse_with_metrics, raw, filename)
+    except BrokenProcessPool:
+        # Başka bir iş thread'i havuzu çoktan yenilemiş olabilir; sadece bozuk olan kapatılır
+        with _parse_pool_lock:
+            if _parse_pool is pool:
+                _parse_pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+        return get_parse_pool().submit(parse_with_metrics, raw, filename)
+
+_parse_service = None
+
+def get_parse_service():
+    """Parse servisi istemcisini döndürür (IRSALIYE_SERVICE_SOCKET ayarlı değilse None)"""
+    global _parse_service
+    if not IRSALIYE_SERVICE_SOCKET:
+        return None
+    with _parse_pool_lock:
+        if _parse_service is None:
+            _parse_service = ParseServiceClient(IRSALIYE_SERVICE_SOCKET, timeout=IRSALIYE_SERVICE_TIMEOUT,
+                                                concurrency=PARSE_WINDOW)
+        return _parse_service
+
+# Parse edilemeyen belgelerin sebepleri: iş durumunda 'failures', /metrics'te irsaliye_failures_total{reason=...}
+FAILURE_TIMEOUT = 'zaman-asimi'
+FAILURE_BUSY = 'servis-dolu'
+FAILURE_ERROR = 'hata'
+FAILURE_REASONS = [FAILURE_TIMEOUT, FAILURE_BUSY, FAILURE_ERROR]
+
+def failure_reason(error):
+    """Parse hatasının sebebi (FAILURE_REASONS)"""
+    if isinstance(error, TimeoutError):
+        return FAILURE_TIMEOUT
+    if isinstance(error, ServiceBusyError):
+        return FAILURE_BUSY
+    return FAILURE_ERROR
+
+def iter_prefiltered(documents, batch_filter):
+    """Ön filtreye takılan belgeleri (irsaliye değil, QR no + tarih tekrarı) parse etmeden ayıklar"""
+    for filename, raw in documents:
+        reason = batch_filter.check(raw)
+        if reason:
+            parse_metrics.count_labeled('skipped', 'reason', reason)
+            continue
+        yield filename, raw
+
+def iter_parsed_documents(documents, batch_filter=None, failures=None):
+    """(dosya adı, Irsaliye) çiftlerini girdi sırasıyla üretir; hatalı belgede Irsaliye None
     
-    def get_parsed_data(self):
-        return self.parsed_data
+    Önbellekte olmayan belgeler parse servisine (ayarlıysa) veya parse havuzuna dağıtılır. Aynı anda en fazla
+    PARSE_WINDOW belge beklediğinden bellek kullanımı yükleme boyutundan bağımsızdır.
+    batch_filter verilirse ön filtreye takılan belgeler hiç üretilmez. Havuzun bir worker'ı ölürse
+    (bellek yetmedi, lxml çöktü) bekleyen belgeler yenilenen havuzda bir kez daha denenir; worker'ı
+    yine öldüren belge hatalı sayılır, sonraki belgeler ve işler etkilenmez. failures (Counter) verilirse
+    parse edilemeyen belgeler sebebine (FAILURE_REASONS) göre sayılır.
+    """
+    def failed(filename, reason):
+        parse_metrics.count_labeled('failures', 'reason', reason)
+        if failures is not None:
+            failures[reason] += 1
+        return filename, None
     
-    def clear_data(self):
-        self.parsed_data = []
+    if batch_filter is not None:
+        documents = iter_prefiltered(documents, batch_filter)
+    
+    service = get_parse_service()
+    if service is not None:
+        submit = service.submit
+    else:
+        pool = get_parse_pool()
+        if pool is None:
+            parser = IrsaliyeParserWeb(cache=result_cache, metrics=parse_metrics)
+            for filename, raw in documents:
+                document = parser.parse_html_bytes(raw, filename)
+                yield (filename, document) if document is not None else failed(filename, FAILURE_ERROR)
+            return
+        submit = submit_to_parse_pool
+    
+    def finish(filename, cache_key, raw, document, future):
+        if future is not None:
+            try:
+                try:
+                    document, metrics_snapshot = future.result()
+                except BrokenProcessPool:
+                    # Havuzdaki bir worker öldü; belge yeni havuzda hemen tekrar denenir ve beklenir.
+                    # Ölüm bu belgeden değilse sonuç gelir, bu belgedense sadece o hatalı sayılır
+                    document, metrics_snapshot = submit_to_parse_pool(raw, filename).result()
+            except Exception as e:
+                # Worker'daki ölçümler hata ile kaybolur; dosya ve hata burada sayılır
+                parse_metrics.count('files')
+                parse_metrics.count('errors')
+                print(f"Hata: {filename} dosyası işlenirken hata oluştu: {str(e)}")
+                return failed(filename, failure_reason(e))
+            parse_metrics.merge(metrics_snapshot)
+            result_cache.put(cache_key, document)
+        return filename, document
+    
+    pending = deque()
+    for filename, raw in documents:
+        cache_key = result_cache.key_for(raw)
+        document = result_cache.get(cache_key, filename)
+        if document is not None:
+            parse_metrics.count('files')
+            parse_metrics.count('cache_hits')
+            parse_metrics.count('documents')
+            parse_metrics.count('rows', document.record_count())
+        future = submit(raw, filename) if document is None else None
+        pending.append((filename, cache_key, raw if future is not None else None, document, future))
+        if len(pending) >= PARSE_WINDOW:
+            yield finish(*pending.popleft())
+    while pending:
+        yield finish(*pending.popleft())
 
-@app.route('/')
-def index():
-    return render_template('index.html')
+def run_upload_job(job_id):
+    """Bir yükleme işini parse edip sonuçları kaydeder, ilerlemeyi iş durumuna yazar"""
+    job = load_job(job_id)
+    job_folder = os.path.join(UPLOAD_FOLDER, job_id)
+    job['state'] = 'running'
+    job['total_files'] = count_uploaded_documents(job_folder, job['files'])
+    save_job(job)
+    
+    last_saved = time.monotonic()
+    
+    # Kayıtlar işe özel klasörde JSON Lines olarak saklanır; indirmeler buradan akıtılır
+    result_folder = job_result_folder(job_id)
+    os.makedirs(result_folder, exist_ok=True)
+    records_path = os.path.join(result_folder, 'records.jsonl')
+    
+    batch_filter = BatchFilter()
+    failures = Counter()
+    # Malzeme / adres / gün toplamları kayıtlar yazılırken güncellenir; sonuçlar ikinci kez okunmaz
+    aggregator = Aggregator()
+    try:
+        with JsonLinesRecordWriter(records_path + '.tmp') as records_writer:
+            documents = iter_uploaded_documents(job_folder, job['files'], job['messages'])
+            for filename, document in iter_parsed_documents(documents, batch_filter, failures):
+                if document is not None:
+                    job['processed_files'] += 1
+                    started = time.perf_counter()
+                    if irsaliye_store:
+                        irsaliye_store.write_document(document)
+                    aggregator.write_document(document)
+                    # Satırlar sadece yazılırken üretilir, bellekte tutulmaz
+                    for record in document.records():
+                        records_writer.write(record)
+                    parse_metrics.observe('export', time.perf_counter() - started)
+                    job['total_records'] = records_writer.count
+                
+                # İlerleme durumunu her dosyada değil, aralıklarla yaz
+                if time.monotonic() - last_saved > JOB_PROGRESS_INTERVAL:
+                    job['skipped_files'] = sum(batch_filter.skipped.values())
+                    job['failed_files'] = sum(failures.values())
+                    save_job(job)
+                    last_saved = time.monotonic()
+        if irsaliye_store:
+            irsaliye_store.flush()
+        os.replace(records_path + '.tmp', records_path)
+        # Sayfalama için seyrek satır ofset indeksi; sonuç sayfası ve /records baştan okumadan atlar
+        build_line_index(records_path)
+        save_job_summary(job_id, aggregator)
+        
+        job['skipped'] = dict(batch_filter.skipped)
+        job['skipped_files'] = sum(batch_filter.skipped.values())
+        if batch_filter.skipped:
+            job['messages'].append(f'Ön filtre: {batch_filter.summary()}.')
+        job['failures'] = dict(failures)
+        job['failed_files'] = sum(failures.values())
+        if failures:
+            details = ', '.join(f'{reason}: {failures[reason]}' for reason in FAILURE_REASONS if failures[reason])
+            job['messages'].append(f'{job["failed_files"]} dosya işlenemedi ({details}).')
+        job['state'] = 'done'
+        save_job(job)
+        parse_metrics.count_labeled('jobs', 'state', 'done')
+    finally:
+        # Başarısız işte de bekleyen önbellek yazımları işlenir
+        result_cache.flush()
+        shutil.rmtree(job_folder, ignore_errors=True)
+
+def job_result_folder(job_id):
+    return os.path.join(RESULTS_FOLDER, job_id)
+
+def job_records_path(job_id):
+    return os.path.join(job_result_folder(job_id), 'records.jsonl')
+
+def iter_job_records(job_id):
+    """İşin saklanan kayıtlarını diskten tek tek okur"""
+    with open(job_records_path(job_id), encoding='utf-8') as records_file:
+        for line in records_file:
+            yield json.loads(line)
+
+def job_summary_path(job_id):
+    return os.path.join(job_result_folder(job_id), 'summary.json')
+
+def save_job_summary(job_id, aggregator):
+    # Eşzamanlı istekler (başka process'lerdekiler dahil) aynı geçici dosyaya yazmasın
+    tmp_path = f'{job_summary_path(job_id)}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as summary_file:
+        json.dump(aggregator.summary(), summary_file, ensure_ascii=False)
+    os.replace(tmp_path, job_summary_path(job_id))
+
+def load_job_summary(job_id, limit=None):
+    """İşin malzeme / adres / gün toplamları; özeti olmayan eski işlerde kayıtlardan bir kez hesaplanır"""
+    if not os.path.exists(job_summary_path(job_id)):
+        with Aggregator() as aggregator:
+            for record in iter_job_records(job_id):
+                aggregator.write(record)
+        save_job_summary(job_id, aggregator)
+    with open(job_summary_path(job_id), encoding='utf-8') as summary_file:
+        summary = json.load(summary_file)
+    if limit is not None:
+        for group in AGGREGATE_GROUPS:
+            summary[group] = summary[group][:limit]
+    return summary
+
+def iter_job_records_bytes(job_id):
+    """Saklanan JSON Lines dosyasını yeniden serileştirmeden parça parça okur"""
+    with open(job_records_path(job_id), 'rb') as records_file:
+        while True:
+            chunk = records_file.read(DOWNLOAD_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+def iter_gzip_chunks(chunks):
+    """Bayt parçalarını akış halinde gzip'ler; sıkıştırıcı sadece kendi penceresini tutar"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # 31: gzip başlığı
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def parse_page_args(default_limit, max_limit):
+    """offset/limit sorgu parametreleri; geçersizse ValueError"""
+    offset = int(request.args.get('offset', 0))
+    limit = int(request.args.get('limit', default_limit))
+    if offset < 0 or limit < 0:
+        raise ValueError
+    return offset, min(limit, max_limit)
+
+def cleanup_expired_jobs():
+    """Süresi (RESULT_TTL) dolan işlerin durumunu, sonuçlarını ve yüklemelerini siler"""
+    expires_before = time.time() - RESULT_TTL
+    for entry in os.scandir(JOBS_FOLDER):
+        job_id = entry.name.split('.', 1)[0]
+        if not JOB_ID_RE.match(job_id) or entry.stat().st_mtime >= expires_before:
+            continue
+        shutil.rmtree(job_result_folder(job_id), ignore_errors=True)
+        shutil.rmtree(os.path.join(UPLOAD_FOLDER, job_id), ignore_errors=True)
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+_last_cleanup = 0.0
+
+def maybe_cleanup_expired_jobs():
+    """Temizliği process başına en fazla CLEANUP_INTERVAL aralıkla çalıştırır"""
+    global _last_cleanup
+    if time.monotonic() - _last_cleanup < CLEANUP_INTERVAL:
+        return
+    _last_cleanup = time.monotonic()
+    cleanup_expired_jobs()
+
+job_queue = JobQueue(JOB_WORKERS, run_upload_job)
+
+def wants_json():
+    return request.accept_mimetypes.best == 'application/json'
 
 @app.route('/upload', methods=['POST'])
 def upload_files():
@@ -215,109 +555,261 @@ def upload_files():
         flash('Dosya seçilmedi!')
         return redirect(request.url)
     
-    parser = IrsaliyeParserWeb()
-    processed_count = 0
-    total_count = 0
+    maybe_cleanup_expired_jobs()
+    
+    # Dosyalar diske kaydedilip iş kuyruğa alınır; parse işlemi istek dışında yapılır
+    job_id = uuid.uuid4().hex
+    job_folder = os.path.join(UPLOAD_FOLDER, job_id)
+    os.makedirs(job_folder)
     
+    uploaded_files = []
     for file in files:
         if file and allowed_file(file.filename):
             filename = secure_filename(file.filename)
-            
-            if filename.endswith('.zip'):
-                # ZIP dosyasını işle
-                try:
-                    with zipfile.ZipFile(file, 'r') as zip_ref:
-                        for zip_info in zip_ref.infolist():
-                            if zip_info.filename.endswith('.html'):
-                                total_count += 1
-                                try:
-                                    html_content = zip_ref.read(zip_info).decode('utf-8')
-                                    if parser.parse_single_html_file(html_content, zip_info.filename):
-                                        processed_count += 1
-                                except:
-                                    # UTF-8 başarısız, diğer encodingleri dene
-                                    encodings = ['utf-16', 'utf-16-le', 'utf-16-be', 'latin-1', 'cp1252']
-                                    for encoding in encodings:
-                                        try:
-                                            html_content = zip_ref.read(zip_info).decode(encoding)
-                                            if parser.parse_single_html_file(html_content, zip_info.filename):
-                                                processed_count += 1
-                                            break
-                                        except:
-                                            continue
-                except Exception as e:
-                    flash(f'ZIP dosyası işlenirken hata: {str(e)}')
-                    
-            elif filename.endswith('.html'):
-                # Tek HTML dosyasını işle
-                total_count += 1
-                try:
-                    html_content = file.read().decode('utf-8')
-                    if parser.parse_single_html_file(html_content, filename):
-                        processed_count += 1
-                except:
-                    # UTF-8 başarısız, diğer encodingleri dene
-                    file.seek(0)  # Dosya pointerını başa al
-                    encodings = ['utf-16', 'utf-16-le', 'utf-16-be', 'latin-1', 'cp1252']
-                    for encoding in encodings:
-                        try:
-                            file.seek(0)
-                            html_content = file.read().decode(encoding)
-                            if parser.parse_single_html_file(html_content, filename):
-                                processed_count += 1
-                            break
-                        except:
-                            continue
-    
-    # Sonuçları kaydet
-    parsed_data = parser.get_parsed_data()
-    
-    if parsed_data:
-        # CSV oluştur
-        csv_path = os.path.join(RESULTS_FOLDER, 'irsaliye_verileri.csv')
-        fieldnames = [
-            'dosya_adi', 'irsaliye_no', 'irsaliye_tarihi', 'sevk_adresi', 
-            'sevk_edilen_kisi', 'sevk_edilen_tel', 'malzeme_kodu', 'malzeme_aciklama', 'adeti', 'not_bilgileri'
-        ]
-        
-        with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            for row in parsed_data:
-                writer.writerow(row)
-        
-        # JSON oluştur
-        json_path = os.path.join(RESULTS_FOLDER, 'irsaliye_verileri.json')
-        with open(json_path, 'w', encoding='utf-8') as jsonfile:
-            json.dump(parsed_data, jsonfile, ensure_ascii=False, indent=2)
-        
-        flash(f'Başarıyla işlendi! {processed_count}/{total_count} dosya parse edildi. {len(parsed_data)} kayıt oluşturuldu.')
-        return render_template('results.html', 
-                             data=parsed_data[:50],  # İlk 50 kaydı göster
-                             total_records=len(parsed_data),
-                             processed_files=processed_count,
-                             total_files=total_count)
-    else:
+            # Aynı isimli dosyalar birbirinin üzerine yazılmasın
+            stored_name = f'{len(uploaded_files):04d}_{filename}'
+            file.save(os.path.join(job_folder, stored_name))
+            uploaded_files.append({'name': filename, 'path': stored_name})
+    
+    if not uploaded_files:
+        shutil.rmtree(job_folder, ignore_errors=True)
+        flash('Sadece HTML veya ZIP dosyaları yüklenebilir!')
+        return redirect(url_for('index'))
+    
+    job = {
+        'id': job_id,
+        'state': 'queued',
+        'created_at': time.time(),
+        'files': uploaded_files,
+        'total_files': 0,
+        'processed_files': 0,
+        'skipped_files': 0,
+        'failed_files': 0,
+        'total_records': 0,
+        'messages': [],
+        'error': None,
+    }
+    save_job(job)
+    job_queue.submit(job_id)
+    
+    if wants_json():
+        return jsonify(job_status(job)), 202
+    return redirect(url_for('job_results', job_id=job_id))
+
+@app.route('/jobs/<job_id>')
+def job_status_view(job_id):
+    job = load_job(job_id)
+    if job is None:
+        return jsonify({'error': 'İş bulunamadı'}), 404
+    return jsonify(job_status(job))
+
+@app.route('/jobs/<job_id>/results')
+def job_results(job_id):
+    job = load_job(job_id)
+    if job is None:
+        flash('İş bulunamadı!')
+        return redirect(url_for('index'))
+    
+    if job['state'] in ('queued', 'running'):
+        return render_template('job.html', job=job_status(job))
+    
+    for message in job['messages']:
+        flash(message)
+    
+    if job['state'] == 'failed':
+        flash(f'İşlem sırasında hata oluştu: {job["error"]}')
+        return redirect(url_for('index'))
+    
+    if not job['total_records']:
         flash('Hiçbir veri çıkarılamadı!')
         return redirect(url_for('index'))
+    
+    # Tabloya sadece istenen sayfa okunur; tüm sonuç belleğe alınmaz
+    page_count = -(-job['total_records'] // RESULTS_PAGE_SIZE)
+    try:
+        page = min(max(1, int(request.args.get('page', 1))), page_count)
+    except ValueError:
+        page = 1
+    data, _ = read_records_page(job_records_path(job_id), (page - 1) * RESULTS_PAGE_SIZE, RESULTS_PAGE_SIZE)
+    
+    if page == 1:
+        flash(f'Başarıyla işlendi! {job["processed_files"]}/{job["total_files"]} dosya parse edildi. {job["total_records"]} kayıt oluşturuldu.')
+    return render_template('results.html', 
+                         job_id=job_id,
+                         columnar_formats=COLUMNAR_FORMATS if columnar_available() else [],
+                         data=data,
+                         summary=load_job_summary(job_id, SUMMARY_TOP),
+                         page=page,
+                         page_count=page_count,
+                         first_record=(page - 1) * RESULTS_PAGE_SIZE + 1,
+                         total_records=job['total_records'],
+                         processed_files=job['processed_files'],
+                         total_files=job['total_files'])
 
-@app.route('/download/<file_type>')
-def download_file(file_type):
-    if file_type == 'csv':
-        file_path = os.path.join(RESULTS_FOLDER, 'irsaliye_verileri.csv')
-        mimetype = 'text/csv'
-    elif file_type == 'json':
-        file_path = os.path.join(RESULTS_FOLDER, 'irsaliye_verileri.json')
-        mimetype = 'application/json'
+@app.route('/jobs/<job_id>/records')
+def job_records(job_id):
+    """İşin kayıtlarından bir sayfa: ?offset=0&limit=100 (limit en fazla RECORDS_MAX_LIMIT)"""
+    job = load_job(job_id)
+    if job is None:
+        return jsonify({'error': 'İş bulunamadı'}), 404
+    if job['state'] != 'done':
+        return jsonify({'error': 'İş henüz tamamlanmadı', 'state': job['state']}), 409
+    
+    try:
+        offset, limit = parse_page_args(RECORDS_DEFAULT_LIMIT, RECORDS_MAX_LIMIT)
+    except ValueError:
+        return jsonify({'error': 'offset ve limit negatif olmayan sayı olmalı'}), 400
+    
+    if not job['total_records']:
+        records, total = [], 0
     else:
+        records, total = read_records_page(job_records_path(job_id), offset, limit)
+    next_offset = offset + len(records)
+    return jsonify({
+        'offset': offset,
+        'limit': limit,
+        'total': total,
+        'records': records,
+        'next': url_for('job_records', job_id=job_id, offset=next_offset, limit=limit) if next_offset < total else None,
+    })
+
+@app.route('/jobs/<job_id>/summary')
+def job_summary(job_id):
+    """Malzeme kodu, sevk adresi ve gün başına irsaliye / kalem sayısı ve toplam miktar (?limit=: ilk N satır)"""
+    job = load_job(job_id)
+    if job is None:
+        return jsonify({'error': 'İş bulunamadı'}), 404
+    if job['state'] != 'done':
+        return jsonify({'error': 'İş henüz tamamlanmadı', 'state': job['state']}), 409
+    
+    try:
+        limit = int(request.args['limit']) if 'limit' in request.args else None
+        if limit is not None and limit < 0:
+            raise ValueError
+    except ValueError:
+        return jsonify({'error': 'limit negatif olmayan sayı olmalı'}), 400
+    return jsonify(load_job_summary(job_id, limit))
+
+@app.route('/jobs/<job_id>/summary/<group>.csv')
+def download_summary(job_id, group):
+    if group not in AGGREGATE_GROUPS:
+        flash('Geçersiz özet türü!')
+        return redirect(url_for('index'))
+    
+    job = load_job(job_id)
+    if job is None or job['state'] != 'done':
+        flash('Dosya bulunamadı!')
+        return redirect(url_for('index'))
+    
+    # Özet küçüktür (farklı malzeme / adres / gün sayısı kadar satır); bellekte oluşturulur
+    output = io.StringIO()
+    write_group_csv(group, load_job_summary(job_id)[group], output)
+    return Response(
+        output.getvalue().encode('utf-8'),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename=irsaliye_toplamlari_{group}.csv'},
+    )
+
+# İndirme biçimleri: (yazıcı, mimetype, dosya uzantısı); ndjson saklanan dosyanın kendisidir
+DOWNLOAD_FORMATS = {
+    'csv': (CsvRecordWriter, 'text/csv', 'csv'),
+    'json': (JsonArrayRecordWriter, 'application/json', 'json'),
+    'ndjson': (None, 'application/x-ndjson', 'jsonl'),
+}
+
+def build_columnar_export(job_id, file_format):
+    """İşin kayıtlarından irsaliye ve kalem tablolarını içeren ZIP'i bir kez oluşturur, yolunu döndürür"""
+    result_folder = job_result_folder(job_id)
+    zip_path = os.path.join(result_folder, f'irsaliye_verileri.{file_format}.zip')
+    if os.path.exists(zip_path):
+        return zip_path
+    
+    # Eşzamanlı istekler (başka gunicorn worker'ları dahil) birbirinin geçici dosyalarına yazmasın;
+    # thread kimlikleri process'ler arasında tekrar edebilir
+    tmp_base = os.path.join(result_folder, f'export.{os.getpid()}.{threading.get_ident()}')
+    irsaliye_path, kalem_path = columnar_paths(tmp_base, file_format)
+    try:
+        with ColumnarDocumentWriter(irsaliye_path, kalem_path, file_format) as writer:
+            for record in iter_job_records(job_id):
+                writer.write(record)
+        # Parquet/Feather zaten sıkıştırılmış; ZIP sadece iki tabloyu bir arada taşır
+        with zipfile.ZipFile(tmp_base + '.zip', 'w', zipfile.ZIP_STORED) as zip_file:
+            zip_file.write(irsaliye_path, f'irsaliye.{file_format}')
+            zip_file.write(kalem_path, f'kalem.{file_format}')
+        os.replace(tmp_base + '.zip', zip_path)
+    finally:
+        for path in (irsaliye_path, kalem_path, tmp_base + '.zip'):
+            if os.path.exists(path):
+                os.remove(path)
+    return zip_path
+
+@app.route('/jobs/<job_id>/download/<file_type>')
+def download_file(job_id, file_type):
+    if file_type not in DOWNLOAD_FORMATS and file_type not in COLUMNAR_FORMATS:
         flash('Geçersiz dosya türü!')
         return redirect(url_for('index'))
     
-    if os.path.exists(file_path):
-        return send_file(file_path, as_attachment=True, mimetype=mimetype)
-    else:
+    job = load_job(job_id)
+    if job is None or job['state'] != 'done' or not job['total_records']:
         flash('Dosya bulunamadı!')
         return redirect(url_for('index'))
+    
+    if file_type in COLUMNAR_FORMATS:
+        if not columnar_available():
+            flash('Parquet/Arrow/Feather indirmesi için sunucuda pyarrow kurulu değil!')
+            return redirect(url_for('job_results', job_id=job_id))
+        # send_file göreli yolları uygulama klasörüne göre çözer
+        return send_file(os.path.abspath(build_columnar_export(job_id, file_type)), mimetype='application/zip',
+                         as_attachment=True, download_name=f'irsaliye_verileri_{file_type}.zip')
+    
+    # Dosya sunucuda hazır tutulmaz; saklanan kayıtlardan parça parça üretilir
+    writer_class, mimetype, extension = DOWNLOAD_FORMATS[file_type]
+    if writer_class is None:
+        chunks = iter_job_records_bytes(job_id)
+    else:
+        chunks = (chunk.encode('utf-8') for chunk in iter_export_chunks(iter_job_records(job_id), writer_class))
+    
+    # ?gzip=1: akış sıkıştırılarak gönderilir (.gz)
+    if request.args.get('gzip') in ('1', 'true'):
+        chunks = iter_gzip_chunks(chunks)
+        mimetype = 'application/gzip'
+        extension += '.gz'
+    return Response(
+        chunks,
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=irsaliye_verileri.{extension}'},
+    )
+
+@app.route('/metrics')
+def metrics():
+    """Bu process'in parse ölçümleri (Prometheus metin biçimi)"""
+    return Response(parse_metrics.prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/query')
+def query_records():
+    """SQLite deposunu filtrelerle sorgular (IRSALIYE_DB ayarlı olmalı)"""
+    if irsaliye_store is None:
+        return jsonify({'error': 'Sorgu deposu kapalı (IRSALIYE_DB ayarlanmamış)'}), 503
+    
+    try:
+        limit = max(0, min(int(request.args.get('limit', 1000)), QUERY_MAX_LIMIT))
+    except ValueError:
+        return jsonify({'error': 'limit sayı olmalı'}), 400
+    
+    started = time.perf_counter()
+    rows = irsaliye_store.query(
+        irsaliye_no=request.args.get('irsaliye_no'),
+        malzeme_kodu=request.args.get('malzeme_kodu'),
+        sevk_adresi=request.args.get('adres'),
+        tarih_baslangic=request.args.get('baslangic'),
+        tarih_bitis=request.args.get('bitis'),
+        limit=limit,
+    )
+    return jsonify({
+        'rows': rows,
+        'count': len(rows),
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 2),
+    })
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5001)
\ No newline at end of file
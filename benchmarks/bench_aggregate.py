@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Malzeme / adres / gün toplamlarının parse sırasında hesaplanma maliyetini ölçer
+
+Sentetik irsaliyeler bir kez parse edilir; belgeler --lines kaleme ulaşana kadar
+tekrar tekrar Aggregator'a verilir (parse sırasında yazıcı thread'inin yaptığı iş).
+Karşılaştırma için aynı satırlar CSV'ye yazılıp ikinci bir geçişte okunarak
+gruplanır (tablolama programına aktarmanın yaptığı iş).
+
+Kullanım: python -m benchmarks.bench_aggregate --lines 1000000
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+
+from benchmarks.corpus import irsaliye_html
+from irsaliye import Aggregator, CsvRecordWriter, extract_document, iter_document_records, to_number
+
+
+def iter_documents(documents, line_count):
+    """Belgeleri toplam kalem sayısı line_count'a ulaşana kadar döngüyle üretir"""
+    lines = 0
+    for document in itertools.cycle(documents):
+        if lines >= line_count:
+            return
+        lines += len(document.kalemler)
+        yield document
+
+
+def aggregate(documents, line_count):
+    aggregator = Aggregator()
+    for document in iter_documents(documents, line_count):
+        aggregator.write_document(document)
+    return aggregator.summary()
+
+
+def csv_second_pass(path):
+    """CSV'yi baştan okuyup malzeme kodu başına toplam miktarı hesaplar"""
+    totals = defaultdict(float)
+    with open(path, encoding='utf-8', newline='') as csv_file:
+        for row in csv.DictReader(csv_file):
+            if row['malzeme_kodu']:
+                totals[row['malzeme_kodu']] += to_number(row['adeti']) or 0.0
+    return totals
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--lines', type=int, default=1000000, help="kalem sayısı")
+    args = arg_parser.parse_args()
+    documents = [extract_document(irsaliye_html(index), f'ornek_{index}.html') for index in range(200)]
+    
+    started = time.perf_counter()
+    summary = aggregate(documents, args.lines)
+    in_pass = time.perf_counter() - started
+    # Bellek ayrı bir turda ölçülür; tracemalloc süreyi bozar
+    tracemalloc.start()
+    aggregate(documents, args.lines)
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'kayitlar.csv')
+        with CsvRecordWriter(path) as writer:
+            for record in iter_document_records(iter_documents(documents, args.lines)):
+                writer.write(record)
+        started = time.perf_counter()
+        csv_second_pass(path)
+        second_pass = time.perf_counter() - started
+    
+    print(f"{summary['irsaliye']} irsaliye, {summary['kalem']} kalem; {summary['malzeme_sayisi']} malzeme, "
+          f"{summary['adres_sayisi']} adres, {summary['gun_sayisi']} gün")
+    print(f"{'yol':<36} {'süre (s)':>9} {'µs/kalem':>9}")
+    print(f"{'parse sırasında (3 grup)':<36} {in_pass:>9.2f} {in_pass / summary['kalem'] * 1e6:>9.2f}")
+    print(f"{'CSV ikinci geçiş (sadece malzeme)':<36} {second_pass:>9.2f} "
+          f"{second_pass / summary['kalem'] * 1e6:>9.2f}")
+    print(f"Toplayıcının tepe belleği: {peak:.2f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""CSV/JSON ile Parquet/Arrow/Feather çıktılarının boyutunu ve tekrar okuma süresini karşılaştırır
+
+Aynı belgeler her biçimde yazılır; okuma süresi, BI tarafındaki gibi dosyayı açıp
+adeti'yi sayıya, irsaliye_tarihi'ni tarihe çevirene kadar geçen süredir (metin
+biçimlerinde satır satır dönüşüm, kolon bazlı biçimlerde tipler dosyada hazırdır).
+
+Kullanım: python -m benchmarks.bench_columnar --docs 5000
+"""
+
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+
+import pyarrow as pa
+import pyarrow.feather
+import pyarrow.parquet
+
+from benchmarks.corpus import irsaliye_html
+from irsaliye import CsvRecordWriter, JsonArrayRecordWriter, extract_document, iter_document_records, to_date, to_number
+from irsaliye.columnar import COLUMNAR_FORMATS, ColumnarDocumentWriter, columnar_paths
+
+
+def typed_rows(rows):
+    """Metin satırlarını BI yüklemesindeki gibi tiplendirir"""
+    return [dict(row, adeti=to_number(row['adeti']), irsaliye_tarihi=to_date(row['irsaliye_tarihi'])) for row in rows]
+
+
+def load_csv(path):
+    with open(path, newline='', encoding='utf-8') as csv_file:
+        return typed_rows(csv.DictReader(csv_file))
+
+
+def load_json(path):
+    with open(path, encoding='utf-8') as json_file:
+        return typed_rows(json.load(json_file))
+
+
+def load_columnar(paths, file_format):
+    if file_format == 'parquet':
+        return [pa.parquet.read_table(path) for path in paths]
+    if file_format == 'feather':
+        return [pa.feather.read_table(path) for path in paths]
+    return [pa.ipc.open_file(pa.memory_map(path)).read_all() for path in paths]
+
+
+def timed(function, *args, repeat=3):
+    """En iyi süreyi (ms) döndürür"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(*args)
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--docs', type=int, default=5000, help="belge sayısı")
+    args = arg_parser.parse_args()
+    
+    documents = [extract_document(irsaliye_html(index), f'irsaliye_{index:06d}.html') for index in range(args.docs)]
+    rows = sum(document.record_count() for document in documents)
+    print(f"{len(documents)} belge, {rows} satır")
+    
+    with tempfile.TemporaryDirectory() as folder:
+        base = os.path.join(folder, 'irsaliye_verileri')
+        outputs = []
+        
+        with CsvRecordWriter(base + '.csv') as writer:
+            for record in iter_document_records(documents):
+                writer.write(record)
+        outputs.append(('csv', [base + '.csv'], lambda: load_csv(base + '.csv')))
+        
+        with JsonArrayRecordWriter(base + '.json') as writer:
+            for record in iter_document_records(documents):
+                writer.write(record)
+        outputs.append(('json', [base + '.json'], lambda: load_json(base + '.json')))
+        
+        for file_format in COLUMNAR_FORMATS:
+            with ColumnarDocumentWriter.for_base(base, file_format) as writer:
+                for document in documents:
+                    writer.write_document(document)
+            paths = columnar_paths(base, file_format)
+            outputs.append((file_format, paths, lambda paths=paths, file_format=file_format: load_columnar(paths, file_format)))
+        
+        print(f"{'biçim':<8} {'boyut KB':>10} {'okuma ms':>10} {'boyut oranı':>12} {'okuma oranı':>12}")
+        csv_size = csv_time = None
+        for label, paths, load in outputs:
+            size = sum(os.path.getsize(path) for path in paths) / 1024
+            load_time = timed(load)
+            if csv_size is None:
+                csv_size, csv_time = size, load_time
+            print(f"{label:<8} {size:>10.1f} {load_time:>10.1f} {csv_size / size:>11.1f}x {csv_time / load_time:>11.1f}x")
+
+
+if __name__ == '__main__':
+    main()
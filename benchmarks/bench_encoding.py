@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Encoding tespitinin doğruluğunu ve maliyetini eski "her codec'i dene" döngüsüyle karşılaştırır
+
+Her encoding için örnek dosyalar yazılır; eski döngü dosyayı her codec için yeniden
+açıp okur, yeni yol dosyayı bir kez bayt olarak okuyup bir kez çözer.
+
+Kullanım: python -m benchmarks.bench_encoding --count 200
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.corpus import ENCODINGS, encode_html, irsaliye_html
+from irsaliye import decode_html_bytes
+
+LEGACY_ENCODINGS = ['utf-16', 'utf-8', 'utf-16-le', 'utf-16-be', 'latin-1', 'cp1252']
+
+
+def legacy_read(path):
+    """Eski CLI döngüsü: ilk hatasız okuyan codec kazanır; (içerik, okuma sayısı) döndürür"""
+    reads = 0
+    for encoding in LEGACY_ENCODINGS:
+        reads += 1
+        try:
+            with open(path, 'r', encoding=encoding) as file:
+                return file.read(), reads
+        except UnicodeError:
+            continue
+    return '', reads
+
+
+def expected_text(html, encoding):
+    charset = ENCODINGS[encoding][0]
+    if charset is None:
+        return html.replace('<meta charset="utf-8">', '')
+    return html.replace('<meta charset="utf-8">', f'<meta charset="{charset}">')
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--count', type=int, default=200, help="encoding başına örnek sayısı")
+    args = arg_parser.parse_args()
+    
+    print(f"{'encoding':<16} {'eski hatalı':>11} {'yeni hatalı':>11} {'eski okuma':>10} "
+          f"{'yeni okuma':>10} {'eski ms':>8} {'yeni ms':>8}")
+    with tempfile.TemporaryDirectory() as folder:
+        for encoding in ENCODINGS:
+            samples = []
+            for index in range(args.count):
+                html = irsaliye_html(index)
+                path = Path(folder) / f'{encoding}_{index}.html'
+                path.write_bytes(encode_html(html, encoding))
+                samples.append((path, expected_text(html, encoding)))
+            
+            legacy_wrong = legacy_reads = 0
+            started = time.perf_counter()
+            for path, expected in samples:
+                content, reads = legacy_read(path)
+                legacy_reads += reads
+                legacy_wrong += content.lstrip('﻿') != expected
+            legacy_ms = (time.perf_counter() - started) * 1000
+            
+            wrong = 0
+            started = time.perf_counter()
+            for path, expected in samples:
+                wrong += decode_html_bytes(path.read_bytes()) != expected
+            new_ms = (time.perf_counter() - started) * 1000
+            
+            print(f"{encoding:<16} {legacy_wrong:>11} {wrong:>11} {legacy_reads:>10} "
+                  f"{len(samples):>10} {legacy_ms:>8.1f} {new_ms:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Başlık alanı çıkarıcılarının ve miktar ayrıştırmanın alan başına maliyetini ölçer
+
+Karışık korpus bir kez çözülür; her kayıtlı çıkarıcı (ve örnek ek alanlar: vergi
+no, plaka, şoför) tüm belgeler üzerinde ayrı ayrı çalıştırılır. Sevk adresi için
+eski yol (tüm metinde regex + parça başına BeautifulSoup) da ölçülür.
+
+Kullanım: python -m benchmarks.bench_fields --docs 500
+"""
+
+import argparse
+import re
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+from bs4 import BeautifulSoup, MarkupResemblesLocatorWarning
+
+from benchmarks.corpus import MIKTAR_BICIMLERI, write_mixed_corpus
+from irsaliye.encoding import decode_html_bytes
+from irsaliye.fields import HEADER_EXTRACTORS, parse_quantity, register_field, unregister_field
+
+ORNEK_ALANLAR = [
+    ('vergi_no', r'VKN:\s*(\d{10,11})', 'VKN:'),
+    ('plaka', r'Plaka:\s*([0-9]{2} ?[A-Z]{1,3} ?[0-9]{2,4})', 'Plaka:'),
+    ('sofor', r'Şoför:\s*([^<]+)', 'Şoför:'),
+]
+
+SEVK_ADRESI_RE = re.compile(r'Sevk Adresi:(.*?)</span>')
+TEL_RE = re.compile(r'Tel:(\d+)')
+TEL_STRIP_RE = re.compile(r'\s*Tel:\d+')
+
+
+def old_sevk_adresi(content):
+    """Eski yol: tüm içerikte regex, parçanın etiketleri BeautifulSoup ile temizlenir"""
+    match = SEVK_ADRESI_RE.search(content)
+    if not match:
+        return {}
+    adres = BeautifulSoup(match.group(1).strip(), 'html.parser').get_text(strip=True)
+    tel_match = TEL_RE.search(adres)
+    if tel_match:
+        return {'sevk_adresi': TEL_STRIP_RE.sub('', adres).strip(), 'sevk_edilen_tel': tel_match.group(1)}
+    return {'sevk_adresi': adres}
+
+
+def per_call_us(function, items, repeat):
+    """function'ın öğe başına ortalama süresi (mikrosaniye); en iyi tekrar alınır"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for item in items:
+            function(item)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(items) * 1e6
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--docs', type=int, default=500, help="belge sayısı")
+    arg_parser.add_argument('--repeat', type=int, default=5, help="tekrar (en iyisi alınır)")
+    args = arg_parser.parse_args()
+    warnings.filterwarnings('ignore', category=MarkupResemblesLocatorWarning)
+    
+    with tempfile.TemporaryDirectory() as folder:
+        paths = write_mixed_corpus(folder, args.docs)
+        contents = [decode_html_bytes(Path(path).read_bytes()) for path in paths]
+    
+    for name, pattern, anchor in ORNEK_ALANLAR:
+        register_field(name, pattern, anchor=anchor)
+    try:
+        print(f"{len(contents)} belge, ortalama {sum(map(len, contents)) // len(contents)} karakter")
+        print(f"{'alan':<34} {'µs/belge':>9}")
+        print(f"{'sevk_adresi (eski: regex + soup)':<34} {per_call_us(old_sevk_adresi, contents, args.repeat):>9.1f}")
+        for extractor in HEADER_EXTRACTORS:
+            label = f"{extractor.name} (anchor: {extractor.anchor})"
+            print(f"{label:<34} {per_call_us(extractor.extract, contents, args.repeat):>9.1f}")
+    finally:
+        for name, _, _ in ORNEK_ALANLAR:
+            unregister_field(name)
+    
+    cells = [miktar_bicimi.format(sayi) for miktar_bicimi in MIKTAR_BICIMLERI + ['{}.250,5 ADET', '{}.5 KG']
+             for sayi in (1, 12, 250, 2500)] * 50
+    eski_miktar_re = re.compile(r'(\d+)')
+    print(f"\n{'miktar':<34} {'µs/hücre':>9}")
+    print(f"{'eski: ilk tam sayı':<34} {per_call_us(eski_miktar_re.search, cells, args.repeat):>9.2f}")
+    print(f"{'parse_quantity (Türkçe ondalık)':<34} {per_call_us(parse_quantity, cells, args.repeat):>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
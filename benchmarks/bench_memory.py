@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Parse sonuçlarının bellekte tutulma maliyetini eski satır-dict modeliyle karşılaştırır
+
+Sentetik irsaliyeler bir kez parse edilir. Sonra her model için tracemalloc
+altında, parser'ın ürettiği gibi her belgenin metinleri yeni kopyalarla oluşturulup
+tutulur. Eski modelde her malzeme satırı başlığın dict kopyasıdır ve metinler belge
+başına ayrıdır; yeni modelde belge başına bir Irsaliye (__slots__) ve kalemler vardır,
+tekrar eden metinler intern edilir.
+
+Kullanım: python -m benchmarks.bench_memory --lines 100000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks.corpus import irsaliye_html
+from irsaliye import HEADER_FIELDS, Irsaliye, Kalem, empty_irsaliye_record, extract_document
+
+
+def fresh(value):
+    """Parser çıktısı gibi yeni bir metin nesnesi döndürür (intern edilmemiş)"""
+    if isinstance(value, str) and value:
+        return value.encode('utf-8').decode('utf-8')
+    return value
+
+
+def parsed_values(line_count):
+    """line_count satıra ulaşana kadar irsaliye parse eder, alan değerlerini düz demetler olarak döndürür"""
+    values = []
+    lines = 0
+    index = 0
+    while lines < line_count:
+        document = extract_document(irsaliye_html(index), f'irsaliye_{index:06d}.html')
+        header = tuple(getattr(document, field) for field in HEADER_FIELDS)
+        kalemler = [(kalem.malzeme_kodu, kalem.malzeme_aciklama, kalem.adeti) for kalem in document.kalemler]
+        values.append((document.dosya_adi, header, document.not_bilgileri, kalemler))
+        lines += document.record_count()
+        index += 1
+    return values
+
+
+def legacy_rows(values):
+    """Eski model: her malzeme satırı için başlık dict'inin kopyası"""
+    rows = []
+    for dosya_adi, header, not_bilgileri, kalemler in values:
+        irsaliye_data = empty_irsaliye_record(fresh(dosya_adi))
+        irsaliye_data.update(zip(HEADER_FIELDS, map(fresh, header)))
+        irsaliye_data['not_bilgileri'] = fresh(not_bilgileri)
+        for malzeme_kodu, malzeme_aciklama, miktar in kalemler:
+            irsaliye_entry = irsaliye_data.copy()
+            irsaliye_entry['malzeme_kodu'] = fresh(malzeme_kodu)
+            irsaliye_entry['malzeme_aciklama'] = fresh(malzeme_aciklama)
+            irsaliye_entry['adeti'] = fresh(miktar)
+            rows.append(irsaliye_entry)
+        if not kalemler:
+            rows.append(irsaliye_data)
+    return rows
+
+
+def compact_documents(values):
+    """Yeni model: belge başına bir Irsaliye ve Kalem listesi"""
+    return [
+        Irsaliye(fresh(dosya_adi), *map(fresh, header), not_bilgileri=fresh(not_bilgileri),
+                 kalemler=[Kalem(*map(fresh, kalem)) for kalem in kalemler])
+        for dosya_adi, header, not_bilgileri, kalemler in values
+    ]
+
+
+def measure(build, values):
+    """build(values) sonucunu tutarken ayrılan belleği ve tepe değeri (MB) ölçer"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build(values)
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / 1024 / 1024, peak / 1024 / 1024, elapsed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--lines', type=int, default=100000, help="toplam malzeme satırı sayısı")
+    args = arg_parser.parse_args()
+    
+    started = time.perf_counter()
+    values = parsed_values(args.lines)
+    line_count = sum(len(kalemler) or 1 for _, _, _, kalemler in values)
+    print(f"{len(values)} belge, {line_count} satır parse edildi ({time.perf_counter() - started:.1f} sn)")
+    
+    print(f"{'model':<22} {'tutulan MB':>10} {'tepe MB':>8} {'kurulum sn':>10}")
+    results = {}
+    for label, build in (('satır dict (eski)', legacy_rows), ('Irsaliye + Kalem', compact_documents)):
+        retained, peak, elapsed = measure(build, values)
+        results[label] = peak
+        print(f"{label:<22} {retained:>10.1f} {peak:>8.1f} {elapsed:>10.2f}")
+    
+    print(f"Tepe bellek oranı: {results['satır dict (eski)'] / results['Irsaliye + Kalem']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
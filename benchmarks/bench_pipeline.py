@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Önceden okuma (prefetch) boru hattının okuma ve parse süresini örtüştürmesini ölçer
+
+Ağ paylaşımındaki gecikme, her dosya okumasına --gecikme-ms kadar bekleme
+eklenerek taklit edilir (0: yerel disk). Klasör önce okuma thread'i olmadan
+(okuma + parse sırayla), sonra --readers thread'le parse edilir; süre okuma
+ve parse toplamı yerine ikisinden büyüğüne yaklaşmalıdır.
+
+Kullanım: python -m benchmarks.bench_pipeline --docs 500 --gecikme-ms 5
+"""
+
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+
+from benchmarks.corpus import write_mixed_corpus
+from irsaliye_parser_v2 import IrsaliyeParserV2
+
+
+class SlowReadParser(IrsaliyeParserV2):
+    """Her dosya okumasına sabit gecikme ekler"""
+    
+    latency = 0.0
+    
+    def _read_file(self, html_file_path):
+        time.sleep(self.latency)
+        return super()._read_file(html_file_path)
+
+
+def run(folder, latency, **options):
+    """Klasörü parse edip süreyi döndürür"""
+    parser = SlowReadParser(folder, file_log='off', **options)
+    parser.latency = latency
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser.parse_all_html_files()
+    return time.perf_counter() - started
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--docs', type=int, default=500, help="belge sayısı")
+    arg_parser.add_argument('--gecikme-ms', type=float, default=5.0, help="dosya başına okuma gecikmesi (ms)")
+    arg_parser.add_argument('--readers', type=int, default=4, help="okuma thread sayısı")
+    arg_parser.add_argument('-w', '--workers', type=int, default=1, help="parse worker sayısı")
+    args = arg_parser.parse_args()
+    latency = args.gecikme_ms / 1000
+    
+    with tempfile.TemporaryDirectory() as folder:
+        write_mixed_corpus(folder, args.docs)
+        io_only = args.docs * latency
+        cpu_only = run(folder, 0.0, workers=args.workers)
+        sequential = run(folder, latency, workers=args.workers)
+        pipelined = run(folder, latency, workers=args.workers, readers=args.readers)
+        
+        print(f"{args.docs} belge, okuma gecikmesi {args.gecikme_ms:g} ms, {args.workers} worker")
+        print(f"{'ölçüm':<28} {'süre (s)':>9} {'belge/sn':>9}")
+        for label, elapsed in [
+            ('okuma (gecikme toplamı)', io_only),
+            ('parse (gecikmesiz)', cpu_only),
+            ('sıralı (--readers 0)', sequential),
+            (f'boru hattı (--readers {args.readers})', pipelined),
+        ]:
+            print(f"{label:<28} {elapsed:>9.2f} {args.docs / elapsed:>9.1f}")
+        # Okumalar da readers thread'ine bölündüğünden ideal süre max(okuma / readers, parse)
+        ideal = max(io_only / max(1, args.readers), cpu_only)
+        print(f"Hızlanma: {sequential / pipelined:.2f}x (ideal: max(okuma / readers, parse) = {ideal:.2f} s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Ön filtrenin karışık klasörlerdeki etkisini ölçer (irsaliye olmayan sayfalar ve kopyalar)
+
+Karışık korpusa istenen oranda irsaliye olmayan sayfa ve önceki irsaliyelerin
+kopyaları eklenir; klasör CLI sınıfıyla ön filtre açık ve kapalı parse edilir.
+
+Kullanım: python -m benchmarks.bench_prefilter --docs 1000 --sayfa 0.3 --kopya 0.2
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.corpus import IRSALIYE_OLMAYAN_SAYFALAR, write_mixed_corpus
+from irsaliye_parser_v2 import IrsaliyeParserV2
+
+ONIZLEME_TABLOSU = '<table>' + ''.join(
+    f'<tr><td class="lbl">Satır {i}</td><td><span>Değer {i}</span></td><td>{i},00</td></tr>' for i in range(60)
+) + '</table>'
+
+
+def build_folder(folder, docs, page_ratio, copy_ratio, seed=0):
+    """docs irsaliye yazar, üstüne irsaliye olmayan sayfa ve kopya ekler; toplam dosya sayısını döndürür"""
+    rng = random.Random(seed)
+    paths = write_mixed_corpus(folder, docs, seed=seed)
+    for index in range(int(docs * page_ratio)):
+        page = rng.choice(IRSALIYE_OLMAYAN_SAYFALAR)
+        # XSLT önizlemeleri gerçek irsaliyeler kadar işaretleme içerir (yalnızca Malzeme Kodu başlığı yoktur)
+        Path(folder, f'onizleme_{index:06d}.html').write_text(page.replace('</body>', ONIZLEME_TABLOSU + '</body>'),
+                                                            encoding='utf-8')
+    for index in range(int(docs * copy_ratio)):
+        shutil.copyfile(rng.choice(paths), Path(folder, f'kopya_{index:06d}.html'))
+    return len(list(Path(folder).glob('*.html')))
+
+
+def run(folder, prefilter):
+    """Klasörü parse eder; (süre, kayıt sayısı, atlama sayıları) döndürür"""
+    parser = IrsaliyeParserV2(folder, prefilter=prefilter, file_log='off')
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser.parse_all_html_files()
+    elapsed = time.perf_counter() - started
+    skipped = dict(parser.batch_filter.skipped) if parser.batch_filter else {}
+    return elapsed, parser.record_count(), skipped
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--docs', type=int, default=1000, help="irsaliye sayısı")
+    arg_parser.add_argument('--sayfa', type=float, default=0.3, help="irsaliye başına irsaliye olmayan sayfa oranı")
+    arg_parser.add_argument('--kopya', type=float, default=0.2, help="irsaliye başına kopya oranı")
+    arg_parser.add_argument('--repeat', type=int, default=2, help="mod başına tekrar (en iyisi alınır)")
+    args = arg_parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as folder:
+        total = build_folder(folder, args.docs, args.sayfa, args.kopya)
+        print(f"{total} dosya ({args.docs} irsaliye, oranlar: sayfa {args.sayfa}, kopya {args.kopya})")
+        print(f"{'ön filtre':<10} {'süre (s)':>9} {'dosya/sn':>9} {'kayıt':>7}  atlanan")
+        results = {}
+        for label, prefilter in (('kapalı', False), ('açık', True)):
+            # Disk önbelleği ısınsın diye en iyi süre alınır
+            elapsed, records, skipped = min(run(folder, prefilter) for _ in range(args.repeat))
+            results[label] = elapsed
+            print(f"{label:<10} {elapsed:>9.2f} {total / elapsed:>9.1f} {records:>7}  {skipped or '-'}")
+        print(f"Hızlanma: {results['kapalı'] / results['açık']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
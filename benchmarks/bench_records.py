@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Büyük işlerde sonuç sayfalamasının gecikmesini ve belleğini ölçer
+
+--lines satırlık bir records.jsonl yazılır (web işinin sakladığı dosya). Rastgele
+ofsetlerden sayfa okuma, seyrek satır indeksiyle (read_records_page) ve dosyanın
+başından satır sayarak karşılaştırılır. Ayrıca eski önizleme/indirme yolu gibi tüm
+dosyayı belleğe almanın tepe belleği, indeksli sayfa okumanınkiyle kıyaslanır.
+
+Kullanım: python -m benchmarks.bench_records --lines 500000
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.corpus import irsaliye_html
+from irsaliye import JsonLinesRecordWriter, build_line_index, extract_document, read_records_page
+
+
+def write_records(path, line_count):
+    """Sentetik belgelerin satırlarını line_count satıra ulaşana kadar tekrar tekrar yazar"""
+    records = [record for index in range(20)
+               for record in extract_document(irsaliye_html(index), f'ornek_{index}.html').records()]
+    with JsonLinesRecordWriter(path) as writer:
+        for record in itertools.islice(itertools.cycle(records), line_count):
+            writer.write(record)
+
+
+def scan_page(path, offset, limit):
+    """İndekssiz: baştan offset satır okunup geçilir"""
+    with open(path, 'rb') as lines:
+        return [json.loads(line) for line in itertools.islice(lines, offset, offset + limit)]
+
+
+def per_page_ms(read_page, path, offsets, limit):
+    started = time.perf_counter()
+    for offset in offsets:
+        read_page(path, offset, limit)
+    return (time.perf_counter() - started) / len(offsets) * 1000
+
+
+def peak_mb(function, *args):
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def load_all(path):
+    with open(path, encoding='utf-8') as lines:
+        return [json.loads(line) for line in lines]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--lines', type=int, default=500000, help="satır sayısı")
+    arg_parser.add_argument('--limit', type=int, default=100, help="sayfa boyutu")
+    arg_parser.add_argument('--pages', type=int, default=20, help="okunan rastgele sayfa sayısı")
+    args = arg_parser.parse_args()
+    offsets = random.Random(0).sample(range(args.lines - args.limit), args.pages)
+    
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'records.jsonl')
+        write_records(path, args.lines)
+        
+        started = time.perf_counter()
+        build_line_index(path)
+        index_seconds = time.perf_counter() - started
+        
+        print(f"{args.lines} satır, {os.path.getsize(path) / 1024 / 1024:.1f} MB; "
+              f"indeks {os.path.getsize(path + '.idx')} bayt, {index_seconds:.2f} s")
+        print(f"{'sayfa okuma (limit ' + str(args.limit) + ')':<30} {'ms/sayfa':>9}")
+        print(f"{'baştan sayarak':<30} {per_page_ms(scan_page, path, offsets, args.limit):>9.2f}")
+        print(f"{'seyrek indeksle':<30} {per_page_ms(read_records_page, path, offsets, args.limit):>9.2f}")
+        
+        print(f"\n{'tepe bellek':<30} {'MB':>9}")
+        print(f"{'tüm kayıtlar belleğe':<30} {peak_mb(load_all, path):>9.1f}")
+        print(f"{'tek sayfa (indeksli)':<30} {peak_mb(read_records_page, path, offsets[0], args.limit):>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
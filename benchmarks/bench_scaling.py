@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Toplu iş boyutu büyüdükçe dosya başına parse süresinin sabit kaldığını ölçer
+
+Kullanım: python -m benchmarks.bench_scaling --sizes 1000 10000 100000
+"""
+
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+
+from benchmarks.corpus import write_corpus
+from irsaliye_parser_v2 import IrsaliyeParserV2
+
+
+def run(size, corpus_folder, written):
+    """corpus_folder'ı size dosyaya tamamlar ve dosya başına süreyi döndürür"""
+    if written < size:
+        write_corpus(corpus_folder, size - written, start=written)
+    
+    parser = IrsaliyeParserV2(corpus_folder)
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser.parse_all_html_files()
+    elapsed = time.perf_counter() - started
+    return elapsed, parser.record_count()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    args = arg_parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as corpus_folder:
+        written = 0
+        print(f"{'dosya':>8} {'kayıt':>8} {'süre (s)':>10} {'ms/dosya':>10}")
+        for size in sorted(args.sizes):
+            elapsed, records = run(size, corpus_folder, written)
+            written = size
+            print(f"{size:>8} {records:>8} {elapsed:>10.2f} {elapsed / size * 1000:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""SQLite deposunun toplu yazma hızını ve indeksli sorgu sürelerini ölçer
+
+Parse maliyeti ölçüme girmesin diye belgeler doğrudan Irsaliye nesneleri olarak
+üretilir (ortalama 10 kalem). Aynı belgeler ikinci kez yazılarak upsert'in
+idempotent olduğu da doğrulanır.
+
+Kullanım: python -m benchmarks.bench_store --lines 1000000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from irsaliye import Irsaliye, IrsaliyeStore, Kalem
+
+SEHIRLER = ['İstanbul', 'Ankara', 'İzmir', 'Bursa', 'Kocaeli', 'Konya', 'Adana', 'Gaziantep']
+
+
+def synthetic_documents(line_count, seed=42):
+    """Toplam line_count kaleme ulaşana kadar Irsaliye üretir"""
+    rng = random.Random(seed)
+    start = date(2023, 1, 1)
+    lines = 0
+    index = 0
+    while lines < line_count:
+        kalem_sayisi = min(rng.randint(1, 19), line_count - lines)
+        kalemler = [
+            Kalem(f'MLZ-{rng.randrange(20000):05d}', f'Ürün açıklaması {rng.randrange(500)}', str(rng.randint(1, 500)))
+            for _ in range(kalem_sayisi)
+        ]
+        yield Irsaliye(
+            f'irsaliye_{index:07d}.html', f'YGA{2023 + index % 3}{index:09d}',
+            (start + timedelta(days=index % 1000)).isoformat(),
+            f'{rng.choice(SEHIRLER)} Depo {rng.randrange(200)}', f'Kişi {rng.randrange(1000)}', '',
+            not_bilgileri='', kalemler=kalemler,
+        )
+        lines += kalem_sayisi
+        index += 1
+
+
+def timed_query(store, repeat=20, **filters):
+    """Sorgunun ortalama süresini (ms) ve satır sayısını döndürür"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        rows = store.query(**filters)
+    return (time.perf_counter() - started) * 1000 / repeat, len(rows)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--lines', type=int, default=1000000, help="toplam kalem sayısı")
+    arg_parser.add_argument('--batch-size', type=int, default=1000, help="transaction başına belge")
+    args = arg_parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'irsaliye.sqlite3')
+        
+        for label in ('ilk yazma', 'tekrar yazma'):
+            started = time.perf_counter()
+            with IrsaliyeStore(path, batch_size=args.batch_size) as store:
+                for document in synthetic_documents(args.lines):
+                    store.write_document(document)
+            elapsed = time.perf_counter() - started
+            with IrsaliyeStore(path) as store:
+                stats = store.stats()
+            print(f"{label}: {stats['irsaliye']} irsaliye, {stats['kalem']} kalem, {elapsed:.1f} sn "
+                  f"({stats['kalem'] / elapsed:,.0f} kalem/sn)")
+        print(f"Veritabanı boyutu: {os.path.getsize(path) / 1024 / 1024:.1f} MB")
+        
+        with IrsaliyeStore(path) as store:
+            sample = store.query(limit=1)[0]
+            queries = [
+                ('irsaliye_no', {'irsaliye_no': sample['irsaliye_no']}),
+                ('malzeme_kodu', {'malzeme_kodu': sample['malzeme_kodu'], 'limit': 100}),
+                ('tarih aralığı (1 gün)', {'tarih_baslangic': sample['irsaliye_tarihi'],
+                                           'tarih_bitis': sample['irsaliye_tarihi'], 'limit': 100}),
+                ('malzeme_kodu + tarih', {'malzeme_kodu': sample['malzeme_kodu'],
+                                          'tarih_baslangic': '2024-01-01', 'tarih_bitis': '2024-12-31'}),
+            ]
+            print(f"{'sorgu':<24} {'ms':>8} {'satır':>7}")
+            for label, filters in queries:
+                elapsed, row_count = timed_query(store, **filters)
+                print(f"{label:<24} {elapsed:>8.2f} {row_count:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Karışık korpusta çekirdek, CLI ve /upload yollarını ölçüp saklanan baseline ile karşılaştırır
+
+Her senaryo ayrı bir process'te çalışır (tepe RSS birbirine karışmasın):
+
+- core:   dosya başına okuma / ön filtre / çözme / çıkarma / yazma süreleri
+- cli:    IrsaliyeParserV2 ile full modun yaptığı iş (parse, CSV + JSON yazma)
+- upload: Flask test istemcisiyle ZIP yükleme, iş tamamlanana kadar bekleme, CSV indirme
+
+Her senaryo docs/sn, aşama süresi yüzdelikleri (ms) ve tepe RSS (MB) raporlar.
+docs/sn baseline'dan --tolerans oranında düşerse veya tepe RSS o oranda artarsa
+çıkış kodu 1 olur. Baseline'lar makineye bağlıdır; donanım değişince --update ile
+yeniden yazılmalıdır.
+
+Kullanım: python -m benchmarks.bench_suite [--docs 500] [--only core cli] [--update]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASELINES_PATH = Path(__file__).parent / 'baselines.json'
+SCENARIOS = ['core', 'cli', 'upload']
+PERCENTILES = [50, 90, 99]
+
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+def percentiles(values):
+    """Süre listesinin (saniye) p50/p90/p99 ve en büyük değerini ms olarak döndürür (en yakın sıra yöntemi)"""
+    ordered = sorted(values)
+    if not ordered:
+        return {}
+    result = {f'p{p}': round(ordered[max(0, math.ceil(len(ordered) * p / 100) - 1)] * 1000, 3) for p in PERCENTILES}
+    result['max'] = round(ordered[-1] * 1000, 3)
+    return result
+
+
+def peak_rss_mb():
+    """(bu process, beklenmiş alt process'ler) için tepe RSS (MB)"""
+    # Linux'ta ru_maxrss KB cinsindendir
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    return round(own, 1), round(children, 1)
+
+
+def run_core(corpus, workers, repeat):
+    """Her dosyayı aşama aşama parse eder; aşama süreleri dosya başınadır"""
+    from irsaliye import CsvRecordWriter, decode_html_bytes, extract_document
+    from irsaliye.prefilter import BatchFilter
+    
+    stages = {'okuma': [], 'onfiltre': [], 'cozme': [], 'cikarma': [], 'yazma': []}
+    html_files = sorted(corpus.glob('*.html'))
+    started = time.perf_counter()
+    for _ in range(repeat):
+        batch_filter = BatchFilter()
+        with CsvRecordWriter(io.StringIO()) as writer:
+            for html_file in html_files:
+                t0 = time.perf_counter()
+                raw = html_file.read_bytes()
+                t1 = time.perf_counter()
+                skip = batch_filter.check(raw)
+                stages['okuma'].append(t1 - t0)
+                stages['onfiltre'].append(time.perf_counter() - t1)
+                if skip:
+                    continue
+                t1 = time.perf_counter()
+                content = decode_html_bytes(raw)
+                t2 = time.perf_counter()
+                document = extract_document(content, html_file.name)
+                t3 = time.perf_counter()
+                for record in document.records():
+                    writer.write(record)
+                t4 = time.perf_counter()
+                stages['cozme'].append(t2 - t1)
+                stages['cikarma'].append(t3 - t2)
+                stages['yazma'].append(t4 - t3)
+    elapsed = time.perf_counter() - started
+    return len(html_files) * repeat / elapsed, stages
+
+
+def run_cli(corpus, workers, repeat):
+    """CLI full modunun adımları: dosya başına parse (sıralı akış), sonra CSV ve JSON yazma"""
+    from irsaliye_parser_v2 import IrsaliyeParserV2
+    
+    stages = {'dosya': [], 'parse': [], 'yazma': []}
+    docs = 0
+    parse_time = 0.0
+    with tempfile.TemporaryDirectory() as output:
+        for _ in range(repeat):
+            # CLI varsayılanı gibi dosyalar okuma thread'lerinde önceden okunur
+            parser = IrsaliyeParserV2(corpus, workers=workers, readers=4)
+            html_files = parser.find_html_files()
+            with contextlib.redirect_stdout(io.StringIO()):
+                started = last = time.perf_counter()
+                for _, document in parser._iter_file_documents(html_files):
+                    now = time.perf_counter()
+                    # Paralel modda süre, sıradaki belgenin hazır olmasını bekleme süresidir
+                    stages['dosya'].append(now - last)
+                    last = now
+                    if document is not None:
+                        parser.documents.append(document)
+                parsed = time.perf_counter()
+                parser.save_to_csv(os.path.join(output, 'irsaliye.csv'))
+                parser.save_to_json(os.path.join(output, 'irsaliye.json'))
+                written = time.perf_counter()
+            parser.close()
+            stages['parse'].append(parsed - started)
+            stages['yazma'].append(written - parsed)
+            docs += len(html_files)
+            parse_time += parsed - started
+    return docs / parse_time, stages
+
+
+def run_upload(corpus, workers, repeat):
+    """Korpusu ZIP olarak /upload'a gönderir, işin bitmesini bekler ve CSV'yi indirir"""
+    # app modül yüklenirken çalışma klasöründe uploads/results/cache/jobs oluşturur
+    work_folder = tempfile.mkdtemp(prefix='irsaliye_bench_')
+    os.chdir(work_folder)
+    os.environ['PARSE_WORKERS'] = str(workers)
+    import app as web_app
+    from irsaliye import ResultCache
+    
+    archive = io.BytesIO()
+    html_files = sorted(corpus.glob('*.html'))
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        for html_file in html_files:
+            zip_file.write(html_file, html_file.name)
+    payload = archive.getvalue()
+    
+    client = web_app.app.test_client()
+    stages = {'yukleme': [], 'is': [], 'indirme': []}
+    for index in range(repeat):
+        # Her tekrarda önbellek boş başlar; aksi halde ikinci tur sadece önbellek okur
+        web_app.result_cache = ResultCache(os.path.join(work_folder, f'cache_{index}.sqlite3'))
+        started = time.perf_counter()
+        response = client.post('/upload', data={'files': (io.BytesIO(payload), 'korpus.zip')},
+                               headers={'Accept': 'application/json'})
+        job_id = response.get_json()['id']
+        uploaded = time.perf_counter()
+        while (state := client.get(f'/jobs/{job_id}').get_json()['state']) in ('queued', 'running'):
+            time.sleep(0.01)
+        if state != 'done':
+            raise RuntimeError(f"Yükleme işi tamamlanamadı: {state}")
+        finished = time.perf_counter()
+        response = client.get(f'/jobs/{job_id}/download/csv')
+        for _ in response.response:
+            pass
+        downloaded = time.perf_counter()
+        stages['yukleme'].append(uploaded - started)
+        stages['is'].append(finished - uploaded)
+        stages['indirme'].append(downloaded - finished)
+    
+    # Parse havuzu kapatılınca worker'ların RSS'i RUSAGE_CHILDREN'a yansır
+    if web_app._parse_pool is not None:
+        web_app._parse_pool.shutdown()
+    os.chdir(REPO_ROOT)
+    shutil.rmtree(work_folder, ignore_errors=True)
+    return len(html_files) * repeat / sum(stages['is']), stages
+
+
+SCENARIO_RUNNERS = {'core': run_core, 'cli': run_cli, 'upload': run_upload}
+
+
+def run_scenario(name, corpus, workers, repeat):
+    """Senaryoyu bu process'te çalıştırır ve sonucunu dict olarak döndürür"""
+    docs_per_sec, stages = SCENARIO_RUNNERS[name](corpus, workers, repeat)
+    own_rss, children_rss = peak_rss_mb()
+    return {
+        'docs_per_sec': round(docs_per_sec, 1),
+        'stages_ms': {stage: percentiles(values) for stage, values in stages.items()},
+        'peak_rss_mb': own_rss,
+        'workers_peak_rss_mb': children_rss,
+    }
+
+
+def measure_in_subprocess(name, corpus, workers, repeat):
+    command = [sys.executable, '-m', 'benchmarks.bench_suite', '--scenario', name, '--corpus', str(corpus),
+               '--workers', str(workers), '--repeat', str(repeat)]
+    completed = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare(name, result, baseline, tolerance):
+    """Baseline'a göre gerilemeleri döndürür"""
+    regressions = []
+    if result['docs_per_sec'] < baseline['docs_per_sec'] * (1 - tolerance):
+        regressions.append(f"{name}: docs/sn {baseline['docs_per_sec']} -> {result['docs_per_sec']}")
+    if result['peak_rss_mb'] > baseline['peak_rss_mb'] * (1 + tolerance):
+        regressions.append(f"{name}: tepe RSS {baseline['peak_rss_mb']} MB -> {result['peak_rss_mb']} MB")
+    return regressions
+
+
+def print_result(name, result, baseline):
+    change = ''
+    if baseline:
+        change = f" (baseline {baseline['docs_per_sec']}, {result['docs_per_sec'] / baseline['docs_per_sec'] - 1:+.0%})"
+    print(f"\n[{name}] {result['docs_per_sec']} docs/sn{change}, tepe RSS {result['peak_rss_mb']} MB"
+          f" (worker'lar {result['workers_peak_rss_mb']} MB)")
+    print(f"  {'aşama':<10}" + ''.join(f"{key:>10}" for key in [f'p{p}' for p in PERCENTILES] + ['max']))
+    for stage, values in result['stages_ms'].items():
+        print(f"  {stage:<10}" + ''.join(f"{value:>10.3f}" for value in values.values()))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--docs', type=int, default=500, help="korpustaki belge sayısı")
+    arg_parser.add_argument('--seed', type=int, default=0, help="korpus seed'i")
+    arg_parser.add_argument('--workers', type=int, default=1, help="CLI -w ve PARSE_WORKERS değeri")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="senaryo başına tekrar")
+    arg_parser.add_argument('--only', nargs='+', choices=SCENARIOS, default=SCENARIOS)
+    arg_parser.add_argument('--tolerans', type=float, default=0.25, help="izin verilen gerileme oranı")
+    arg_parser.add_argument('--update', action='store_true', help="baselines.json dosyasını yeniden yaz")
+    # Alt process için: tek senaryoyu çalıştırıp sonucu JSON olarak yazar
+    arg_parser.add_argument('--scenario', choices=SCENARIOS, help=argparse.SUPPRESS)
+    arg_parser.add_argument('--corpus', help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+    
+    if args.scenario:
+        with contextlib.redirect_stdout(sys.stderr):
+            result = run_scenario(args.scenario, Path(args.corpus), args.workers, args.repeat)
+        print(json.dumps(result))
+        return
+    
+    from benchmarks.corpus import write_mixed_corpus
+    
+    baselines = {}
+    if BASELINES_PATH.exists():
+        with open(BASELINES_PATH, encoding='utf-8') as baselines_file:
+            baselines = json.load(baselines_file)
+    config = {'docs': args.docs, 'seed': args.seed, 'workers': args.workers, 'repeat': args.repeat}
+    if baselines and baselines.get('config') != config and not args.update:
+        print(f"Uyarı: baseline farklı ayarlarla ölçülmüş ({baselines.get('config')}); karşılaştırma yaklaşıktır.")
+    
+    results = {}
+    regressions = []
+    with tempfile.TemporaryDirectory() as corpus:
+        paths = write_mixed_corpus(corpus, args.docs, seed=args.seed)
+        size = sum(path.stat().st_size for path in paths) / 1024 / 1024
+        print(f"Korpus: {len(paths)} belge, {size:.1f} MB (seed {args.seed}), {args.workers} worker, "
+              f"{args.repeat} tekrar")
+        for name in args.only:
+            result = measure_in_subprocess(name, corpus, args.workers, args.repeat)
+            baseline = baselines.get('scenarios', {}).get(name)
+            results[name] = result
+            print_result(name, result, baseline)
+            if baseline and not args.update:
+                regressions.extend(compare(name, result, baseline, args.tolerans))
+    
+    if args.update:
+        scenarios = dict(baselines.get('scenarios', {}), **results)
+        baselines = {'config': config, 'python': platform.python_version(), 'machine': platform.machine(),
+                     'scenarios': scenarios}
+        with open(BASELINES_PATH, 'w', encoding='utf-8') as baselines_file:
+            json.dump(baselines, baselines_file, ensure_ascii=False, indent=1, sort_keys=True)
+            baselines_file.write('\n')
+        print(f"\nBaseline {BASELINES_PATH} dosyasına yazıldı.")
+        return
+    
+    if regressions:
+        print("\nGerileme:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("\nBaseline'a göre gerileme yok.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Artımlı modun yarıda kalan çalışmalardan kurtulmasını sınar
+
+Geçici klasörde karışık bir korpus üretilir ve artımlı mod üç noktada yarıda
+kesilir: sona ekleme bitmiş ama manifest yazılmamışken (çıktının sonuna yarım
+satır da eklenir), satırlar ayıklanıp .tmp dosyaları yazılmış ama commit işareti
+oluşmamışken ve işaret oluştuktan sonra taşıma yapılmadan. Her durumda recover()
+çıktıları kayıtlı duruma (ilk ikisinde son başarılı çalışmanın baytlarına,
+üçüncüsünde .tmp dosyalarına) getirmeli; sonraki artımlı çalışmanın CSV ve JSON
+Lines çıktısı aynı klasörün temiz full mod çıktısıyla aynı satırları içermeli.
+
+Kullanım: python -m benchmarks.check_incremental [--docs N]
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.corpus import mixed_document, write_mixed_corpus
+from irsaliye_parser_v2 import IncrementalSync, IrsaliyeParserV2, main as cli_main
+
+PREFIX = 'irsaliye'
+
+
+class SimulatedCrash(Exception):
+    """Çalışmanın kesildiği noktayı işaretler"""
+
+
+class CrashingSync(IncrementalSync):
+    """Verilen noktada SimulatedCrash fırlatan IncrementalSync
+    
+    append: sona ekleme bitti, manifest yazılmadı; before-commit: .tmp dosyaları
+    yazıldı, commit işareti yok; after-commit: işaret var, taşıma yapılmadı.
+    """
+    
+    def __init__(self, parser, output_folder, prefix, crash_at):
+        super().__init__(parser, output_folder, prefix)
+        self.crash_at = crash_at
+    
+    def save_manifest(self, files, output_sizes, replace=True):
+        if self.crash_at == 'append' and replace:
+            raise SimulatedCrash(self.crash_at)
+        super().save_manifest(files, output_sizes, replace)
+        if self.crash_at == 'before-commit' and not replace:
+            raise SimulatedCrash(self.crash_at)
+    
+    def recover(self, output_sizes):
+        # run() taşımayı recover(None) ile yapar; başlangıçtaki kurtarma çağrısı etkilenmez
+        if self.crash_at == 'after-commit' and output_sizes is None:
+            raise SimulatedCrash(self.crash_at)
+        return super().recover(output_sizes)
+
+
+def read_outputs(output_folder):
+    """Çıktı dosyalarının baytlarını {dosya adı: bayt} olarak döndürür"""
+    return {path.name: path.read_bytes() for path in sorted(Path(output_folder).iterdir()) if path.is_file()}
+
+
+def sorted_rows(rows):
+    return sorted(json.dumps(row, ensure_ascii=False, sort_keys=True) for row in rows)
+
+
+def quiet_cli(argv):
+    with contextlib.redirect_stdout(io.StringIO()):
+        cli_main(argv)
+
+
+def run_crashing(html_folder, output_folder, crash_at):
+    """Artımlı çalışmayı crash_at noktasında keser; kesilen IncrementalSync'i, kesilmezse None döndürür"""
+    parser = IrsaliyeParserV2(html_folder, file_log='off')
+    sync = CrashingSync(parser, output_folder, PREFIX, crash_at)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            sync.run()
+    except SimulatedCrash:
+        return sync
+    finally:
+        parser.close()
+    return None
+
+
+def recover(html_folder, output_folder):
+    """Sonraki çalışmanın başında yapılan kurtarmayı tek başına çalıştırır"""
+    parser = IrsaliyeParserV2(html_folder, file_log='off')
+    sync = IncrementalSync(parser, output_folder, PREFIX)
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, output_sizes = sync.load_manifest()
+        completed = sync.recover(output_sizes)
+    parser.close()
+    return completed
+
+
+def compare_with_full(html_folder, incremental_folder, full_folder, label):
+    """Artımlı çıktıları temiz full mod çıktısıyla karşılaştırır, fark sayısını döndürür"""
+    quiet_cli([str(html_folder), '-o', str(full_folder), '--prefix', PREFIX, '--file-log', 'off', '--no-cache',
+               '-w', '1'])
+    failures = 0
+    
+    with open(full_folder / f'{PREFIX}.csv', newline='', encoding='utf-8') as csv_file:
+        expected = sorted_rows(csv.DictReader(csv_file))
+    with open(incremental_folder / f'{PREFIX}.csv', newline='', encoding='utf-8') as csv_file:
+        found = sorted_rows(csv.DictReader(csv_file))
+    if found != expected:
+        print(f"FARKLI [{label}] CSV: {len(found)} satır, full modda {len(expected)} satır "
+              f"({len(set(found) ^ set(expected))} satır farklı)")
+        failures += 1
+    
+    with open(full_folder / f'{PREFIX}.json', encoding='utf-8') as json_file:
+        expected = sorted_rows(json.load(json_file))
+    with open(incremental_folder / f'{PREFIX}.jsonl', encoding='utf-8') as jsonl_file:
+        try:
+            found = sorted_rows(json.loads(line) for line in jsonl_file)
+        except json.JSONDecodeError as e:
+            print(f"FARKLI [{label}] JSON Lines okunamadı (yarım satır kalmış): {e}")
+            return failures + 1
+    if found != expected:
+        print(f"FARKLI [{label}] JSON Lines: {len(found)} kayıt, full modda {len(expected)} kayıt")
+        failures += 1
+    return failures
+
+
+def check_restored(output_folder, expected, label):
+    """Kurtarmadan sonra çıktı klasörünün beklenen baytlarla aynı olduğunu denetler"""
+    found = read_outputs(output_folder)
+    if found == expected:
+        return 0
+    for name in sorted(set(found) | set(expected)):
+        if found.get(name) != expected.get(name):
+            print(f"FARKLI [{label}] {name}: kurtarmadan sonra kayıtlı durumla aynı değil")
+    return 1
+
+
+def stop_on_failures(failures):
+    """Kesilme noktası denetimi fark bulduysa çıkar (bozuk çıktılar sonraki noktaları da etkiler)"""
+    if failures:
+        print(f"{failures} fark bulundu.")
+        sys.exit(1)
+
+
+def irsaliye_indexes(count):
+    """Satır üreten (kopya veya irsaliye olmayan sayfa değil) örneklerin indeksleri"""
+    return [index for index in range(count) if mixed_document(index)[1] == 'irsaliye']
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--docs', type=int, default=60, help="Korpus boyutu (varsayılan: 60)")
+    args = arg_parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_dir = Path(temp_dir)
+        html_folder = temp_dir / 'html'
+        output_folder = temp_dir / 'cikti'
+        cli_args = [str(html_folder), '-o', str(output_folder), '--prefix', PREFIX, '--mode', 'incremental',
+                    '--file-log', 'off', '--no-cache', '-w', '1']
+        first = args.docs * 2 // 3
+        write_mixed_corpus(html_folder, first)
+        quiet_cli(cli_args)
+        committed = read_outputs(output_folder)
+        failures = 0
+        
+        # 1) Yeni dosyalar sona eklendi, manifest yazılmadan kesildi; son satır da yarım kaldı
+        write_mixed_corpus(html_folder, args.docs - first, start=first)
+        if run_crashing(html_folder, output_folder, 'append') is None:
+            print("FARKLI [sona ekleme] çalışma kesilmedi")
+            failures += 1
+        for name in (f'{PREFIX}.csv', f'{PREFIX}.jsonl'):
+            with open(output_folder / name, 'ab') as output_file:
+                output_file.write(b'{"dosya_adi": "yar')
+        if recover(html_folder, output_folder):
+            print("FARKLI [sona ekleme] commit işareti olmadan taşıma yapıldı")
+            failures += 1
+        failures += check_restored(output_folder, committed, 'sona ekleme')
+        quiet_cli(cli_args)
+        failures += compare_with_full(html_folder, output_folder, temp_dir / 'full-1', 'sona ekleme')
+        stop_on_failures(failures)
+        committed = read_outputs(output_folder)
+        
+        # 2) Değişen ve silinen dosyaların satırları ayıklandı, commit işaretinden önce kesildi
+        changed, deleted, *rest = irsaliye_indexes(args.docs)
+        (html_folder / f'irsaliye_{changed:06d}.html').write_bytes(mixed_document(changed, seed=1)[0])
+        (html_folder / f'irsaliye_{deleted:06d}.html').unlink()
+        sync = run_crashing(html_folder, output_folder, 'before-commit')
+        if sync is None or os.path.exists(sync.commit_path) or not os.path.exists(sync.csv_path + '.tmp'):
+            print("FARKLI [commit öncesi] çalışma .tmp dosyaları yazılıp işaretten önce kesilmedi")
+            failures += 1
+        if recover(html_folder, output_folder):
+            print("FARKLI [commit öncesi] commit işareti olmadan taşıma yapıldı")
+            failures += 1
+        failures += check_restored(output_folder, committed, 'commit öncesi')
+        quiet_cli(cli_args)
+        failures += compare_with_full(html_folder, output_folder, temp_dir / 'full-2', 'commit öncesi')
+        stop_on_failures(failures)
+        
+        # 3) Commit işareti oluştu, .tmp dosyaları yerine taşınmadan kesildi
+        changed, deleted = rest[:2]
+        (html_folder / f'irsaliye_{changed:06d}.html').write_bytes(mixed_document(changed, seed=1)[0])
+        (html_folder / f'irsaliye_{deleted:06d}.html').unlink()
+        sync = run_crashing(html_folder, output_folder, 'after-commit')
+        if sync is None or not os.path.exists(sync.commit_path):
+            print("FARKLI [commit sonrası] çalışma işaretten sonra kesilmedi")
+            failures += 1
+        committed = {name[:-len('.tmp')]: raw for name, raw in read_outputs(output_folder).items()
+                     if name.endswith('.tmp')}
+        if not recover(html_folder, output_folder):
+            print("FARKLI [commit sonrası] commit işareti varken taşıma tamamlanmadı")
+            failures += 1
+        failures += check_restored(output_folder, committed, 'commit sonrası')
+        failures += compare_with_full(html_folder, output_folder, temp_dir / 'full-3', 'commit sonrası')
+        quiet_cli(cli_args)
+        failures += compare_with_full(html_folder, output_folder, temp_dir / 'full-3', 'commit sonrası')
+    
+    stop_on_failures(failures)
+    print(f"{args.docs} belge, 3 kesilme noktası: kurtarma kayıtlı durumu geri getirdi, sonraki çalışmaların "
+          f"çıktısı full modla aynı.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Regresyon korpusunu çekirdekle ve CLI yollarıyla parse edip beklenen çıktıyla karşılaştırır
+
+benchmarks/regression/ altındaki örnekler encoding'leri, eksik alanları ve sınır
+durumlarını kapsar. Bir hızlandırma çıktıyı değiştirirse burada yakalanır; çıktı
+bilerek değiştiyse --update ile expected.json yeniden yazılır (PARSER_VERSION da artırılmalı).
+
+expected.json mevcut kodla üretildiğinden çıktının ilk sürümden sapmasını tek başına
+yakalayamaz. baseline.json aynı örneklerin ilk sürümdeki parser'la (tek dosyalık
+irsaliye_parser_v2.py) üretilmiş satırlarıdır; çekirdeğin çıktısı onunla kolon kolon
+karşılaştırılır. Bilinçli farklar BASELINE_DIFFERENCES'ta kolon başına sebebiyle
+listelenir; listede olmayan her fark hatadır. İlk sürümün okurken çöktüğü örnekler
+çözülmüş metinle parse edilir, çıkarma farkları bu örneklerde de görünür. Örnek
+eklenirse baseline.json ilk sürümden yeniden üretilir:
+
+    git show c933e30:irsaliye_parser_v2.py > /tmp/baseline_parser.py
+    python -m benchmarks.check_regression --baseline-from /tmp/baseline_parser.py
+
+Kullanım: python -m benchmarks.check_regression [--update]
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import sys
+import tempfile
+import warnings
+from pathlib import Path
+
+from irsaliye import decode_html_bytes, parse
+from irsaliye.prefilter import is_irsaliye
+from irsaliye_parser_v2 import IrsaliyeParserV2
+
+REGRESSION_FOLDER = Path(__file__).parent / 'regression'
+EXPECTED_PATH = REGRESSION_FOLDER / 'expected.json'
+BASELINE_PATH = REGRESSION_FOLDER / 'baseline.json'
+
+# İlk sürümün çıktısından bilinçli farklar: örnek -> {kolon: sebep}. Satır sayısı ve diğer kolonlar aynı kalmalı.
+_WINDOWS_1254 = "encoding baytlardan tanınıyor; ilk sürüm windows-1254 dosyayı latin-1 ile okuyup "
+_WINDOWS_1254_DIFFERENCES = {
+    'sevk_adresi': _WINDOWS_1254 + "ı/İ harflerini bozuyordu (Kadýköy/ÝSTANBUL)",
+    'sevk_edilen_kisi': _WINDOWS_1254 + "ş/ğ/İ harflerini bozuyordu (ÝSMAÝL AÐAOÐLU)",
+    'malzeme_aciklama': _WINDOWS_1254 + "ı harfini bozuyordu (açýklamasý)",
+    'not_bilgileri': _WINDOWS_1254 + "'Açıklamalar' başlığını bulamıyor, notu boş bırakıyordu",
+}
+BASELINE_DIFFERENCES = {
+    'encoding_cp1254.html': _WINDOWS_1254_DIFFERENCES,
+    'encoding_cp1254-meta-yok.html': _WINDOWS_1254_DIFFERENCES,
+    'malzemesiz.html': {
+        'not_bilgileri': "malzemesi olmayan irsaliyenin tek satırına da not yazılıyor; ilk sürüm notu sadece "
+                         "malzeme satırlarına ekliyordu",
+    },
+    'miktar_bicimleri.html': {
+        'adeti': "miktar Türkçe sayı olarak okunuyor ('1.250 ADET' -> '1250', '12,5 KG' -> '12,5'); ilk sürüm ilk "
+                 "rakam grubunu alıyordu ('1', '12')",
+    },
+}
+UTF16_CRASH_REASON = ("ilk sürüm önce utf-16 dener; boyutu çift olan BOM'suz UTF-8 dosyada 'UTF-16 stream "
+                      "does not start with BOM' hatası yakalanmadığından dosya hiç satır üretmiyordu")
+
+def core_results(html_files):
+    """Her örneği doğrudan irsaliye.parse ile parse eder"""
+    return {html_file.name: parse(html_file.read_bytes(), html_file.name).records() for html_file in html_files}
+
+
+def cli_results(html_files, workers):
+    """Her örneği CLI sınıfı üzerinden (seri veya process havuzuyla) parse eder"""
+    # Ön filtre kapalı: burada çıkarma çıktısı karşılaştırılır (örneklerin bazıları aynı irsaliyedir)
+    parser = IrsaliyeParserV2(REGRESSION_FOLDER, workers=workers, chunksize=1, prefilter=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return {html_file.name: document.records() for html_file, document in parser._iter_file_documents(html_files)}
+
+
+def baseline_results(html_files, parser_path):
+    """Her örneği ilk sürümün parser'ıyla (parse_single_html) parse eder
+    
+    İlk sürümün okurken çöktüğü örneklerde çıkarma kodu yine de karşılaştırılabilsin diye
+    örnek decode_html_bytes ile çözülüp UTF-16 (BOM'lu) olarak geçici klasöre yazılır ve
+    ilk sürüm onu okur. (satırlar, bu şekilde okunan örnekler) döndürür.
+    """
+    spec = importlib.util.spec_from_file_location('baseline_parser', parser_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    
+    def run(folder, html_file):
+        parser = module.IrsaliyeParserV2(folder)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            parser.parse_single_html(html_file)
+        return parser.parsed_data, f"Hata: {html_file.name} " in output.getvalue()
+    
+    results = {}
+    unreadable = []
+    with tempfile.TemporaryDirectory() as temp_folder:
+        for html_file in html_files:
+            records, failed = run(REGRESSION_FOLDER, html_file)
+            if failed:
+                unreadable.append(html_file.name)
+                decoded_file = Path(temp_folder) / html_file.name
+                decoded_file.write_text(decode_html_bytes(html_file.read_bytes()), encoding='utf-16')
+                records, failed = run(temp_folder, decoded_file)
+                if failed:
+                    raise RuntimeError(f"İlk sürüm {html_file.name} örneğini çözülmüş metinle de parse edemedi")
+            results[html_file.name] = records
+    return results, unreadable
+
+
+def baseline_failures(actual, baseline):
+    """Çekirdeğin çıktısını ilk sürümün çıktısıyla karşılaştırır, listede olmayan farkları yazar
+    
+    Satır sayısı ve listede olmayan kolonlar aynı olmalı; listedeki her kolon da gerçekten
+    farklı olmalı (fark kalmayan girdi listeden silinir).
+    """
+    failures = 0
+    for name in sorted(set(baseline) | set(actual)):
+        current, original = actual.get(name) or [], baseline.get(name) or []
+        differences = BASELINE_DIFFERENCES.get(name, {})
+        if len(current) != len(original):
+            failures += 1
+            print(f"FARKLI [ilk sürüm] {name}: {len(original)} satır yerine {len(current)} satır")
+            continue
+        
+        pairs = list(zip(current, original))
+        for column in sorted({column for record in current + original for column in record}):
+            changed = any(record.get(column) != original_record.get(column) for record, original_record in pairs)
+            if changed and column not in differences:
+                failures += 1
+                print(f"FARKLI [ilk sürüm] {name}: {column}")
+                for record, original_record in pairs:
+                    if record.get(column) != original_record.get(column):
+                        print(f"  ilk sürüm: {original_record.get(column)!r}, bulunan: {record.get(column)!r}")
+            elif not changed and column in differences:
+                # Liste güncel kalsın: fark kalmadıysa girdi silinmeli
+                failures += 1
+                print(f"FARKLI [ilk sürüm] {name}: {column} BASELINE_DIFFERENCES'ta ama ilk sürümle aynı")
+    return failures
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--update', action='store_true', help="expected.json dosyasını yeniden yaz")
+    arg_parser.add_argument('--baseline-from', metavar='PARSER_PY',
+                            help="baseline.json dosyasını ilk sürümün irsaliye_parser_v2.py dosyasıyla yeniden yaz")
+    args = arg_parser.parse_args()
+    
+    html_files = sorted(REGRESSION_FOLDER.glob('*.html'))
+    
+    if args.baseline_from:
+        records, unreadable = baseline_results(html_files, args.baseline_from)
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as baseline_file:
+            json.dump({'okunamayan': unreadable, 'satirlar': records}, baseline_file, ensure_ascii=False, indent=1,
+                      sort_keys=True)
+            baseline_file.write('\n')
+        print(f"{len(records)} örneğin ilk sürüm çıktısı {BASELINE_PATH} dosyasına yazıldı "
+              f"({len(unreadable)} örnek çözülmüş metinle).")
+        return
+    
+    actual = core_results(html_files)
+    
+    if args.update:
+        with open(EXPECTED_PATH, 'w', encoding='utf-8') as expected_file:
+            json.dump(actual, expected_file, ensure_ascii=False, indent=1, sort_keys=True)
+            expected_file.write('\n')
+        print(f"{len(actual)} örneğin çıktısı {EXPECTED_PATH} dosyasına yazıldı.")
+        return
+    
+    with open(EXPECTED_PATH, encoding='utf-8') as expected_file:
+        expected = json.load(expected_file)
+    
+    failures = 0
+    for label, results in (('çekirdek', actual),
+                           ('cli', cli_results(html_files, 1)),
+                           ('cli -w 2', cli_results(html_files, 2))):
+        for name in sorted(set(expected) | set(results)):
+            if results.get(name) != expected.get(name):
+                failures += 1
+                print(f"FARKLI [{label}] {name}")
+                print(f"  beklenen: {json.dumps(expected.get(name), ensure_ascii=False)}")
+                print(f"  bulunan:  {json.dumps(results.get(name), ensure_ascii=False)}")
+    
+    # Ön filtre sadece hiç veri çıkmayacak dosyaları eleyebilir
+    for html_file in html_files:
+        records = expected.get(html_file.name, [])
+        if not is_irsaliye(html_file.read_bytes()) and any(r['irsaliye_no'] or r['malzeme_kodu'] for r in records):
+            failures += 1
+            print(f"FARKLI [ön filtre] {html_file.name}: irsaliye değil sayıldı ama veri içeriyor")
+    
+    with open(BASELINE_PATH, encoding='utf-8') as baseline_file:
+        baseline = json.load(baseline_file)
+    failures += baseline_failures(actual, baseline['satirlar'])
+    
+    if failures:
+        print(f"{failures} fark bulundu.")
+        sys.exit(1)
+    print(f"{len(expected)} örnek, 3 yol: çıktılar beklenenle aynı; ön filtre veri içeren örnek elemedi.")
+    print(f"İlk sürümle karşılaştırma: {len(expected) - len(BASELINE_DIFFERENCES)} örnek aynı, "
+          f"{len(BASELINE_DIFFERENCES)} örnekte bilinçli fark:")
+    for name, differences in sorted(BASELINE_DIFFERENCES.items()):
+        for column, reason in differences.items():
+            print(f"  {name} / {column}: {reason}")
+    if baseline['okunamayan']:
+        print(f"İlk sürümün okurken çöktüğü {len(baseline['okunamayan'])} örnek ({', '.join(baseline['okunamayan'])}) "
+              f"çözülmüş metinle karşılaştırıldı: {UTF16_CRASH_REASON}.")
+
+
+if __name__ == '__main__':
+    main()
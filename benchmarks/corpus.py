@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark'lar için sentetik e-irsaliye HTML üretici
+
+irsaliye_html() hep aynı şablonu üretir (mikro benchmark'lar için). mixed_document()
+gerçek klasörlere benzer karışık bir korpus üretir: farklı encoding'ler, 0-300
+kalemli belgeler, td başlıklı ve sayfalara bölünmüş malzeme tabloları, eksik
+alanlar, irsaliye olmayan sayfalar ve daha önceki belgelerin kopyaları.
+
+Kullanım: python -m benchmarks.corpus <klasör> --docs 1000 [--basit]
+"""
+
+import argparse
+import codecs
+import json
+import random
+from pathlib import Path
+
+KISILER = ['AHMET YILMAZ', 'AYŞE ÇELİK', 'MEHMET ÖZTÜRK', 'ŞULE GÜNEŞ', 'İSMAİL AĞAOĞLU']
+ADRESLER = [
+    'Atatürk Cad. No:5 Kadıköy/İSTANBUL',
+    'Gazi Mah. 12. Sok. No:3 Çankaya/ANKARA',
+    'Liman Yolu Depo 3 Konak/İZMİR',
+]
+
+
+def irsaliye_html(index, rng=None):
+    """index numaralı sentetik irsaliye HTML metnini üretir"""
+    rng = rng or random.Random(index)
+    qr = json.dumps({
+        'vkntckn': '1234567890',
+        'no': f'YGA2025{index:09d}',
+        'tarih': f'2025-{1 + index % 12:02d}-{1 + index % 28:02d}',
+    }, ensure_ascii=False)
+    
+    satirlar = ''.join(
+        f'<tr><td>{sira}</td><td>MLZ-{rng.randint(1, 500):04d}</td>'
+        f'<td>Malzeme açıklaması {sira}</td><td>{rng.randint(1, 250)} ADET</td></tr>\n'
+        for sira in range(1, rng.randint(1, 8) + 1)
+    )
+    tel = f' Tel:{rng.randint(5000000000, 5999999999)}'
+    
+    return f'''<html><head><meta charset="utf-8"><title>e-İrsaliye</title></head><body>
+<div id="qrvalue" style="display:none">{qr}</div>
+<table width="800"><tr><td>
+<table id="customerPartyTable"><tr><td><hr/></td></tr><tr><td>SAYIN</td></tr>
+<tr><td>{rng.choice(KISILER)}</td></tr></table>
+</td><td><span>Sevk Adresi: {rng.choice(ADRESLER)}<br/>{tel}</span></td></tr></table>
+<table id="malzemeTable"><tr><th>Sıra No</th><th>Malzeme Kodu</th><th>Malzeme Açıklaması</th><th>Miktar</th></tr>
+{satirlar}</table>
+<table><tr><th>Açıklamalar</th></tr><tr><td>Not:</td><td>Sipariş {index}</td></tr></table>
+</body></html>'''
+
+
+# Örnek encoding'ler: (ad, meta charset, BOM, codec)
+ENCODINGS = {
+    'utf-8': ('utf-8', b'', 'utf-8'),
+    'utf-8-bom': ('utf-8', codecs.BOM_UTF8, 'utf-8'),
+    'utf-16le-bom': ('utf-16', codecs.BOM_UTF16_LE, 'utf-16-le'),
+    'utf-16be-bom': ('utf-16', codecs.BOM_UTF16_BE, 'utf-16-be'),
+    'cp1254': ('windows-1254', b'', 'cp1254'),
+    'cp1254-meta-yok': (None, b'', 'cp1254'),
+}
+
+
+def encode_html(html, encoding):
+    """HTML metnini ENCODINGS içindeki bir örnek encoding ile baytlara çevirir"""
+    charset, bom, codec = ENCODINGS[encoding]
+    if charset is None:
+        html = html.replace('<meta charset="utf-8">', '')
+    else:
+        html = html.replace('<meta charset="utf-8">', f'<meta charset="{charset}">')
+    return bom + html.encode(codec)
+
+
+# Karışık korpusta encoding ağırlıkları (çoğu dosya UTF-8)
+ENCODING_WEIGHTS = {
+    'utf-8': 60, 'utf-8-bom': 10, 'cp1254': 15, 'cp1254-meta-yok': 5, 'utf-16le-bom': 7, 'utf-16be-bom': 3,
+}
+
+MALZEMELER = ['Çelik boru Ø50', 'Galvaniz sac 2mm', 'Şartel 16A', 'Kablo NYAF 2,5 mm²', 'Vida M8 (kutu)', 'Ağaç palet']
+
+MIKTAR_BICIMLERI = ['{} ADET', '{} KG', '{},00 ADET', '{} M', '{}']
+
+IRSALIYE_OLMAYAN_SAYFALAR = [
+    '<html><head><meta charset="utf-8"><title>Giriş</title></head><body><form><input name="kullanici"/>'
+    '</form></body></html>',
+    '<html><head><meta charset="utf-8"><title>e-Fatura</title></head><body><table><tr><th>Ürün</th>'
+    '<th>Tutar</th></tr><tr><td>Hizmet bedeli</td><td>1.250,00 TL</td></tr></table></body></html>',
+    '<html><head><meta charset="utf-8"></head><body><p>Bu belge görüntülenemiyor.</p></body></html>',
+]
+
+
+def _kalem_sayisi(rng):
+    """Gerçek dağılıma benzer: çoğu belge birkaç kalemli, az sayıda belge kalemsiz veya çok uzun"""
+    roll = rng.random()
+    if roll < 0.05:
+        return 0
+    if roll < 0.85:
+        return rng.randint(1, 8)
+    if roll < 0.97:
+        return rng.randint(9, 40)
+    return rng.randint(41, 300)
+
+
+def _malzeme_tablolari(rng, kalem_sayisi):
+    """Malzeme satırlarını bir veya (uzun belgelerde) birkaç sayfa tablosuna böler"""
+    header_cell = 'th' if rng.random() < 0.8 else 'td'
+    header = ''.join(f'<{header_cell}>{baslik}</{header_cell}>'
+                     for baslik in ('Sıra No', 'Malzeme Kodu', 'Malzeme Açıklaması', 'Miktar'))
+    sayfa_boyu = 25 if kalem_sayisi > 30 else max(kalem_sayisi, 1)
+    
+    tablolar = []
+    for sayfa_basi in range(0, max(kalem_sayisi, 1), sayfa_boyu):
+        satirlar = []
+        for sira in range(sayfa_basi + 1, min(sayfa_basi + sayfa_boyu, kalem_sayisi) + 1):
+            miktar = rng.choice(MIKTAR_BICIMLERI).format(rng.randint(1, 2500))
+            satirlar.append(f'<tr><td>{sira}</td><td>MLZ-{rng.randint(1, 5000):05d}</td>'
+                            f'<td>{rng.choice(MALZEMELER)} {sira}</td><td>{miktar}</td></tr>\n')
+            # Arada boş satırlar da olur (ara toplam, boş kod)
+            if rng.random() < 0.02:
+                satirlar.append('<tr><td></td><td></td><td>Ara toplam</td><td></td></tr>\n')
+        tablolar.append(f'<table id="malzemeTable"><tr>{header}</tr>\n{"".join(satirlar)}</table>')
+    return '\n'.join(tablolar)
+
+
+def mixed_irsaliye_html(index, rng):
+    """Alanları ve yapısı belgeden belgeye değişen sentetik irsaliye HTML metni"""
+    qr = json.dumps({
+        'vkntckn': f'{rng.randint(1000000000, 9999999999)}',
+        'no': f'YGA{2023 + index % 3}{index:09d}',
+        'tarih': f'{2023 + index % 3}-{1 + index % 12:02d}-{1 + index % 28:02d}',
+    }, ensure_ascii=False)
+    
+    kisi = '' if rng.random() < 0.1 else f'<tr><td>SAYIN</td></tr><tr><td>{rng.choice(KISILER)}</td></tr>'
+    tel = f'<br/> Tel:{rng.randint(5000000000, 5999999999)}' if rng.random() < 0.7 else ''
+    adres = rng.choice(ADRESLER).replace(' ', '<br/>', 1) if rng.random() < 0.2 else rng.choice(ADRESLER)
+    sevk = f'<span>Sevk Adresi: {adres}{tel}</span>' if rng.random() < 0.95 else ''
+    notlar = (f'<table><tr><th>Açıklamalar</th></tr><tr><td>Not:</td><td>Sipariş {index}</td></tr></table>'
+              if rng.random() < 0.8 else '')
+    # Görüntüleyicinin eklediği stil ve script blokları belge boyutunu büyütür
+    stil = '<style>' + 'td{border:1px solid #000;padding:2px}' * rng.randint(5, 60) + '</style>'
+    
+    return f'''<html><head><meta charset="utf-8"><title>e-İrsaliye</title>{stil}
+<script>function yazdir(){{window.print();}}</script></head><body>
+<div id="qrvalue" style="display:none">{qr}</div>
+<table width="800"><tr><td>
+<table id="customerPartyTable"><tr><td><hr/></td></tr>{kisi}</table>
+</td><td>{sevk}</td></tr></table>
+{_malzeme_tablolari(rng, _kalem_sayisi(rng))}
+{notlar}
+</body></html>'''
+
+
+def mixed_document(index, seed=0):
+    """(dosya baytları, tür) döndürür; tür 'irsaliye', 'irsaliye-degil' veya 'kopya'"""
+    rng = random.Random(f'{seed}:{index}')
+    # Aynı irsaliye klasöre birden çok kez kopyalanmış olabilir
+    if index and rng.random() < 0.05:
+        return mixed_document(rng.randrange(index), seed)[0], 'kopya'
+    encoding = rng.choices(list(ENCODING_WEIGHTS), weights=list(ENCODING_WEIGHTS.values()))[0]
+    if rng.random() < 0.03:
+        return encode_html(rng.choice(IRSALIYE_OLMAYAN_SAYFALAR), encoding), 'irsaliye-degil'
+    html = mixed_irsaliye_html(index, rng)
+    if rng.random() < 0.1:
+        html = html.replace('\n', '\r\n')
+    return encode_html(html, encoding), 'irsaliye'
+
+
+def write_mixed_corpus(folder, count, start=0, seed=0):
+    """folder içine count adet karışık belge yazar, yolları döndürür (aynı seed aynı korpusu üretir)"""
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for index in range(start, start + count):
+        raw, _ = mixed_document(index, seed)
+        path = folder / f'irsaliye_{index:06d}.html'
+        path.write_bytes(raw)
+        paths.append(path)
+    return paths
+
+
+def write_corpus(folder, count, start=0):
+    """folder içine count adet irsaliye HTML dosyası yazar, yolları döndürür"""
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for index in range(start, start + count):
+        path = folder / f'irsaliye_{index:06d}.html'
+        path.write_text(irsaliye_html(index), encoding='utf-8')
+        paths.append(path)
+    return paths
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Sentetik e-irsaliye korpusu üretir")
+    arg_parser.add_argument('folder', help="Çıktı klasörü")
+    arg_parser.add_argument('--docs', type=int, default=1000, help="belge sayısı")
+    arg_parser.add_argument('--seed', type=int, default=0, help="karışık korpus için seed")
+    arg_parser.add_argument('--basit', action='store_true', help="tek tip UTF-8 şablonu kullan")
+    args = arg_parser.parse_args()
+    
+    if args.basit:
+        paths = write_corpus(args.folder, args.docs)
+    else:
+        paths = write_mixed_corpus(args.folder, args.docs, seed=args.seed)
+    size = sum(path.stat().st_size for path in paths)
+    print(f"{len(paths)} dosya ({size / 1024 / 1024:.1f} MB) {args.folder} klasörüne yazıldı.")
+
+
+if __name__ == '__main__':
+    main()
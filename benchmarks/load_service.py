@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Çok sayıda eşzamanlı küçük yüklemede parse servisini ön yüz process'inde parse etmeyle karşılaştırır
+
+Karışık korpustan --docs-per-upload belgelik yüklemeler --concurrency thread'den
+art arda gönderilir (gunicorn'un thread'leri veya iş kuyruğu gibi). İki yol ölçülür:
+
+- process: belgeler ön yüz process'inin kendi thread'lerinde parse edilir
+- service: belgeler Unix soketinden parse servisine gönderilir (--socket verilmezse
+  --workers worker'lı bir servis başlatılır)
+
+Yükleme başına gecikme yüzdelikleri, belge/sn ve servisin busy/timeout sayaçları
+raporlanır. Ayrıca ön yüzde her 5 ms'de 1 ms uyuyan bir yoklama thread'i çalışır;
+gecikmesi, parse sürerken ön yüzün başka isteklere (durum, indirme) ne kadar geç
+cevap verdiğini gösterir.
+
+Kullanım: python -m benchmarks.load_service --uploads 300 --concurrency 16 --docs-per-upload 3
+"""
+
+import argparse
+import itertools
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import wait
+from pathlib import Path
+
+from benchmarks.bench_suite import REPO_ROOT, percentiles
+from benchmarks.corpus import write_mixed_corpus
+from irsaliye import parse
+from irsaliye.service import ParseServiceClient
+
+PROBE_INTERVAL = 0.005
+PROBE_SLEEP = 0.001
+
+
+def start_service(path, workers):
+    """Servisi ayrı process'te başlatır, soket açılana kadar bekler"""
+    process = subprocess.Popen([sys.executable, '-m', 'irsaliye.service', '--socket', path, '--workers', str(workers)],
+                               cwd=REPO_ROOT, stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while not os.path.exists(path):
+        if process.poll() is not None or time.monotonic() > deadline:
+            raise RuntimeError("Parse servisi başlatılamadı")
+        time.sleep(0.05)
+    return process
+
+
+def probe(stop, delays):
+    """Ön yüzün tepki gecikmesi: 1 ms'lik uykunun ne kadar geç döndüğü"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        time.sleep(PROBE_SLEEP)
+        delays.append(time.perf_counter() - started - PROBE_SLEEP)
+        time.sleep(PROBE_INTERVAL)
+
+
+def run_load(uploads, concurrency, parse_upload):
+    """uploads yüklemeyi concurrency thread'den gönderir
+    
+    (toplam süre, yükleme süreleri, yoklama gecikmeleri, hatalar) döndürür.
+    """
+    counter = itertools.count()
+    latencies, delays, failures = [], [], []
+    lock = threading.Lock()
+    
+    def sender():
+        while next(counter) < uploads:
+            started = time.perf_counter()
+            errors = parse_upload()
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                failures.extend(errors)
+    
+    stop = threading.Event()
+    prober = threading.Thread(target=probe, args=(stop, delays))
+    prober.start()
+    started = time.perf_counter()
+    senders = [threading.Thread(target=sender) for _ in range(concurrency)]
+    for thread in senders:
+        thread.start()
+    for thread in senders:
+        thread.join()
+    total = time.perf_counter() - started
+    stop.set()
+    prober.join()
+    return total, latencies, delays, failures
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--uploads', type=int, default=300, help="toplam yükleme sayısı")
+    arg_parser.add_argument('--concurrency', type=int, default=16, help="eşzamanlı yükleme")
+    arg_parser.add_argument('--docs-per-upload', type=int, default=3, help="yükleme başına belge")
+    arg_parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1, help="servis worker sayısı")
+    arg_parser.add_argument('--socket', help="çalışan bir servisin soketi (verilmezse servis başlatılır)")
+    arg_parser.add_argument('--only', nargs='+', choices=['process', 'service'], default=['process', 'service'])
+    args = arg_parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as folder:
+        paths = write_mixed_corpus(folder, 200)
+        documents = [(Path(path).name, Path(path).read_bytes()) for path in paths]
+        # Yüklemeler hep tam --docs-per-upload belge içerir
+        batches = itertools.cycle([documents[index:index + args.docs_per_upload]
+                                   for index in range(0, len(documents) - args.docs_per_upload + 1,
+                                                      args.docs_per_upload)])
+        batches_lock = threading.Lock()
+        
+        def next_batch():
+            with batches_lock:
+                return next(batches)
+        
+        def parse_in_process():
+            errors = []
+            for filename, raw in next_batch():
+                try:
+                    parse(raw, filename)
+                except Exception as e:
+                    errors.append(str(e))
+            return errors
+        
+        print(f"{args.uploads} yükleme x {args.docs_per_upload} belge, {args.concurrency} eşzamanlı")
+        print(f"{'yol':<10} {'belge/sn':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} "
+              f"{'yoklama p50':>12} {'yoklama p99':>12} {'hata':>5}")
+        
+        def report(label, total, latencies, delays, failures):
+            upload_ms = percentiles(latencies)
+            probe_ms = percentiles(delays)
+            print(f"{label:<10} {len(latencies) * args.docs_per_upload / total:>9.1f} {upload_ms['p50']:>9.1f} "
+                  f"{upload_ms['p90']:>9.1f} {upload_ms['p99']:>9.1f} {probe_ms['p50']:>12.2f} "
+                  f"{probe_ms['p99']:>12.2f} {len(failures):>5}")
+        
+        if 'process' in args.only:
+            report('process', *run_load(args.uploads, args.concurrency, parse_in_process))
+        
+        if 'service' in args.only:
+            socket_path = args.socket or os.path.join(folder, 'irsaliye.sock')
+            service = None if args.socket else start_service(socket_path, args.workers)
+            client = ParseServiceClient(socket_path, concurrency=args.concurrency * args.docs_per_upload)
+            try:
+                def parse_in_service():
+                    futures = [client.submit(raw, filename) for filename, raw in next_batch()]
+                    wait(futures)
+                    return [str(future.exception()) for future in futures if future.exception() is not None]
+                
+                report('service', *run_load(args.uploads, args.concurrency, parse_in_service))
+                stats = client.stats()
+                print(f"Servis: {stats['workers']} worker, en fazla {stats['max_pending']} istek; "
+                      f"işlenen {stats.get('served', 0)}, busy {stats.get('busy', 0)}, "
+                      f"timeout {stats.get('timeouts', 0)}, hata {stats.get('errors', 0)}")
+            finally:
+                client.close()
+                if service is not None:
+                    service.terminate()
+                    service.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""E-irsaliye HTML çıkarma çekirdeği
+
+Komut satırı aracı (irsaliye_parser_v2.py) ve Flask uygulaması (app.py) aynı
+çıkarma kodunu buradan kullanır:
+    
+    from irsaliye import parse
+    belge = parse(raw_bytes, 'irsaliye.html')  # başlık + kalemler
+    records = belge.records()                  # dışa aktarım satırları
+
+Ham metinden okunan ek başlık alanları (vergi no, plaka ...) register_field
+ile eklenir. Malzeme / sevk adresi / gün toplamları Aggregator ile parse
+sırasında çıkar.
+
+Parquet / Arrow / Feather yazıcısı pyarrow gerektirdiğinden ayrıca yüklenir:
+irsaliye.columnar.ColumnarDocumentWriter.
+"""
+
+from irsaliye.aggregate import Aggregator
+from irsaliye.cache import ResultCache
+from irsaliye.document import (
+    FIELDNAMES, HEADER_FIELDS, Irsaliye, Kalem, empty_irsaliye_record, iter_document_records,
+    iter_record_documents, record_fieldnames, to_date, to_number
+)
+from irsaliye.encoding import decode_html_bytes, declared_encoding, detect_encoding
+from irsaliye.fields import FieldExtractor, parse_quantity, register_field, unregister_field
+from irsaliye.extract import HTML_PARSER, PARSER_VERSION, extract_document, parse
+from irsaliye.metrics import ParseMetrics
+from irsaliye.store import IrsaliyeStore
+from irsaliye.writers import (
+    CsvRecordWriter, JsonArrayRecordWriter, JsonLinesRecordWriter, build_line_index, iter_export_chunks, read_records_page
+)
+
+__all__ = [
+    'Aggregator', 'CsvRecordWriter', 'FIELDNAMES', 'FieldExtractor', 'HEADER_FIELDS', 'HTML_PARSER', 'Irsaliye',
+    'IrsaliyeStore', 'JsonArrayRecordWriter', 'JsonLinesRecordWriter', 'Kalem', 'PARSER_VERSION', 'ParseMetrics',
+    'ResultCache', 'build_line_index', 'decode_html_bytes', 'declared_encoding', 'detect_encoding',
+    'empty_irsaliye_record', 'extract_document', 'iter_document_records', 'iter_export_chunks',
+    'iter_record_documents', 'parse', 'parse_quantity', 'read_records_page', 'record_fieldnames', 'register_field',
+    'to_date', 'to_number', 'unregister_field',
+]
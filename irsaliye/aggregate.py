@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""Belgeler akarken malzeme, sevk adresi ve gün bazında toplamlar
+
+Aggregator diğer belge yazıcıları (Parquet, SQLite deposu) gibi parse sırasında
+write_document ile beslenir; her grup anahtarı için bir sözlük girdisi tutulur ve
+yerinde güncellenir. Satırlar bellekte tutulmadığından milyon satırlık çıktının
+özeti de aynı geçişte çıkar; bellek sadece farklı malzeme / adres / gün sayısıyla
+büyür. Miktarlar to_number ile sayıya çevrilir; sayı olmayan miktarlar toplama
+girmez, miktarsiz olarak sayılır.
+"""
+
+import csv
+
+from irsaliye.document import iter_record_documents, to_date, to_number
+
+# Grup adı -> (anahtar kolonu, ek kolonlar)
+AGGREGATE_GROUPS = {
+    'malzeme': ('malzeme_kodu', ['malzeme_aciklama']),
+    'adres': ('sevk_adresi', []),
+    'gun': ('tarih', []),
+}
+TOTAL_FIELDS = ['irsaliye', 'kalem', 'miktar']
+# Sayıya çevrilmiş miktar metinleri önbelleğinin üst sınırı
+AMOUNT_CACHE_SIZE = 100000
+
+
+def format_amount(value):
+    """Toplam miktarı CSV için adeti kolonu gibi yazar: binlik ayırıcısız, virgül ondalıklı ('1250,5')"""
+    return f'{value:.6f}'.rstrip('0').rstrip('.').replace('.', ',')
+
+
+def _json_amount(value):
+    value = round(value, 6)
+    return int(value) if value == int(value) else value
+
+
+def write_group_csv(group, rows, output_file):
+    """Bir grubun satırlarını (rows() veya summary() çıktısı) CSV olarak yazar; miktar virgül ondalıklı"""
+    key_field, extra_fields = AGGREGATE_GROUPS[group]
+    owns_file = not hasattr(output_file, 'write')
+    csv_file = open(output_file, 'w', encoding='utf-8', newline='') if owns_file else output_file
+    try:
+        writer = csv.DictWriter(csv_file, fieldnames=[key_field] + extra_fields + TOTAL_FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({**row, 'miktar': format_amount(row['miktar'])})
+    finally:
+        if owns_file:
+            csv_file.close()
+
+
+class Aggregator:
+    """Malzeme kodu, sevk adresi ve irsaliye günü başına irsaliye sayısı, kalem sayısı ve toplam miktar
+    
+    Girdiler [irsaliye, kalem, miktar] listeleridir (malzemede başta açıklama da
+    vardır). Tarihi okunamayan belgeler gün grubunda '' anahtarına düşer.
+    """
+    
+    def __init__(self):
+        self.documents = 0
+        self.lines = 0
+        self.miktar = 0.0
+        self.miktarsiz = 0
+        self.malzeme = {}
+        self.adres = {}
+        self.gun = {}
+        self._days = {}
+        self._amounts = {}
+        self._pending_records = []
+    
+    def _day(self, value):
+        # Aynı tarih metni binlerce belgede tekrar eder; strptime bir kez çalışır
+        day = self._days.get(value)
+        if day is None:
+            parsed = to_date(value)
+            day = self._days[value] = parsed.isoformat() if parsed else ''
+        return day
+    
+    def write_document(self, document):
+        malzeme = self.malzeme
+        amounts = self._amounts
+        document_total = 0.0
+        seen = set()
+        for kalem in document.kalemler:
+            # Miktar metinleri de çok tekrar eder; to_number her farklı metin için bir kez çalışır
+            amount = amounts.get(kalem.adeti)
+            if amount is None:
+                if len(amounts) >= AMOUNT_CACHE_SIZE:
+                    amounts.clear()
+                number = to_number(kalem.adeti)
+                # Sayı olmayan miktar False olarak saklanır (None önbellekte yok demektir)
+                amount = amounts[kalem.adeti] = False if number is None else number
+            if amount is False:
+                self.miktarsiz += 1
+                amount = 0.0
+            entry = malzeme.get(kalem.malzeme_kodu)
+            if entry is None:
+                entry = malzeme[kalem.malzeme_kodu] = [kalem.malzeme_aciklama, 0, 0, 0.0]
+            # Aynı malzeme belgede birden çok satırda geçse de irsaliye bir kez sayılır
+            if kalem.malzeme_kodu not in seen:
+                seen.add(kalem.malzeme_kodu)
+                entry[1] += 1
+            entry[2] += 1
+            entry[3] += amount
+            document_total += amount
+        
+        kalem_count = len(document.kalemler)
+        for totals, key in ((self.adres, document.sevk_adresi), (self.gun, self._day(document.irsaliye_tarihi))):
+            entry = totals.get(key)
+            if entry is None:
+                entry = totals[key] = [0, 0, 0.0]
+            entry[0] += 1
+            entry[1] += kalem_count
+            entry[2] += document_total
+        
+        self.documents += 1
+        self.lines += kalem_count
+        self.miktar += document_total
+    
+    def write(self, record):
+        """Düz satır alır; ardışık satırlar belgeye toplanır (ColumnarDocumentWriter gibi)"""
+        if self._pending_records and (record['dosya_adi'], record['irsaliye_no']) != \
+                (self._pending_records[0]['dosya_adi'], self._pending_records[0]['irsaliye_no']):
+            self._write_pending()
+        self._pending_records.append(record)
+    
+    def _write_pending(self):
+        for document in iter_record_documents(self._pending_records):
+            self.write_document(document)
+        self._pending_records = []
+    
+    def close(self):
+        self._write_pending()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def rows(self, group, limit=None):
+        """Grubun satırları: malzeme ve adres toplam miktara göre azalan, gün tarih sırasıyla"""
+        key_field, extra_fields = AGGREGATE_GROUPS[group]
+        totals = getattr(self, group)
+        if group == 'gun':
+            # Tarihsiz belgeler sona
+            keys = sorted(totals, key=lambda day: (day == '', day))
+        else:
+            keys = sorted(totals, key=lambda key: (-totals[key][-1], key))
+        if limit is not None:
+            keys = keys[:limit]
+        rows = []
+        for key in keys:
+            values = totals[key]
+            row = {key_field: key}
+            row.update(zip(extra_fields, values))
+            row.update(zip(TOTAL_FIELDS, values[len(extra_fields):]))
+            rows.append(row)
+        return rows
+    
+    def summary(self, limit=None):
+        """JSON'a yazılabilir özet; limit verilirse her grupta ilk limit satır"""
+        summary = {
+            'irsaliye': self.documents,
+            'kalem': self.lines,
+            'miktar': _json_amount(self.miktar),
+            'miktarsiz': self.miktarsiz,
+        }
+        for group in AGGREGATE_GROUPS:
+            summary[f'{group}_sayisi'] = len(getattr(self, group))
+            rows = self.rows(group, limit)
+            for row in rows:
+                row['miktar'] = _json_amount(row['miktar'])
+            summary[group] = rows
+        return summary
+    
+    def write_csv(self, group, output_file):
+        """Grubun tüm satırlarını CSV olarak yazar (dosya yolu veya açık metin akışı)"""
+        write_group_csv(group, self.rows(group), output_file)
+    
+    def print_top(self, limit=5):
+        """Her grubun ilk limit satırını konsola yazar"""
+        print(f"\nToplam: {self.documents} irsaliye, {self.lines} kalem, miktar {format_amount(self.miktar)}"
+              + (f" ({self.miktarsiz} kalemin miktarı sayı değil)" if self.miktarsiz else ""))
+        titles = {'malzeme': 'Malzeme kodu', 'adres': 'Sevk adresi', 'gun': 'Gün'}
+        for group, title in titles.items():
+            key_field = AGGREGATE_GROUPS[group][0]
+            rows = self.rows(group, limit)
+            print(f"\n{title} ({len(getattr(self, group))} farklı; ilk {len(rows)}):")
+            for row in rows:
+                label = row[key_field] or '(boş)'
+                print(f"  {label[:50]:<50} {row['irsaliye']:>7} irsaliye {row['kalem']:>8} kalem "
+                      f"{format_amount(row['miktar']):>14}")
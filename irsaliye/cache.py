@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""Parse sonuçlarının içerik hash'iyle saklandığı SQLite önbelleği"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from irsaliye.document import HEADER_FIELDS, Irsaliye, Kalem
+from irsaliye.extract import PARSER_VERSION
+from irsaliye.fields import fields_signature
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """Parse sonuçlarını ham içeriğin hash'i ve parser sürümüyle SQLite'ta saklar
+    
+    Aynı baytlar tekrar geldiğinde soup oluşturulmadan belge döner. Belge başlık,
+    not ve kalemler olarak (satırlara düzleştirilmeden) ve dosya adından bağımsız
+    saklanır; dosya_adi okunurken doldurulur.
+    
+    get() veritabanına yazmaz. Yeni kayıtlar ve isabetlerin erişim zamanları bellekte
+    biriktirilir, COMMIT_EVERY'ye ulaşınca veya flush() ile tek bir kısa işlemde
+    yazılır; SQLite'ın tek yazma kilidi parse sürerken tutulmaz, aynı dosyayı
+    kullanan process'ler birbirini beklemez. Önbellek hataları (kilit, bozuk kayıt,
+    dolu disk) uyarı olarak loglanır ve ıska sayılır; parse sonucunu hiçbir zaman
+    etkilemez.
+    """
+    
+    # Saklama biçimi değiştiğinde artırılır (eski kayıtlar ıskalanır ve zamanla silinir)
+    STORAGE_FORMAT = 2
+    
+    # Bu kadar bekleyen yazımda bir işlem (ve temizlik) yapılır
+    COMMIT_EVERY = 500
+    
+    def __init__(self, path, max_entries=200000, max_age_days=90):
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_days * 24 * 3600 if max_age_days else None
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        # anahtar -> (kayıt, zaman) ve anahtar -> erişim zamanı; flush'a kadar bellekte
+        self._pending_puts = {}
+        self._pending_touches = {}
+        self._lock = threading.Lock()
+        # Otomatik işlem açılmaz: okumalar kilit almaz, yazımlar _write_pending'deki açık işlemdedir
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            ' key TEXT PRIMARY KEY,'
+            ' records TEXT NOT NULL,'
+            ' created_at REAL NOT NULL,'
+            ' accessed_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS results_accessed_at ON results (accessed_at)')
+    
+    @staticmethod
+    def key_for(raw):
+        """Ham baytlar, parser sürümü ve kayıtlı ek alanlardan önbellek anahtarı üretir"""
+        key = f"{hashlib.sha256(raw).hexdigest()}:{PARSER_VERSION}:{ResultCache.STORAGE_FORMAT}"
+        signature = fields_signature()
+        return f"{key}:{signature}" if signature else key
+    
+    def get(self, key, filename):
+        """Önbellekteki belgeyi dosya adıyla döndürür, yoksa (veya okunamazsa) None"""
+        now = time.time()
+        error = None
+        with self._lock:
+            row = self._pending_puts.get(key)
+            if row is None:
+                try:
+                    row = self._conn.execute('SELECT records, created_at FROM results WHERE key = ?',
+                                             (key,)).fetchone()
+                except sqlite3.Error as e:
+                    row, error = None, e
+        
+        document = None
+        if row is not None and not (self.max_age_seconds and row[1] < now - self.max_age_seconds):
+            try:
+                header, not_bilgileri, kalemler, *ekler = json.loads(row[0])
+                document = Irsaliye(filename, *header, not_bilgileri=not_bilgileri,
+                                    kalemler=[Kalem(*kalem) for kalem in kalemler],
+                                    ekler=ekler[0] if ekler else None)
+            except (ValueError, TypeError) as e:
+                # Bozuk kayıt ıska sayılır; belge yeniden parse edilip üzerine yazılır
+                error = e
+        
+        with self._lock:
+            if error is not None:
+                self._failed('okunamadı', error)
+            if document is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._pending_touches[key] = now
+            if len(self._pending_touches) >= self.COMMIT_EVERY:
+                self._write_pending()
+        return document
+    
+    def put(self, key, document):
+        """Bir belgeyi (dosya_adi hariç) yazılmak üzere sıraya koyar"""
+        payload = [
+            [getattr(document, field) for field in HEADER_FIELDS],
+            document.not_bilgileri,
+            [[kalem.malzeme_kodu, kalem.malzeme_aciklama, kalem.adeti] for kalem in document.kalemler],
+        ]
+        if document.ekler:
+            payload.append(document.ekler)
+        payload = json.dumps(payload, ensure_ascii=False)
+        with self._lock:
+            self._pending_puts[key] = (payload, time.time())
+            if len(self._pending_puts) >= self.COMMIT_EVERY:
+                self._write_pending()
+    
+    def _write_pending(self):
+        """Bekleyen kayıtları ve erişim zamanlarını tek bir kısa işlemde yazar; hata olursa atılır"""
+        puts, touches = self._pending_puts, self._pending_touches
+        self._pending_puts, self._pending_touches = {}, {}
+        if not puts and not touches:
+            return
+        try:
+            # Bağlantı bağlam yöneticisi açık işlemi commit eder, hata olursa geri alır
+            with self._conn:
+                self._conn.execute('BEGIN IMMEDIATE')
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO results (key, records, created_at, accessed_at) VALUES (?, ?, ?, ?)',
+                    [(key, payload, created, created) for key, (payload, created) in puts.items()],
+                )
+                self._conn.executemany('UPDATE results SET accessed_at = ? WHERE key = ?',
+                                       [(accessed, key) for key, accessed in touches.items()])
+                if puts:
+                    self._evict()
+        except sqlite3.Error as e:
+            self._failed(f'yazılamadı ({len(puts)} kayıt atıldı)', e)
+    
+    def _failed(self, action, error):
+        self.errors += 1
+        logger.warning("Sonuç önbelleği %s: %s (%s)", action, error, self.path)
+    
+    def _evict(self):
+        """Süresi dolan ve en uzun süredir kullanılmayan fazla kayıtları siler"""
+        if self.max_age_seconds:
+            self._conn.execute('DELETE FROM results WHERE created_at < ?', (time.time() - self.max_age_seconds,))
+        if self.max_entries:
+            excess = self._conn.execute('SELECT COUNT(*) FROM results').fetchone()[0] - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    'DELETE FROM results WHERE key IN '
+                    '(SELECT key FROM results ORDER BY accessed_at LIMIT ?)', (excess,)
+                )
+    
+    def evict(self):
+        """Temizliği hemen çalıştırır"""
+        with self._lock, self._conn:
+            self._conn.execute('BEGIN IMMEDIATE')
+            self._evict()
+    
+    def flush(self):
+        """Bekleyen yazımları diske işler"""
+        with self._lock:
+            self._write_pending()
+    
+    def stats(self):
+        """İsabet/ıska sayaçlarını ve kayıt sayısını döndürür"""
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'errors': self.errors, 'entries': entries}
+    
+    def close(self):
+        with self._lock:
+            self._write_pending()
+            self._conn.close()
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""Parquet / Arrow IPC / Feather çıktıları (pyarrow kuruluysa)
+
+Belgeler iki tabloya ayrılır: irsaliye (belge başına bir satır, başlık bilgileri)
+ve kalem (malzeme başına bir satır). Tablolar dosya_adi + irsaliye_no ile
+birleştirilir. irsaliye_tarihi date32, adeti float64 olarak yazılır, boş alanlar
+null olur; satırlar bellekte biriktirilmeden row_group_size satırlık gruplar
+halinde diske akar.
+"""
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pa = None
+
+from irsaliye.document import iter_record_documents, to_date, to_number
+
+COLUMNAR_FORMATS = ['parquet', 'arrow', 'feather']
+
+if pa is not None:
+    IRSALIYE_SCHEMA = pa.schema([
+        ('dosya_adi', pa.string()),
+        ('irsaliye_no', pa.string()),
+        ('irsaliye_tarihi', pa.date32()),
+        ('sevk_adresi', pa.string()),
+        ('sevk_edilen_kisi', pa.string()),
+        ('sevk_edilen_tel', pa.string()),
+        ('not_bilgileri', pa.string()),
+        ('kalem_sayisi', pa.int32()),
+    ])
+    KALEM_SCHEMA = pa.schema([
+        ('dosya_adi', pa.string()),
+        ('irsaliye_no', pa.string()),
+        ('sira', pa.int32()),
+        ('malzeme_kodu', pa.string()),
+        ('malzeme_aciklama', pa.string()),
+        ('adeti', pa.float64()),
+    ])
+
+
+def columnar_available():
+    return pa is not None
+
+
+def columnar_paths(output_base, file_format):
+    """(irsaliye tablosu, kalem tablosu) dosya yollarını döndürür"""
+    return f'{output_base}.irsaliye.{file_format}', f'{output_base}.kalem.{file_format}'
+
+
+def _text(value):
+    if value is None or value == '':
+        return None
+    return value if isinstance(value, str) else str(value)
+
+
+class _TableWriter:
+    """Tek bir tabloyu sütun tamponlarından satır grupları halinde yazar"""
+    
+    def __init__(self, output_file, schema, file_format, row_group_size):
+        self.schema = schema
+        self.row_group_size = row_group_size
+        self.columns = {name: [] for name in schema.names}
+        if file_format == 'parquet':
+            self._writer = pa.parquet.ParquetWriter(output_file, schema, compression='zstd')
+        else:
+            # Feather v2 = sıkıştırılmış Arrow IPC dosyası; arrow sıkıştırmasız (mmap ile okunur)
+            options = pa.ipc.IpcWriteOptions(compression='lz4' if file_format == 'feather' else None)
+            self._writer = pa.ipc.new_file(output_file, schema, options=options)
+    
+    def append(self, *values):
+        for column, value in zip(self.columns.values(), values):
+            column.append(value)
+        if len(self.columns[self.schema.names[0]]) >= self.row_group_size:
+            self.flush()
+    
+    def flush(self):
+        if not self.columns[self.schema.names[0]]:
+            return
+        self._writer.write_batch(pa.record_batch(list(self.columns.values()), schema=self.schema))
+        for column in self.columns.values():
+            column.clear()
+    
+    def close(self):
+        self.flush()
+        self._writer.close()
+
+
+class ColumnarDocumentWriter:
+    """Belgeleri irsaliye ve kalem tablolarına Parquet / Arrow IPC / Feather olarak yazar
+    
+    irsaliye_output ve kalem_output dosya yolu veya yazılabilir ikili akış olabilir.
+    write() düz satır alır (ardışık satırlar belgeye toplanır); write_document()
+    doğrudan Irsaliye alır. count diğer yazıcılar gibi düz satır sayısıdır.
+    """
+    
+    def __init__(self, irsaliye_output, kalem_output, file_format='parquet', row_group_size=64 * 1024):
+        if pa is None:
+            raise RuntimeError("Parquet/Arrow çıktısı için pyarrow kurulmalı: pip install pyarrow")
+        if file_format not in COLUMNAR_FORMATS:
+            raise ValueError(f"Bilinmeyen biçim: {file_format}")
+        self.file_format = file_format
+        self.count = 0
+        self._irsaliye = _TableWriter(irsaliye_output, IRSALIYE_SCHEMA, file_format, row_group_size)
+        self._kalem = _TableWriter(kalem_output, KALEM_SCHEMA, file_format, row_group_size)
+        self._pending_records = []
+    
+    @classmethod
+    def for_base(cls, output_base, file_format='parquet', **kwargs):
+        """<output_base>.irsaliye.<biçim> ve <output_base>.kalem.<biçim> dosyalarına yazar"""
+        return cls(*columnar_paths(output_base, file_format), file_format=file_format, **kwargs)
+    
+    def write_document(self, document):
+        dosya_adi = document.dosya_adi
+        irsaliye_no = _text(document.irsaliye_no)
+        self._irsaliye.append(
+            dosya_adi, irsaliye_no, to_date(document.irsaliye_tarihi), _text(document.sevk_adresi),
+            _text(document.sevk_edilen_kisi), _text(document.sevk_edilen_tel), _text(document.not_bilgileri),
+            len(document.kalemler),
+        )
+        for sira, kalem in enumerate(document.kalemler, 1):
+            self._kalem.append(dosya_adi, irsaliye_no, sira, _text(kalem.malzeme_kodu), _text(kalem.malzeme_aciklama),
+                               to_number(kalem.adeti))
+        self.count += document.record_count()
+    
+    def write(self, record):
+        # Satırlar belge sınırı netleşene kadar bekletilir (en fazla bir belge)
+        if self._pending_records and (record['dosya_adi'], record['irsaliye_no']) != \
+                (self._pending_records[0]['dosya_adi'], self._pending_records[0]['irsaliye_no']):
+            self._write_pending()
+        self._pending_records.append(record)
+    
+    def _write_pending(self):
+        for document in iter_record_documents(self._pending_records):
+            self.write_document(document)
+        self._pending_records = []
+    
+    def close(self):
+        self._write_pending()
+        self._irsaliye.close()
+        self._kalem.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
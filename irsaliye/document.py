@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""Parse edilmiş irsaliye modeli ve düz satır (CSV/JSON) biçimi
+
+Başlık bilgileri belge başına bir kez tutulur; satırlar (her malzeme için başlığın
+kopyası) sadece dışa aktarımda üretilir.
+"""
+
+import datetime
+import sys
+
+FIELDNAMES = [
+    'dosya_adi', 'irsaliye_no', 'irsaliye_tarihi', 'sevk_adresi',
+    'sevk_edilen_kisi', 'sevk_edilen_tel', 'malzeme_kodu', 'malzeme_aciklama', 'adeti', 'not_bilgileri'
+]
+
+HEADER_FIELDS = ['irsaliye_no', 'irsaliye_tarihi', 'sevk_adresi', 'sevk_edilen_kisi', 'sevk_edilen_tel']
+
+# irsaliye.fields.register_field ile eklenen başlık alanları (satırlarda FIELDNAMES'ten sonra gelir)
+EXTRA_FIELDS = []
+
+DATE_FORMATS = ['%Y-%m-%d', '%d.%m.%Y', '%d-%m-%Y', '%d/%m/%Y']
+
+
+def intern_text(value):
+    """Belgeler arasında tekrar eden metinlerin (adres, kişi, malzeme) tek kopyasını tutar"""
+    if type(value) is str:
+        return sys.intern(value)
+    return value
+
+
+def to_date(value):
+    """QR tarihini date'e çevirir; tanınmayan biçimde None"""
+    if not value or not isinstance(value, str):
+        return None
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def to_number(value):
+    """Miktar metnini sayıya çevirir (Türkçe biçim: nokta binlik, virgül ondalık); boş veya geçersizse None"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value.replace('.', '').replace(',', '.'))
+    except ValueError:
+        return None
+
+
+def record_fieldnames():
+    """Dışa aktarım kolonları: FIELDNAMES ve kayıtlı ek alanlar"""
+    return FIELDNAMES + EXTRA_FIELDS
+
+
+def empty_irsaliye_record(filename):
+    """Boş bir irsaliye satırı oluşturur"""
+    record = dict.fromkeys(FIELDNAMES, '')
+    record['dosya_adi'] = filename
+    return record
+
+
+class Kalem:
+    """İrsaliyedeki bir malzeme satırı"""
+    
+    __slots__ = ('malzeme_kodu', 'malzeme_aciklama', 'adeti')
+    
+    def __init__(self, malzeme_kodu, malzeme_aciklama, adeti):
+        self.malzeme_kodu = intern_text(malzeme_kodu)
+        self.malzeme_aciklama = intern_text(malzeme_aciklama)
+        self.adeti = intern_text(adeti)
+
+
+class Irsaliye:
+    """Bir irsaliye belgesi: başlık bilgileri, not ve malzeme satırları (kalemler)"""
+    
+    __slots__ = ('dosya_adi', 'irsaliye_no', 'irsaliye_tarihi', 'sevk_adresi', 'sevk_edilen_kisi',
+                 'sevk_edilen_tel', 'not_bilgileri', 'kalemler', 'ekler')
+    
+    def __init__(self, dosya_adi, irsaliye_no='', irsaliye_tarihi='', sevk_adresi='', sevk_edilen_kisi='',
+                 sevk_edilen_tel='', not_bilgileri='', kalemler=None, ekler=None):
+        self.dosya_adi = dosya_adi
+        self.irsaliye_no = intern_text(irsaliye_no)
+        self.irsaliye_tarihi = intern_text(irsaliye_tarihi)
+        self.sevk_adresi = intern_text(sevk_adresi)
+        self.sevk_edilen_kisi = intern_text(sevk_edilen_kisi)
+        self.sevk_edilen_tel = intern_text(sevk_edilen_tel)
+        self.not_bilgileri = intern_text(not_bilgileri)
+        self.kalemler = kalemler if kalemler is not None else []
+        # Ek alanlar (register_field); kayıtlı ek alan yoksa None
+        self.ekler = {name: intern_text(value) for name, value in ekler.items()} if ekler else None
+    
+    def record_count(self):
+        """Dışa aktarımdaki satır sayısı (malzeme yoksa tek başlık satırı)"""
+        return len(self.kalemler) or 1
+    
+    def records(self):
+        """Belgeyi CSV/JSON satırlarına düzleştirir"""
+        irsaliye_data = {
+            'dosya_adi': self.dosya_adi,
+            'irsaliye_no': self.irsaliye_no,
+            'irsaliye_tarihi': self.irsaliye_tarihi,
+            'sevk_adresi': self.sevk_adresi,
+            'sevk_edilen_kisi': self.sevk_edilen_kisi,
+            'sevk_edilen_tel': self.sevk_edilen_tel,
+            'malzeme_kodu': '',
+            'malzeme_aciklama': '',
+            'adeti': '',
+            # Not bilgisi sadece bu belgenin satırlarına eklenir (malzeme yoksa başlık satırına)
+            'not_bilgileri': self.not_bilgileri,
+        }
+        if self.ekler:
+            irsaliye_data.update(self.ekler)
+        
+        records = []
+        for kalem in self.kalemler:
+            irsaliye_entry = irsaliye_data.copy()
+            irsaliye_entry['malzeme_kodu'] = kalem.malzeme_kodu
+            irsaliye_entry['malzeme_aciklama'] = kalem.malzeme_aciklama
+            irsaliye_entry['adeti'] = kalem.adeti
+            records.append(irsaliye_entry)
+        
+        # Eğer malzeme bulunamadıysa, en azından temel bilgileri kaydet
+        if not records:
+            records.append(irsaliye_data)
+        
+        return records
+
+
+def iter_document_records(documents):
+    """Belgeleri sırayla düzleştirip satırları tek tek üretir"""
+    for document in documents:
+        yield from document.records()
+
+
+def iter_record_documents(records):
+    """Düz satırları tekrar belgelere toplar (iter_document_records'un tersi)
+    
+    Bir belgenin satırları ardışıktır; dosya adı veya irsaliye no değişince yeni belge
+    başlar. Malzeme kodu boş satır, malzemesi olmayan belgenin başlık satırıdır.
+    """
+    document = None
+    for record in records:
+        if document is None or (record['dosya_adi'], record['irsaliye_no']) != (document.dosya_adi, document.irsaliye_no):
+            if document is not None:
+                yield document
+            document = Irsaliye(record['dosya_adi'], *(record[field] for field in HEADER_FIELDS),
+                                not_bilgileri=record['not_bilgileri'],
+                                ekler={name: record.get(name, '') for name in EXTRA_FIELDS})
+        if record['malzeme_kodu']:
+            document.kalemler.append(Kalem(record['malzeme_kodu'], record['malzeme_aciklama'], record['adeti']))
+    if document is not None:
+        yield document
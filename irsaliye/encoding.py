@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""Ham HTML baytlarının encoding tespiti ve tek seferde çözülmesi"""
+
+import codecs
+import re
+
+# Encoding tespiti: BOM'lar (uzun olan önce), meta charset sadece ilk birkaç KB'ta aranır
+BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+ENCODING_SNIFF_BYTES = 4096
+META_CHARSET_RE = re.compile(
+    rb'''<(?:meta[^>]*?charset|\?xml[^>]*?encoding)\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)''',
+    re.IGNORECASE,
+)
+# WHATWG eşlemesi: latin-1 ve latin-5 bildirimleri pratikte Windows kod sayfalarıdır
+CHARSET_ALIASES = {
+    'iso8859-1': 'cp1252',
+    'iso8859-9': 'cp1254',
+    'ascii': 'cp1252',
+}
+FALLBACK_ENCODING = 'cp1254'
+
+
+def detect_encoding(raw):
+    """Bayt düzeyinde kesin olarak belirlenebilen encoding'i döndürür (BOM, BOM'suz UTF-16), yoksa None"""
+    for bom, encoding in BOMS:
+        if raw.startswith(bom):
+            return encoding
+    
+    # BOM'suz UTF-16: ASCII işaretlemenin her iki baytından biri sıfırdır
+    if raw.count(b'\x00', 0, 512) > 32:
+        zeros_odd = raw[1:512:2].count(0)
+        zeros_even = raw[0:512:2].count(0)
+        if zeros_odd > zeros_even:
+            return 'utf-16-le'
+        if zeros_even > zeros_odd:
+            return 'utf-16-be'
+    return None
+
+
+def declared_encoding(raw):
+    """İlk birkaç KB içindeki meta charset / xml encoding bildirimini döndürür, yoksa None"""
+    match = META_CHARSET_RE.search(raw, 0, ENCODING_SNIFF_BYTES)
+    if not match:
+        return None
+    try:
+        encoding = codecs.lookup(match.group(1).decode('ascii')).name
+    except LookupError:
+        return None
+    # Bayt düzeyinde UTF-16 değilse UTF-16 bildirimi geçersizdir (HTML5 kuralı)
+    if encoding.startswith('utf-16'):
+        return None
+    return CHARSET_ALIASES.get(encoding, encoding)
+
+
+def decode_html_bytes(raw, with_encoding=False):
+    """Ham baytları tek seferde çözer (satır sonları \\n'e çevrilir)
+    
+    BOM veya UTF-16 deseni yoksa önce UTF-8 denenir: Türkçe karakter içeren
+    cp1254 metin pratikte geçerli UTF-8 olamaz, yanlış meta bildirimi de böylece
+    düzeltilir. UTF-8 geçersizse meta charset'e ya da cp1254'e düşülür.
+    """
+    encoding = detect_encoding(raw)
+    if encoding:
+        content = raw.decode(encoding, errors='replace')
+    else:
+        try:
+            content = raw.decode('utf-8')
+            encoding = 'utf-8'
+        except UnicodeDecodeError:
+            encoding = declared_encoding(raw)
+            if not encoding or encoding == 'utf-8':
+                encoding = FALLBACK_ENCODING
+            content = raw.decode(encoding, errors='replace')
+    
+    # open() metin modundaki satır sonu dönüşümü
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    if with_encoding:
+        return content, encoding
+    return content
+
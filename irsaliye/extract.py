@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""Çıkarma mantığının tek kopyası: CLI, web uygulaması ve worker process'leri bunu kullanır
+
+Düzenli ifadeler ve SoupStrainer modül yüklenirken bir kez derlenir; buradaki
+fonksiyonlar durum tutmaz, process havuzlarına doğrudan gönderilebilir. Ham
+metinden okunan başlık alanları irsaliye.fields kaydındadır.
+"""
+
+import json
+import time
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from irsaliye.document import EXTRA_FIELDS, Irsaliye, Kalem
+from irsaliye.encoding import decode_html_bytes
+from irsaliye.fields import extract_header_fields, parse_quantity
+from irsaliye.metrics import ParseMetrics
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Çıkarma mantığı çıktıyı değiştirdiğinde artırılır (önbellek anahtarının parçası)
+PARSER_VERSION = '2.4'
+
+
+def _is_irsaliye_element(name, attrs):
+    """Soup'a sadece qrvalue div'i ve tabloların alınmasını sağlar"""
+    return name == 'table' or (name == 'div' and attrs.get('id') == 'qrvalue')
+
+
+# Stil, script, span vb. hiç oluşturulmaz; sadece veri içeren öğeler ağaca girer
+IRSALIYE_STRAINER = SoupStrainer(_is_irsaliye_element)
+
+
+def _cell_text(element):
+    """HTML elementinden temiz metin çıkarır"""
+    if element is None:
+        return ""
+    return element.get_text(strip=True)
+
+
+def _first_tag(element, name):
+    """Elementin altındaki ilk verilen isimli etiketi döndürür (find() kısayolu)"""
+    for descendant in element.descendants:
+        if descendant.name == name:
+            return descendant
+    return None
+
+
+def extract_document(content, filename='', metrics=None):
+    """Çözülmüş HTML metninden başlık bilgilerini, malzeme satırlarını ve notu tek geçişte çıkarır
+    
+    metrics (ParseMetrics) verilirse soup, tablo taraması ve başlık aşamalarının süreleri kaydedilir.
+    """
+    baslik = {}
+    kalemler = []
+    not_bilgileri = ''
+    
+    if metrics is not None:
+        started = time.perf_counter()
+    soup = BeautifulSoup(content, HTML_PARSER, parse_only=IRSALIYE_STRAINER)
+    if metrics is not None:
+        soup_built = time.perf_counter()
+        metrics.observe('soup', soup_built - started)
+    
+    qr_div = None
+    customer_table = None
+    
+    # Ağaç üzerinde tek yürüyüş: tüm ilgili öğeler belge sırasıyla gelir
+    for element in soup.descendants:
+        if element.name == 'div':
+            if qr_div is None and element.get('id') == 'qrvalue':
+                qr_div = element
+            continue
+        if element.name != 'table':
+            continue
+        
+        table = element
+        if customer_table is None and table.get('id') == 'customerPartyTable':
+            customer_table = table
+        
+        # Tablonun th/td/tr öğelerini tek yürüyüşte topla
+        th_cells, td_cells, rows = [], [], []
+        for descendant in table.descendants:
+            name = descendant.name
+            if name == 'td':
+                td_cells.append(descendant)
+            elif name == 'tr':
+                rows.append(descendant)
+            elif name == 'th':
+                th_cells.append(descendant)
+        
+        # Malzeme tablosunu tanımla (Malzeme Kodu başlığı olan tablo)
+        headers = th_cells or td_cells
+        if any('Malzeme Kodu' in _cell_text(header) for header in headers):
+            for row in rows[1:]:  # İlk satır başlık
+                cells = row.find_all('td')
+                if len(cells) >= 3:
+                    malzeme_kodu = _cell_text(cells[1])  # 2. sütun
+                    if not malzeme_kodu:  # Boş satırları atla
+                        continue
+                    malzeme_aciklama = _cell_text(cells[2])  # 3. sütun
+                    miktar_cell = _cell_text(cells[3]) if len(cells) > 3 else ""  # 4. sütun
+                    
+                    # Miktarı temizle (Türkçe sayı: "1.250,5 ADET" -> "1250,5")
+                    kalemler.append(Kalem(malzeme_kodu, malzeme_aciklama, parse_quantity(miktar_cell)))
+        
+        # Açıklamalar tablosunu bul
+        if any('Açıklamalar' in _cell_text(th) for th in th_cells):
+            for row in rows[1:]:  # İlk satır başlık
+                cells = row.find_all('td')
+                if len(cells) >= 2:
+                    not_label = _cell_text(cells[0])
+                    not_content = _cell_text(cells[1])
+                    if 'Not:' in not_label and not_content:
+                        not_bilgileri = not_content
+    
+    if metrics is not None:
+        tables_scanned = time.perf_counter()
+        metrics.observe('tables', tables_scanned - soup_built)
+    
+    # QR code div içindeki JSON veriyi bul
+    if qr_div is not None:
+        json_text = qr_div.get_text(strip=True)
+        if json_text:
+            try:
+                qr_data = json.loads(json_text)
+                
+                # JSON'dan temel bilgileri al
+                baslik['irsaliye_no'] = qr_data.get('no', '')
+                baslik['irsaliye_tarihi'] = qr_data.get('tarih', '')
+            except json.JSONDecodeError as e:
+                print(f"JSON parse hatası: {e}")
+    
+    # Sevk edilen kişi bilgisini bul (customerPartyTable'dan)
+    if customer_table is not None:
+        # "SAYIN" sonrası kısmı bul
+        sayin_found = False
+        for row in customer_table.find_all('tr'):
+            cell_text = _cell_text(_first_tag(row, 'td'))
+            if 'SAYIN' in cell_text:
+                sayin_found = True
+                continue
+            
+            # SAYIN'dan sonraki satırda isim var
+            if sayin_found and cell_text and len(cell_text) > 2:  # Çok kısa metinleri atla
+                baslik['sevk_edilen_kisi'] = cell_text
+                break
+    
+    # Sevk adresi, telefon ve kayıtlı ek alanlar (span soup'a alınmaz, ham içerikte sınırlı bölgede aranır)
+    alanlar = extract_header_fields(content)
+    ekler = {name: alanlar.pop(name, '') for name in EXTRA_FIELDS} if EXTRA_FIELDS else None
+    baslik.update(alanlar)
+    
+    if metrics is not None:
+        metrics.observe('header', time.perf_counter() - tables_scanned)
+    
+    return Irsaliye(filename, not_bilgileri=not_bilgileri, kalemler=kalemler, ekler=ekler, **baslik)
+
+
+def _decode_and_extract(raw, filename, metrics):
+    if metrics is None:
+        return extract_document(decode_html_bytes(raw), filename)
+    
+    started = time.perf_counter()
+    content, encoding = decode_html_bytes(raw, with_encoding=True)
+    metrics.observe('decode', time.perf_counter() - started)
+    metrics.count_encoding(encoding)
+    return extract_document(content, filename, metrics)
+
+
+def parse(raw, filename='', cache=None, metrics=None):
+    """Ham HTML baytlarını çözüp Irsaliye döndürür; cache verilirse önce önbelleğe bakılır
+    
+    Önbellekte varsa soup oluşturulmaz. Hatalar çağırana bırakılır (metrics'te
+    errors sayacını çağıran artırır).
+    """
+    if metrics is not None:
+        metrics.count('files')
+        metrics.count('bytes', len(raw))
+    
+    if cache is None:
+        document = _decode_and_extract(raw, filename, metrics)
+    else:
+        cache_key = cache.key_for(raw)
+        document = cache.get(cache_key, filename)
+        if document is None:
+            document = _decode_and_extract(raw, filename, metrics)
+            cache.put(cache_key, document)
+        elif metrics is not None:
+            metrics.count('cache_hits')
+    
+    if metrics is not None:
+        metrics.count('documents')
+        metrics.count('rows', document.record_count())
+    return document
+
+
+def parse_with_metrics(raw, filename=''):
+    """Process havuzları için: (Irsaliye, ölçüm snapshot'ı) döndürür; hata olursa snapshot kaybolur"""
+    metrics = ParseMetrics()
+    document = parse(raw, filename, metrics=metrics)
+    return document, metrics.snapshot()
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""Ham metinden okunan başlık alanlarının kaydı ve Türkçe miktar ayrıştırma
+
+Sevk adresi ve telefon gibi alanlar soup'a alınmayan öğelerde durur ve ham
+metinde aranır. Her alan bir FieldExtractor'dır: düzenli ifadesi modül
+yüklenirken derlenir ve sadece sınırlı bir bölgede çalışır; anchor metni (ör.
+'Sevk Adresi:') str.find ile bulunur, ifade ondan sonraki window karakterde
+aranır. Yeni alanlar (vergi no, plaka, şoför) register_field ile eklenir;
+çıkarma döngüsü değişmez:
+    
+    register_field('plaka', r'Plaka:\\s*([0-9]{2} ?[A-Z]{1,3} ?[0-9]{2,4})', anchor='Plaka:')
+
+Eklenen alanlar satırlarda not_bilgileri'nden sonra yeni kolon olarak çıkar.
+Kayıt modül seviyesinde yapılmalıdır: spawn/forkserver ile başlayan worker'lar
+ana process'in kayıtlarını miras almaz, kaydı yapan modül import_field_modules
+ile (havuz initializer'ı, servisin --import seçeneği) worker'da da yüklenir.
+"""
+
+import hashlib
+import html
+import importlib
+import re
+
+from bs4 import BeautifulSoup
+
+from irsaliye.document import EXTRA_FIELDS, FIELDNAMES
+
+# Anchor'dan sonra aranan varsayılan bölge uzunluğu (karakter)
+DEFAULT_WINDOW = 4096
+
+TEL_RE = re.compile(r'Tel:(\d+)')
+TEL_STRIP_RE = re.compile(r'\s*Tel:\d+')
+# Basit etiketler (<br/>, <b>, </span>); yorum veya bozuk '<' varsa BeautifulSoup'a düşülür
+SIMPLE_TAG_RE = re.compile(r'<(?:/?[A-Za-z][^<>]*)>')
+
+# Türkçe miktar: nokta binlik, virgül ondalık ("1.250,5 ADET"); binlik grubu yoksa nokta da ondalık sayılır ("12.5")
+MIKTAR_RE = re.compile(r'(?P<binlik>\d{1,3}(?:\.\d{3})+)(?![\d.])(?:,(?P<ondalik>\d+))?'
+                       r'|(?P<tam>\d+)(?:[.,](?P<kesir>\d+))?')
+
+
+def parse_quantity(text):
+    """Miktar hücresindeki ilk sayıyı binlik ayırıcısız, virgül ondalıklı metne çevirir; sayı yoksa ''
+    
+    '1.250 ADET' -> '1250', '1.250,50 KG' -> '1250,5', '12,00' -> '12'. Sonuç to_number ile sayıya çevrilir.
+    """
+    match = MIKTAR_RE.search(text)
+    if match is None:
+        return ''
+    binlik, ondalik, whole, fraction = match.groups()
+    if binlik is not None:
+        whole, fraction = binlik.replace('.', ''), ondalik
+    if fraction:
+        fraction = fraction.rstrip('0')
+        if fraction:
+            return f'{whole},{fraction}'
+    return whole
+
+
+def fragment_text(fragment):
+    """Küçük HTML parçasının metni: BeautifulSoup(...).get_text(strip=True) ile aynı sonuç"""
+    tags = SIMPLE_TAG_RE.findall(fragment)
+    if len(tags) != fragment.count('<'):
+        return BeautifulSoup(fragment, 'html.parser').get_text(strip=True)
+    # Her metin parçası ayrı kırpılıp birleştirilir (get_text(strip=True) gibi)
+    return ''.join(html.unescape(part).strip() for part in SIMPLE_TAG_RE.split(fragment))
+
+
+class FieldExtractor:
+    """Bir veya birkaç başlık alanını ham metinden okuyan derlenmiş eşleştirici
+    
+    pattern ilk grubu (grup yoksa tüm eşleşme) alanın ham değeridir. anchor verilirse
+    arama sadece anchor'ın geçtiği yerlerden sonraki window karakterde yapılır, verilmezse
+    tüm metinde. convert ham değeri alan değerine çevirir; birden çok alan üreten
+    çıkarıcıda (sevk adresi + telefon) {alan: değer} döndürür.
+    """
+    
+    __slots__ = ('name', 'pattern', 'anchor', 'window', 'convert')
+    
+    def __init__(self, name, pattern, anchor=None, window=DEFAULT_WINDOW, convert=None):
+        self.name = name
+        self.pattern = re.compile(pattern) if isinstance(pattern, str) else pattern
+        self.anchor = anchor
+        self.window = window
+        self.convert = convert
+    
+    def search(self, content):
+        """İlk eşleşmeyi döndürür (yoksa None)"""
+        if self.anchor is None:
+            return self.pattern.search(content)
+        start = content.find(self.anchor)
+        while start >= 0:
+            match = self.pattern.search(content, start, start + self.window)
+            if match is not None:
+                return match
+            start = content.find(self.anchor, start + 1)
+        return None
+    
+    def extract(self, content):
+        """{alan: değer} döndürür; eşleşme yoksa boş dict"""
+        match = self.search(content)
+        if match is None:
+            return {}
+        value = match.group(1) if self.pattern.groups else match.group(0)
+        if self.convert is not None:
+            value = self.convert(value)
+        return value if isinstance(value, dict) else {self.name: value}
+
+
+def _sevk_adresi(value):
+    """Sevk adresi parçasından etiketleri temizler, telefonu ayrı alana alır"""
+    adres = fragment_text(value.strip())
+    tel_match = TEL_RE.search(adres)
+    if tel_match:
+        return {'sevk_adresi': TEL_STRIP_RE.sub('', adres).strip(), 'sevk_edilen_tel': tel_match.group(1)}
+    return {'sevk_adresi': adres}
+
+
+# Sırayla çalışan çıkarıcılar; irsaliye_no/tarih (QR) ve sevk_edilen_kisi (tablo) soup'tan okunur
+HEADER_EXTRACTORS = [
+    FieldExtractor('sevk_adresi', r'Sevk Adresi:(.*?)</span>', anchor='Sevk Adresi:', convert=_sevk_adresi),
+]
+
+
+def register_field(name, pattern, anchor=None, window=DEFAULT_WINDOW, convert=str.strip):
+    """Yeni bir başlık alanı ekler; değer bulunamayan belgelerde alan boş kalır
+    
+    Alan adı mevcut kolonlarla çakışamaz. Önbellek anahtarı kayıtlı alanlara göre
+    değiştiğinden eski önbellek kayıtları bu alanlar olmadan dönmez.
+    """
+    if name in FIELDNAMES or name in EXTRA_FIELDS:
+        raise ValueError(f"Alan zaten tanımlı: {name}")
+    extractor = FieldExtractor(name, pattern, anchor=anchor, window=window, convert=convert)
+    HEADER_EXTRACTORS.append(extractor)
+    EXTRA_FIELDS.append(name)
+    return extractor
+
+
+def unregister_field(name):
+    """register_field ile eklenen alanı kaldırır"""
+    if name not in EXTRA_FIELDS:
+        raise ValueError(f"Kayıtlı ek alan yok: {name}")
+    HEADER_EXTRACTORS[:] = [extractor for extractor in HEADER_EXTRACTORS if extractor.name != name]
+    EXTRA_FIELDS.remove(name)
+
+
+def extract_header_fields(content):
+    """Kayıtlı tüm çıkarıcıları çalıştırıp {alan: değer} döndürür"""
+    values = {}
+    for extractor in HEADER_EXTRACTORS:
+        values.update(extractor.extract(content))
+    return values
+
+
+def fields_signature():
+    """Kayıtlı ek alanların önbellek anahtarına giren özeti (ek alan yoksa '')"""
+    if not EXTRA_FIELDS:
+        return ''
+    description = repr([(extractor.name, extractor.pattern.pattern, extractor.anchor, extractor.window)
+                        for extractor in HEADER_EXTRACTORS if extractor.name in EXTRA_FIELDS])
+    return hashlib.sha256(description.encode('utf-8')).hexdigest()[:12]
+
+
+def import_field_modules(modules, expected_signature=None):
+    """register_field kaydı yapan modülleri yükler; process havuzu worker'larının initializer'ı
+    
+    expected_signature (ana process'in fields_signature() değeri) verilirse worker'ın
+    kayıtları farklıysa RuntimeError verilir: eksik alanlarla parse edilen belgeler
+    ana process'in anahtarıyla önbelleğe yazılırdı.
+    """
+    for module in modules:
+        importlib.import_module(module)
+    if expected_signature is not None and fields_signature() != expected_signature:
+        raise RuntimeError(f"Worker'daki ek alanlar ({', '.join(EXTRA_FIELDS) or 'yok'}) ana process'tekinden "
+                           f"farklı; register_field kaydı yapan modüller worker'da da yüklenmeli")
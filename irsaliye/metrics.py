@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""Aşama süreleri ve sayaçlar (isteğe bağlı ölçüm kancaları)
+
+parse() / extract_document() bir ParseMetrics alırsa çözme, soup oluşturma,
+tablo taraması ve başlık çıkarma sürelerini ve dosya/satır/encoding sayaçlarını
+kaydeder; metrics verilmezse hiçbir ölçüm yapılmaz. Worker process'lerindeki
+ölçümler snapshot() ile taşınıp merge() ile birleştirilir.
+"""
+
+import threading
+from collections import Counter
+
+# Ölçülen aşamalar (sıralı): çözme, soup oluşturma, tablo taraması, başlık alanları, dışa aktarım
+STAGES = ['decode', 'soup', 'tables', 'header', 'export']
+
+# Histogram üst sınırları (saniye)
+BUCKETS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5]
+
+COUNTER_HELP = {
+    'files': "Parse edilmeye çalışılan dosya sayısı",
+    'documents': "Parse edilen belge sayısı",
+    'rows': "Üretilen satır sayısı",
+    'errors': "Parse edilemeyen dosya sayısı",
+    'cache_hits': "Önbellekten dönen belge sayısı",
+    'bytes': "Okunan ham HTML bayt sayısı",
+}
+
+
+class ParseMetrics:
+    """Aşama süresi histogramları, sayaçlar ve encoding dağılımı (thread-safe)"""
+    
+    def __init__(self):
+        self.counters = Counter()
+        self.encodings = Counter()
+        self.labeled = Counter()
+        self.stage_buckets = {stage: [0] * (len(BUCKETS) + 1) for stage in STAGES}
+        self.stage_sum = dict.fromkeys(STAGES, 0.0)
+        self.stage_max = dict.fromkeys(STAGES, 0.0)
+        self._lock = threading.Lock()
+    
+    def observe(self, stage, seconds):
+        """Bir aşamanın süresini kaydeder"""
+        index = next((i for i, bound in enumerate(BUCKETS) if seconds <= bound), len(BUCKETS))
+        with self._lock:
+            self.stage_buckets[stage][index] += 1
+            self.stage_sum[stage] += seconds
+            if seconds > self.stage_max[stage]:
+                self.stage_max[stage] = seconds
+    
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+    
+    def count_encoding(self, encoding):
+        with self._lock:
+            self.encodings[encoding] += 1
+    
+    def count_labeled(self, name, label, value):
+        """Etiketli sayaç (ör. iş durumu, atlama sebebi): /metrics'te name_total{label="value"} olarak çıkar"""
+        with self._lock:
+            self.labeled[(name, label, value)] += 1
+    
+    def snapshot(self):
+        """Process'ler arasında taşınabilir (pickle edilebilir) kopya"""
+        with self._lock:
+            return {
+                'counters': dict(self.counters),
+                'encodings': dict(self.encodings),
+                'labeled': dict(self.labeled),
+                'stage_buckets': {stage: list(buckets) for stage, buckets in self.stage_buckets.items()},
+                'stage_sum': dict(self.stage_sum),
+                'stage_max': dict(self.stage_max),
+            }
+    
+    def merge(self, snapshot):
+        """Başka bir process'in snapshot()'ını bu ölçümlere ekler"""
+        with self._lock:
+            self.counters.update(snapshot['counters'])
+            self.encodings.update(snapshot['encodings'])
+            self.labeled.update(snapshot['labeled'])
+            for stage, buckets in snapshot['stage_buckets'].items():
+                self.stage_buckets[stage] = [a + b for a, b in zip(self.stage_buckets[stage], buckets)]
+                self.stage_sum[stage] += snapshot['stage_sum'][stage]
+                self.stage_max[stage] = max(self.stage_max[stage], snapshot['stage_max'][stage])
+    
+    def summary(self):
+        """Makine tarafından okunacak özet: sayaçlar, encoding'ler ve aşama başına süreler"""
+        with self._lock:
+            stages = {}
+            for stage in STAGES:
+                count = sum(self.stage_buckets[stage])
+                if not count:
+                    continue
+                stages[stage] = {
+                    'count': count,
+                    'total_s': round(self.stage_sum[stage], 4),
+                    'mean_ms': round(self.stage_sum[stage] / count * 1000, 3),
+                    'max_ms': round(self.stage_max[stage] * 1000, 3),
+                }
+            summary = {
+                'counters': {name: self.counters.get(name, 0) for name in COUNTER_HELP},
+                'encodings': dict(self.encodings.most_common()),
+                'stages': stages,
+            }
+            # Etiketli sayaçlar: ör. {'skipped': {'tekrar': 3}}
+            for (name, _, value), count in sorted(self.labeled.items()):
+                summary.setdefault(name, {})[value] = count
+            return summary
+    
+    def prometheus(self, prefix='irsaliye'):
+        """Prometheus metin biçiminde (text/plain; version=0.0.4) çıktı"""
+        lines = []
+        with self._lock:
+            for name, help_text in COUNTER_HELP.items():
+                lines.append(f'# HELP {prefix}_{name}_total {help_text}')
+                lines.append(f'# TYPE {prefix}_{name}_total counter')
+                lines.append(f'{prefix}_{name}_total {self.counters.get(name, 0)}')
+            
+            lines.append(f'# HELP {prefix}_encoding_total Belgelerin çözüldüğü encoding')
+            lines.append(f'# TYPE {prefix}_encoding_total counter')
+            for encoding, count in sorted(self.encodings.items()):
+                lines.append(f'{prefix}_encoding_total{{encoding="{encoding}"}} {count}')
+            
+            for name in sorted({name for name, _, _ in self.labeled}):
+                lines.append(f'# TYPE {prefix}_{name}_total counter')
+                for (labeled_name, label, value), count in sorted(self.labeled.items()):
+                    if labeled_name == name:
+                        lines.append(f'{prefix}_{name}_total{{{label}="{value}"}} {count}')
+            
+            lines.append(f'# HELP {prefix}_stage_seconds Çıkarma aşaması başına süre')
+            lines.append(f'# TYPE {prefix}_stage_seconds histogram')
+            for stage in STAGES:
+                cumulative = 0
+                for bound, count in zip(BUCKETS + ['+Inf'], self.stage_buckets[stage]):
+                    cumulative += count
+                    lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {self.stage_sum[stage]:.6f}')
+                lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {cumulative}')
+        return '\n'.join(lines) + '\n'
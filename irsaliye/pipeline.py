@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""Okuma, parse ve yazmayı örtüştüren boru hattı aşamaları
+
+Ağ paylaşımındaki klasörlerde CPU dosya okumasını beklerken boşta kalmasın
+diye dosyalar thread havuzunda önceden okunur (prefetch); yazıcılar da ayrı
+bir thread'de beslenir. Dosya okuma/yazma GIL'i bıraktığından parse ile aynı
+anda ilerler ve süre okuma + parse yerine ikisinden büyüğüne yaklaşır.
+
+İki aşama da sınırlı kuyrukla çalışır: tüketici yavaşsa üretici bekler
+(backpressure), bellekteki dosya sayısı klasör boyutuyla büyümez.
+"""
+
+import itertools
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+_END = object()
+
+
+def prefetch(items, read, readers=4, depth=32):
+    """read(item) sonuçlarını readers thread'inde önceden hesaplayıp (item, sonuç) çiftlerini girdi sırasıyla üretir
+    
+    Aynı anda en fazla depth okuma beklemede veya bellekte tutulur.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, readers), thread_name_prefix='irsaliye-okuma') as executor:
+        pending = deque()
+        item_iter = iter(items)
+        for item in itertools.islice(item_iter, max(1, depth)):
+            pending.append((item, executor.submit(read, item)))
+        
+        try:
+            while pending:
+                item, future = pending.popleft()
+                next_item = next(item_iter, _END)
+                if next_item is not _END:
+                    pending.append((next_item, executor.submit(read, next_item)))
+                yield item, future.result()
+        finally:
+            # Tüketici erken bıraktıysa başlamamış okumalar iptal edilir
+            for _, future in pending:
+                future.cancel()
+
+
+class WriterThread:
+    """Öğeleri arka plandaki tek bir thread'de write() fonksiyonuna aktarır
+    
+    Kuyruk doluysa put() bekler. write() içinde oluşan hata sonraki put() veya
+    close() çağrısında yeniden fırlatılır; hatadan sonraki öğeler yazılmaz.
+    """
+    
+    def __init__(self, write, depth=32):
+        self._write = write
+        self._queue = queue.Queue(maxsize=max(1, depth))
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name='irsaliye-yazma', daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _END:
+                return
+            if self._error is None:
+                try:
+                    self._write(item)
+                except BaseException as e:
+                    self._error = e
+    
+    def put(self, item):
+        if self._error is not None:
+            raise self._error
+        self._queue.put(item)
+    
+    def close(self):
+        """Kuyruktaki öğeler yazılana kadar bekler"""
+        if self._thread.is_alive():
+            self._queue.put(_END)
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # Asıl hata gizlenmesin: yazıcı hatası varsa yutulur
+            try:
+                self.close()
+            except BaseException:
+                pass
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""Soup oluşturmadan, ham baytlar üzerinde çalışan ucuz ön filtre
+
+Yükleme klasörlerinde ve ZIP'lerde irsaliye olmayan sayfalar (index, XSLT
+önizlemesi) ve aynı irsaliyenin kopyaları bulunur. BatchFilter her dosyaya
+tam parse'tan önce bakar:
+
+- qrvalue div'i de Malzeme Kodu başlığı da yoksa dosya irsaliye değildir
+  (parse edilse de irsaliye_no ve kalem çıkmaz).
+- QR JSON'daki no + tarih bu toplu işte daha önce görüldüyse dosya tekrardır.
+
+İşaretler ASCII olduğundan ASCII uyumlu encoding'lerde ham baytlar aranır.
+UTF-16/32 dosyalar çözülmez: işaretler o encoding'le kodlanıp aranır, QR div'i
+için sadece qrvalue çevresindeki birkaç KB çözülür.
+"""
+
+import codecs
+import html
+import json
+import re
+from collections import Counter
+
+from irsaliye.encoding import detect_encoding
+
+SKIP_NOT_IRSALIYE = 'irsaliye-degil'
+SKIP_DUPLICATE = 'tekrar'
+SKIP_REASONS = [SKIP_NOT_IRSALIYE, SKIP_DUPLICATE]
+
+IRSALIYE_MARKERS = [b'qrvalue', b'Malzeme Kodu']
+QR_DIV_RE = re.compile(rb'''<div\b[^>]*?\bid\s*=\s*(["']?)qrvalue\1(?=[\s/>])[^>]*>(.*?)</div''',
+                       re.DOTALL | re.IGNORECASE)
+# UTF-16/32 dosyada qrvalue'nun önünden ve arkasından çözülen bölge (karakter)
+QR_WINDOW_BEFORE = 256
+QR_WINDOW_AFTER = 4096
+
+
+def _wide_encoding(raw):
+    """UTF-16/32 dosyada (bayt sıralı encoding, BOM uzunluğu, karakter birimi), diğerlerinde None"""
+    encoding = detect_encoding(raw)
+    if encoding == 'utf-32':
+        return ('utf-32-le' if raw.startswith(codecs.BOM_UTF32_LE) else 'utf-32-be'), 4, 4
+    if encoding == 'utf-16':
+        return ('utf-16-le' if raw.startswith(codecs.BOM_UTF16_LE) else 'utf-16-be'), 2, 2
+    if encoding in ('utf-16-le', 'utf-16-be'):
+        return encoding, 0, 2
+    return None
+
+
+def _find_marker(raw, marker, wide, start=0):
+    """ASCII işaretin ilk konumu; UTF-16/32'de işaret o encoding'le kodlanıp karakter sınırında aranır"""
+    if wide is None:
+        return raw.find(marker, start)
+    encoding, offset, unit = wide
+    encoded = marker.decode('ascii').encode(encoding)
+    position = raw.find(encoded, start)
+    while position >= 0 and (position - offset) % unit:
+        position = raw.find(encoded, position + 1)
+    return position
+
+
+def _contains_marker(raw, wide):
+    return any(_find_marker(raw, marker, wide) >= 0 for marker in IRSALIYE_MARKERS)
+
+
+def _search_qr_div(raw, wide):
+    """QR_DIV_RE eşleşmesi; UTF-16/32'de dosyanın tamamı yerine sadece qrvalue çevresi çözülür
+    
+    Dosyanın tamamı parse sırasında zaten bir kez çözülür; ön filtre ikinci kez çözmez.
+    """
+    if wide is None:
+        return QR_DIV_RE.search(raw)
+    encoding, offset, unit = wide
+    position = _find_marker(raw, b'qrvalue', wide)
+    while position >= 0:
+        start = max(offset, position - QR_WINDOW_BEFORE * unit)
+        window = raw[start:position + QR_WINDOW_AFTER * unit].decode(encoding, errors='replace')
+        match = QR_DIV_RE.search(window.encode('utf-8'))
+        if match:
+            return match
+        position = _find_marker(raw, b'qrvalue', wide, position + unit)
+    return None
+
+
+def is_irsaliye(raw):
+    """Dosyada qrvalue div'i veya Malzeme Kodu başlığı geçiyor mu"""
+    return _contains_marker(raw, _wide_encoding(raw))
+
+
+def _qr_key(match):
+    if not match:
+        return None
+    text = html.unescape(match.group(2).decode('utf-8', errors='replace')).strip()
+    try:
+        qr_data = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(qr_data, dict) or not qr_data.get('no'):
+        return None
+    return str(qr_data['no']), str(qr_data.get('tarih', ''))
+
+
+def qr_key(raw):
+    """QR JSON'daki (no, tarih) ikilisi; div yoksa, JSON bozuksa veya no boşsa None
+    
+    Parser'ın okuduğu gibi ilk qrvalue div'i, HTML varlıkları çözülerek okunur.
+    """
+    return _qr_key(_search_qr_div(raw, _wide_encoding(raw)))
+
+
+class BatchFilter:
+    """Bir toplu işin (klasör, yükleme) dosyalarını parse öncesi eler
+    
+    check() atlanacak dosya için sebebi (SKIP_REASONS), parse edilecek dosya
+    için None döndürür; atlama sayıları skipped'da tutulur. Dosya adı da verilirse
+    parse edilecek dosyanın (no, tarih) anahtarı keys'e, tekrar diye atlanan
+    dosyanın ilk görülen kopyası duplicate_of'a yazılır. Önceki toplu işlerde
+    parse edilen dosyalar seed() ile görülmüş sayılır.
+    """
+    
+    def __init__(self, skip_duplicates=True):
+        self.skip_duplicates = skip_duplicates
+        self.skipped = Counter()
+        self.duplicate_of = {}
+        self.keys = {}
+        self._seen = {}
+    
+    def seed(self, key, name):
+        """Önceki toplu işte parse edilen dosyanın (no, tarih) anahtarını görülmüş sayar"""
+        self._seen.setdefault(tuple(key), name)
+    
+    def check(self, raw, name=None):
+        reason = None
+        wide = _wide_encoding(raw)
+        if not _contains_marker(raw, wide):
+            reason = SKIP_NOT_IRSALIYE
+        elif self.skip_duplicates:
+            key = _qr_key(_search_qr_div(raw, wide))
+            if key is not None:
+                if key in self._seen:
+                    reason = SKIP_DUPLICATE
+                    if name is not None:
+                        self.duplicate_of[name] = self._seen[key]
+                else:
+                    self._seen[key] = name
+                    if name is not None:
+                        self.keys[name] = key
+        if reason:
+            self.skipped[reason] += 1
+        return reason
+    
+    def summary(self):
+        """Ör. '3 dosya atlandı (irsaliye-degil: 2, tekrar: 1)'; atlanan yoksa boş metin"""
+        if not self.skipped:
+            return ''
+        details = ', '.join(f'{reason}: {self.skipped[reason]}' for reason in SKIP_REASONS if self.skipped[reason])
+        return f"{sum(self.skipped.values())} dosya atlandı ({details})"
@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""Uzun ömürlü parse servisi: önceden başlatılmış, ısınmış worker havuzu ve Unix soketi
+
+Web uygulamasının her process'i (gunicorn worker'ı) kendi parse havuzunu açarsa
+worker sayısı process sayısıyla çarpılır ve her havuz soğuk başlar. Servis tek
+bir havuzu tüm ön yüz process'lerine paylaştırır:
+    
+    python -m irsaliye.service --socket /tmp/irsaliye.sock --workers 4
+    IRSALIYE_SERVICE_SOCKET=/tmp/irsaliye.sock gunicorn -w 4 app:app
+
+Worker'lar forkserver'dan çatallanır; irsaliye.extract (bs4, derlenmiş düzenli
+ifadeler) forkserver'a önceden yüklenir ve her worker başlarken örnek bir belgeyi
+parse eder. register_field ile ek alan kaydeden modüller --import ile verilir.
+
+Aynı anda en fazla max_pending istek kabul edilir; yer açılmasını queue_timeout
+saniyeden fazla bekleyen istek 'busy', request_timeout içinde bitmeyen istek 'timeout'
+yanıtı alır. Zaman aşımında worker'daki iş durdurulmaz, sonucu atılır; isteğin
+yeri iş bitene kadar dolu kalır, böylece worker'larda hiçbir zaman max_pending'den
+fazla iş olmaz. İstemci 'busy' yanıtında artan aralıklarla tekrar dener. Soket
+sadece servisi çalıştıran kullanıcıya açıktır; mesajlar pickle ile taşınır.
+"""
+
+import argparse
+import importlib
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Client, Listener
+
+from irsaliye.extract import parse_with_metrics
+from irsaliye.fields import import_field_modules
+
+DEFAULT_SOCKET = '/tmp/irsaliye_parser.sock'
+REQUEST_TIMEOUT = 60.0  # saniye, tek belgenin parse süresi
+QUEUE_TIMEOUT = 10.0  # saniye, servis doluyken yer bekleme süresi
+LISTEN_BACKLOG = 128
+# İstemci 'busy' yanıtında bu kadar kez, her seferinde iki katı bekleyerek tekrar dener
+BUSY_RETRIES = 3
+BUSY_BACKOFF = 0.5  # saniye, ilk tekrar öncesi
+
+# Worker'ı ısıtmak için parse edilen örnek belge (QR, sevk adresi ve malzeme tablosu)
+WARM_HTML = (
+    '<html><body><div id="qrvalue">{"no":"ISN2025000000001","tarih":"2025-01-01"}</div>'
+    '<span>Sevk Adresi: Örnek Mah. 1 Tel:5550000000</span>'
+    '<table><tr><th>Sıra</th><th>Malzeme Kodu</th><th>Malzeme Açıklaması</th><th>Miktar</th></tr>'
+    '<tr><td>1</td><td>MLZ-1</td><td>Örnek malzeme</td><td>1.250 ADET</td></tr></table></body></html>'
+).encode('utf-8')
+
+
+class ServiceBusyError(RuntimeError):
+    """Servis tekrar denemelerden sonra da dolu ('busy')"""
+
+
+def _warm_worker(modules):
+    """Worker başlarken ek alan modüllerini yükler ve örnek belgeyi bir kez parse eder"""
+    import_field_modules(modules)
+    parse_with_metrics(WARM_HTML, 'isinma.html')
+
+
+class ParseService:
+    """Unix soketinden gelen parse isteklerini önceden başlatılmış worker havuzunda çalıştırır
+    
+    İstek: ('parse', dosya adı, ham baytlar) veya ('stats',). Yanıt: (durum, veri);
+    durum 'ok' ise veri (Irsaliye, ölçüm snapshot'ı), değilse hata mesajıdır.
+    """
+    
+    def __init__(self, path=DEFAULT_SOCKET, workers=None, max_pending=None, request_timeout=REQUEST_TIMEOUT,
+                 queue_timeout=QUEUE_TIMEOUT, preload=(), max_tasks_per_child=None):
+        self.path = path
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 4
+        self.request_timeout = request_timeout
+        self.queue_timeout = queue_timeout
+        self.preload = list(preload)
+        self.max_tasks_per_child = max_tasks_per_child
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._counts = Counter()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._pool = None
+        self._listener = None
+    
+    def start(self):
+        """Worker'ları başlatır (hepsi ısınana kadar bekler) ve soketi açar"""
+        for module in self.preload:
+            importlib.import_module(module)
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(['irsaliye.extract'] + self.preload)
+        self._pool = context.Pool(self.workers, initializer=_warm_worker, initargs=(self.preload,),
+                                  maxtasksperchild=self.max_tasks_per_child)
+        # Pool worker'ları hemen başlatır; ilk istek ısınmayı beklemesin
+        self._pool.map(len, [b''] * self.workers)
+        
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        old_umask = os.umask(0o177)
+        try:
+            self._listener = Listener(self.path, family='AF_UNIX', backlog=LISTEN_BACKLOG)
+        finally:
+            os.umask(old_umask)
+        return self
+    
+    def serve_forever(self):
+        """Bağlantıları kabul eder; her bağlantı kendi thread'inde sırayla istek işler"""
+        while True:
+            try:
+                connection = self._listener.accept()
+            except OSError:
+                if self._listener is None:  # close() çağrıldı
+                    return
+                raise
+            threading.Thread(target=self._serve_connection, args=(connection,), daemon=True).start()
+    
+    def close(self):
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.close()
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def stats(self):
+        """İstek sayaçları ve o anda işlenen istek sayısı"""
+        with self._lock:
+            return {'workers': self.workers, 'max_pending': self.max_pending, 'in_flight': self._in_flight,
+                    **self._counts}
+    
+    def _count(self, name):
+        with self._lock:
+            self._counts[name] += 1
+    
+    def _serve_connection(self, connection):
+        with connection:
+            while True:
+                try:
+                    message = connection.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    connection.send(self._dispatch(message))
+                except OSError:
+                    return
+    
+    def _dispatch(self, message):
+        if message[0] == 'stats':
+            return 'ok', self.stats()
+        if message[0] != 'parse':
+            return 'error', f"Bilinmeyen istek: {message[0]}"
+        
+        _, filename, raw = message
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self._count('busy')
+            return 'busy', f"Parse servisi dolu ({self.max_pending} istek işleniyor)"
+        with self._lock:
+            self._in_flight += 1
+        
+        def release(_):
+            # Yer, istek zaman aşımına uğrasa da worker'daki iş bitince açılır
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+        
+        try:
+            result = self._pool.apply_async(parse_with_metrics, (raw, filename), callback=release,
+                                            error_callback=release)
+        except Exception:
+            release(None)
+            raise
+        try:
+            document, metrics_snapshot = result.get(self.request_timeout)
+        except multiprocessing.TimeoutError:
+            self._count('timeouts')
+            return 'timeout', f"{filename}: {self.request_timeout:g} sn içinde parse edilemedi"
+        except Exception as e:
+            self._count('errors')
+            return 'error', f"{filename}: {e}"
+        self._count('served')
+        return 'ok', (document, metrics_snapshot)
+
+
+class ParseServiceClient:
+    """Parse servisinin istemcisi; her thread kendi bağlantısını kullanır
+    
+    submit() işi arka plan thread'ine verip Future döndürür; sonuç, process havuzuna
+    parse_with_metrics göndermekle aynıdır: (Irsaliye, ölçüm snapshot'ı).
+    """
+    
+    def __init__(self, path=DEFAULT_SOCKET, timeout=REQUEST_TIMEOUT + QUEUE_TIMEOUT, concurrency=8):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='parse-service')
+    
+    def _connect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = Client(self.path, family='AF_UNIX')
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+    
+    def _drop_connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            self._local.connection = None
+            with self._lock:
+                self._connections.remove(connection)
+            connection.close()
+    
+    def _request(self, message):
+        # Servis yeniden başlatıldıysa eski bağlantı kopuktur; bir kez yeniden bağlanılır
+        for attempt in range(2):
+            try:
+                connection = self._connect()
+                connection.send(message)
+                ready = connection.poll(self.timeout)
+                if ready:
+                    return connection.recv()
+            except (EOFError, ConnectionError, FileNotFoundError) as e:
+                self._drop_connection()
+                if attempt:
+                    raise RuntimeError(f"Parse servisine ulaşılamadı ({self.path}): {e}") from e
+                continue
+            # Geç gelen yanıt sonraki isteğe karışmasın diye bağlantı kapatılır
+            self._drop_connection()
+            raise TimeoutError(f"Parse servisi {self.timeout:g} sn içinde yanıt vermedi")
+    
+    def parse(self, raw, filename=''):
+        """(Irsaliye, ölçüm snapshot'ı) döndürür
+        
+        Servis doluysa BUSY_RETRIES kez artan aralıklarla tekrar dener, yine doluysa
+        ServiceBusyError verir. Zaman aşımı TimeoutError, diğer servis hataları RuntimeError'dır.
+        """
+        for attempt in range(BUSY_RETRIES + 1):
+            status, payload = self._request(('parse', filename, raw))
+            if status != 'busy' or attempt == BUSY_RETRIES:
+                break
+            time.sleep(BUSY_BACKOFF * 2 ** attempt)
+        if status == 'ok':
+            return payload
+        if status == 'timeout':
+            raise TimeoutError(payload)
+        if status == 'busy':
+            raise ServiceBusyError(payload)
+        raise RuntimeError(payload)
+    
+    def submit(self, raw, filename=''):
+        return self._executor.submit(self.parse, raw, filename)
+    
+    def stats(self):
+        return self._request(('stats',))[1]
+    
+    def close(self):
+        self._executor.shutdown()
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="İrsaliye parse servisi (Unix soketi)")
+    arg_parser.add_argument('--socket', default=os.environ.get('IRSALIYE_SERVICE_SOCKET', DEFAULT_SOCKET),
+                            help="soket yolu (varsayılan: IRSALIYE_SERVICE_SOCKET veya %(default)s)")
+    arg_parser.add_argument('-w', '--workers', type=int, default=None,
+                            help="worker process sayısı (varsayılan: çekirdek sayısı)")
+    arg_parser.add_argument('--max-pending', type=int, default=None,
+                            help="aynı anda kabul edilen istek (varsayılan: 4 x worker)")
+    arg_parser.add_argument('--timeout', type=float, default=REQUEST_TIMEOUT,
+                            help="istek başına parse süresi sınırı (sn)")
+    arg_parser.add_argument('--queue-timeout', type=float, default=QUEUE_TIMEOUT,
+                            help="servis doluyken yer bekleme sınırı (sn)")
+    arg_parser.add_argument('--max-tasks-per-child', type=int, default=None,
+                            help="worker bu kadar belgeden sonra yenilenir")
+    arg_parser.add_argument('--import', dest='preload', action='append', default=[],
+                            help="worker'larda yüklenecek modül (register_field kayıtları için; tekrarlanabilir)")
+    args = arg_parser.parse_args()
+    
+    service = ParseService(args.socket, workers=args.workers, max_pending=args.max_pending,
+                           request_timeout=args.timeout, queue_timeout=args.queue_timeout,
+                           preload=args.preload, max_tasks_per_child=args.max_tasks_per_child)
+    # SIGTERM de Ctrl+C gibi temiz kapanış yapsın
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    with service:
+        print(f"Parse servisi hazır: {service.path} ({service.workers} worker, en fazla {service.max_pending} istek)")
+        try:
+            service.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""Parse edilen irsaliyelerin sorgulanabilir SQLite deposu
+
+irsaliye tablosu belge başına bir satır tutar ve irsaliye_no ile tekildir; aynı
+irsaliye tekrar yazılırsa başlığı güncellenir, kalemleri yenileriyle değiştirilir
+(yeniden içe aktarma idempotenttir). kalem tablosu malzeme satırlarını tutar.
+irsaliye_no, irsaliye_tarihi ve malzeme_kodu indekslidir.
+"""
+
+import sqlite3
+import threading
+import time
+
+from irsaliye.document import to_date, to_number
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS irsaliye (
+    id INTEGER PRIMARY KEY,
+    irsaliye_no TEXT NOT NULL UNIQUE,
+    irsaliye_tarihi TEXT,
+    sevk_adresi TEXT,
+    sevk_edilen_kisi TEXT,
+    sevk_edilen_tel TEXT,
+    not_bilgileri TEXT,
+    dosya_adi TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS kalem (
+    irsaliye_id INTEGER NOT NULL REFERENCES irsaliye (id) ON DELETE CASCADE,
+    sira INTEGER NOT NULL,
+    malzeme_kodu TEXT,
+    malzeme_aciklama TEXT,
+    adeti REAL,
+    PRIMARY KEY (irsaliye_id, sira)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS irsaliye_tarihi_idx ON irsaliye (irsaliye_tarihi);
+CREATE INDEX IF NOT EXISTS irsaliye_dosya_adi_idx ON irsaliye (dosya_adi);
+CREATE INDEX IF NOT EXISTS kalem_malzeme_kodu_idx ON kalem (malzeme_kodu);
+'''
+
+UPSERT_IRSALIYE = '''
+INSERT INTO irsaliye (irsaliye_no, irsaliye_tarihi, sevk_adresi, sevk_edilen_kisi, sevk_edilen_tel,
+                      not_bilgileri, dosya_adi, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (irsaliye_no) DO UPDATE SET
+    irsaliye_tarihi = excluded.irsaliye_tarihi,
+    sevk_adresi = excluded.sevk_adresi,
+    sevk_edilen_kisi = excluded.sevk_edilen_kisi,
+    sevk_edilen_tel = excluded.sevk_edilen_tel,
+    not_bilgileri = excluded.not_bilgileri,
+    dosya_adi = excluded.dosya_adi,
+    updated_at = excluded.updated_at
+'''
+
+QUERY_COLUMNS = ['dosya_adi', 'irsaliye_no', 'irsaliye_tarihi', 'sevk_adresi', 'sevk_edilen_kisi',
+                 'sevk_edilen_tel', 'malzeme_kodu', 'malzeme_aciklama', 'adeti', 'not_bilgileri']
+
+# SQLite'ın tek sorgudaki parametre sınırının altında kalır
+SQL_PARAMETER_CHUNK = 500
+
+
+def _iso_date(value):
+    date = to_date(value)
+    return date.isoformat() if date else None
+
+
+class IrsaliyeStore:
+    """Belgeleri toplu (executemany, tek transaction) yazar ve indeksli sorgular
+    
+    write_document() belgeleri biriktirir, batch_size belgede bir yazar; close()
+    veya flush() kalanları yazar. irsaliye_no'su olmayan belgeler atlanır (skipped).
+    """
+    
+    def __init__(self, path, batch_size=1000):
+        self.path = str(path)
+        self.batch_size = batch_size
+        self.count = 0
+        self.skipped = 0
+        self._pending = {}
+        # Web uygulamasında birden çok iş iş parçacığı aynı depoya yazar
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA foreign_keys=ON')
+        self._conn.executescript(SCHEMA)
+    
+    def write_document(self, document):
+        irsaliye_no = document.irsaliye_no
+        if not irsaliye_no:
+            self.skipped += 1
+            return
+        with self._lock:
+            # Aynı toplu işte tekrar eden irsaliyede son gelen geçerlidir
+            self._pending[str(irsaliye_no)] = document
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+    
+    def flush(self):
+        """Bekleyen belgeleri tek transaction'da yazar"""
+        with self._lock, self._conn:
+            if not self._pending:
+                return
+            documents = self._pending
+            self._pending = {}
+            now = time.time()
+            
+            self._conn.executemany(UPSERT_IRSALIYE, [
+                (irsaliye_no, _iso_date(document.irsaliye_tarihi), document.sevk_adresi, document.sevk_edilen_kisi,
+                 document.sevk_edilen_tel, document.not_bilgileri, document.dosya_adi, now)
+                for irsaliye_no, document in documents.items()
+            ])
+            ids = self._ids_for(list(documents))
+            # Yeniden içe aktarılan irsaliyelerin eski kalemleri yenileriyle değiştirilir
+            self._conn.executemany('DELETE FROM kalem WHERE irsaliye_id = ?', [(ids[no],) for no in documents])
+            self._conn.executemany(
+                'INSERT INTO kalem (irsaliye_id, sira, malzeme_kodu, malzeme_aciklama, adeti) VALUES (?, ?, ?, ?, ?)',
+                [(ids[irsaliye_no], sira, kalem.malzeme_kodu, kalem.malzeme_aciklama, to_number(kalem.adeti))
+                 for irsaliye_no, document in documents.items()
+                 for sira, kalem in enumerate(document.kalemler, 1)],
+            )
+            self.count += len(documents)
+    
+    def _ids_for(self, irsaliye_nos):
+        ids = {}
+        for start in range(0, len(irsaliye_nos), SQL_PARAMETER_CHUNK):
+            chunk = irsaliye_nos[start:start + SQL_PARAMETER_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            ids.update(
+                (irsaliye_no, irsaliye_id) for irsaliye_id, irsaliye_no in self._conn.execute(
+                    f'SELECT id, irsaliye_no FROM irsaliye WHERE irsaliye_no IN ({placeholders})', chunk)
+            )
+        return ids
+    
+    def delete_files(self, names):
+        """Verilen dosyalardan gelen irsaliyeleri (ve kalemlerini) siler"""
+        self.flush()
+        names = list(names)
+        with self._lock, self._conn:
+            for start in range(0, len(names), SQL_PARAMETER_CHUNK):
+                chunk = names[start:start + SQL_PARAMETER_CHUNK]
+                self._conn.execute(f'DELETE FROM irsaliye WHERE dosya_adi IN ({",".join("?" * len(chunk))})', chunk)
+    
+    def query(self, irsaliye_no=None, malzeme_kodu=None, sevk_adresi=None, tarih_baslangic=None,
+              tarih_bitis=None, limit=1000):
+        """Filtrelere uyan satırları (FIELDNAMES sırasıyla dict) en yeni tarihten başlayarak döndürür
+        
+        malzeme_kodu ve irsaliye_no tam eşleşir, sevk_adresi parça olarak aranır;
+        tarihler YYYY-MM-DD veya QR'daki biçimlerde verilebilir ve dahildir.
+        """
+        conditions = []
+        params = []
+        if irsaliye_no:
+            conditions.append('i.irsaliye_no = ?')
+            params.append(irsaliye_no)
+        if malzeme_kodu:
+            conditions.append('k.malzeme_kodu = ?')
+            params.append(malzeme_kodu)
+        if sevk_adresi:
+            conditions.append("i.sevk_adresi LIKE '%' || ? || '%'")
+            params.append(sevk_adresi)
+        if tarih_baslangic:
+            conditions.append('i.irsaliye_tarihi >= ?')
+            params.append(_iso_date(tarih_baslangic) or tarih_baslangic)
+        if tarih_bitis:
+            conditions.append('i.irsaliye_tarihi <= ?')
+            params.append(_iso_date(tarih_bitis) or tarih_bitis)
+        
+        # Malzemesi olmayan irsaliyeler de (malzeme filtresi yoksa) tek satırla döner
+        sql = (
+            'SELECT i.dosya_adi, i.irsaliye_no, i.irsaliye_tarihi, i.sevk_adresi, i.sevk_edilen_kisi,'
+            ' i.sevk_edilen_tel, k.malzeme_kodu, k.malzeme_aciklama, k.adeti, i.not_bilgileri'
+            ' FROM irsaliye i LEFT JOIN kalem k ON k.irsaliye_id = i.id'
+        )
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY i.irsaliye_tarihi DESC, i.irsaliye_no, k.sira LIMIT ?'
+        params.append(limit)
+        
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        
+        results = []
+        for row in rows:
+            result = dict(zip(QUERY_COLUMNS, row))
+            # Tam sayı miktarlar CSV/JSON çıktısındaki gibi tam sayı döner
+            if isinstance(result['adeti'], float) and result['adeti'].is_integer():
+                result['adeti'] = int(result['adeti'])
+            results.append(result)
+        return results
+    
+    def stats(self):
+        """İrsaliye ve kalem sayılarını döndürür"""
+        with self._lock:
+            irsaliye_count = self._conn.execute('SELECT COUNT(*) FROM irsaliye').fetchone()[0]
+            kalem_count = self._conn.execute('SELECT COUNT(*) FROM kalem').fetchone()[0]
+        return {'irsaliye': irsaliye_count, 'kalem': kalem_count}
+    
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""Satırları geldikçe CSV / JSON Lines / JSON dizisi olarak yazan yazıcılar
+
+JSON Lines dosyaları için seyrek satır ofset indeksi de buradadır: sayfalama
+dosyanın başından okumadan istenen satıra atlar.
+"""
+
+import csv
+import io
+import itertools
+import json
+import os
+import threading
+from array import array
+
+from irsaliye.document import record_fieldnames
+
+
+def _open_output(output_file, mode, **kwargs):
+    """Dosya yolu verilirse açar; açık bir akış verilirse olduğu gibi kullanır
+    
+    (dosya, sahiplik) döndürür; sahiplik yoksa close() akışı kapatmaz.
+    """
+    if hasattr(output_file, 'write'):
+        return output_file, False
+    return open(output_file, mode, encoding='utf-8', **kwargs), True
+
+
+class CsvRecordWriter:
+    """Satırları geldikçe CSV dosyasına (veya açık bir metin akışına) yazar"""
+    
+    def __init__(self, output_file, append=False):
+        self.output_file = output_file
+        self.count = 0
+        # append modunda başlık sadece dosya boşsa yazılır
+        write_header = not (append and os.path.exists(output_file) and os.path.getsize(output_file))
+        self._file, self._owns_file = _open_output(output_file, 'a' if append else 'w', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=record_fieldnames())
+        if write_header:
+            self._writer.writeheader()
+    
+    def write(self, record):
+        self._writer.writerow(record)
+        self.count += 1
+    
+    def close(self):
+        if self._owns_file:
+            self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class JsonLinesRecordWriter(CsvRecordWriter):
+    """Satırları geldikçe JSON Lines (her satır bir JSON nesnesi) olarak yazar"""
+    
+    def __init__(self, output_file, append=False):
+        self.output_file = output_file
+        self.count = 0
+        self._file, self._owns_file = _open_output(output_file, 'a' if append else 'w')
+    
+    def write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False))
+        self._file.write('\n')
+        self.count += 1
+
+
+class JsonArrayRecordWriter(CsvRecordWriter):
+    """Satırları geldikçe tek bir JSON dizisi olarak yazar (json.dump ile aynı çıktı)"""
+    
+    def __init__(self, output_file, indent=2):
+        self.output_file = output_file
+        self.count = 0
+        self.indent = indent
+        self._file, self._owns_file = _open_output(output_file, 'w')
+        self._file.write('[')
+    
+    def write(self, record):
+        text = json.dumps(record, ensure_ascii=False, indent=self.indent)
+        if self.indent is not None:
+            # Dizi içindeki girinti seviyesine kaydır
+            text = text.replace('\n', '\n' + ' ' * self.indent)
+            self._file.write(',\n' if self.count else '\n')
+            self._file.write(' ' * self.indent)
+        elif self.count:
+            self._file.write(', ')
+        self._file.write(text)
+        self.count += 1
+    
+    def close(self):
+        if self.count and self.indent is not None:
+            self._file.write('\n')
+        self._file.write(']')
+        super().close()
+
+
+def iter_export_chunks(records, writer_class, chunk_size=64 * 1024, **writer_kwargs):
+    """Kayıtları verilen yazıcı biçiminde metin parçaları olarak üretir (akışlı indirme için)"""
+    buffer = io.StringIO()
+    writer = writer_class(buffer, **writer_kwargs)
+    for record in records:
+        writer.write(record)
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    writer.close()
+    yield buffer.getvalue()
+
+
+# Satır ofset indeksi: her INDEX_STRIDE satırdan birinin dosyadaki bayt ofseti tutulur
+INDEX_STRIDE = 1000
+
+
+def line_index_path(path):
+    return path + '.idx'
+
+
+def build_line_index(path, stride=INDEX_STRIDE):
+    """JSON Lines dosyasının seyrek ofset indeksini (path.idx) yazar, satır sayısını döndürür
+    
+    İndeks dosyası: [stride, satır sayısı, ofset, ofset, ...] (8 baytlık işaretsiz tamsayılar).
+    """
+    offsets = array('Q')
+    count = 0
+    position = 0
+    with open(path, 'rb') as lines:
+        for line in lines:
+            if count % stride == 0:
+                offsets.append(position)
+            position += len(line)
+            count += 1
+    
+    # Eşzamanlı istekler aynı geçici dosyaya yazmasın
+    tmp_path = f'{line_index_path(path)}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'wb') as index_file:
+        array('Q', [stride, count]).tofile(index_file)
+        offsets.tofile(index_file)
+    os.replace(tmp_path, line_index_path(path))
+    return count
+
+
+def _load_line_index(path):
+    """(stride, satır sayısı, ofsetler); indeks yoksa veya dosyadan eskiyse önce oluşturulur"""
+    index_path = line_index_path(path)
+    if not os.path.exists(index_path) or os.path.getmtime(index_path) < os.path.getmtime(path):
+        build_line_index(path)
+    with open(index_path, 'rb') as index_file:
+        header = array('Q')
+        header.fromfile(index_file, 2)
+        offsets = array('Q', index_file.read())
+    return header[0], header[1], offsets
+
+
+def read_records_page(path, offset, limit):
+    """JSON Lines dosyasının offset'inci satırından en fazla limit kaydı okur; (kayıtlar, toplam) döndürür
+    
+    En yakın indeks noktasına atlanır, en fazla stride - 1 satır okunup geçilir.
+    """
+    stride, total, offsets = _load_line_index(path)
+    if offset >= total or limit <= 0:
+        return [], total
+    with open(path, 'rb') as lines:
+        lines.seek(offsets[offset // stride])
+        page = itertools.islice(lines, offset % stride, offset % stride + limit)
+        return [json.loads(line) for line in page], total
@@ -2,244 +2,842 @@
 # -*- coding: utf-8 -*-
 
 import os
-import re
 import csv
+import argparse
+import contextlib
 import json
-from bs4 import BeautifulSoup
+import hashlib
+import itertools
+import logging
+import multiprocessing
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from irsaliye import (
+    FIELDNAMES, Aggregator, CsvRecordWriter, IrsaliyeStore, JsonArrayRecordWriter, JsonLinesRecordWriter, ResultCache,
+    iter_document_records, parse
+)
+from irsaliye.aggregate import AGGREGATE_GROUPS
+from irsaliye.metrics import ParseMetrics
+from irsaliye.pipeline import WriterThread, prefetch
+from irsaliye.prefilter import SKIP_DUPLICATE, BatchFilter
+from irsaliye.columnar import COLUMNAR_FORMATS, ColumnarDocumentWriter, columnar_available, columnar_paths
+
+FILE_LOG_MODES = ['print', 'logging', 'off']
+
+logger = logging.getLogger('irsaliye_parser')
+
+
+def _pool_context():
+    """Parse havuzunun başlatma yöntemi: forkserver, yoksa spawn
+    
+    Havuz okuyucu ve yazıcı thread'leri çalışırken açılır; fork bu thread'lerin tuttuğu
+    kilitleri (logging, sqlite) tutulu hâlde kopyalayıp worker'ı kilitleyebilir.
+    """
+    return multiprocessing.get_context('forkserver' if 'forkserver' in multiprocessing.get_all_start_methods()
+                                       else 'spawn')
+
+
+def _parse_files_in_worker(files, cache_path=None, collect_metrics=False, file_log='print'):
+    """Process havuzunda bir parça (dosya adı, ham bayt) çiftini parse eder, belgeleri döndürür (hatada None)"""
+    parser = IrsaliyeParserV2(None, cache_path=cache_path, metrics=ParseMetrics() if collect_metrics else None,
+                              file_log=file_log)
+    try:
+        results = [parser.parse_html_bytes(raw, filename) for filename, raw in files]
+    finally:
+        parser.close()
+    
+    cache_counts = (parser.cache.hits, parser.cache.misses) if parser.cache else (0, 0)
+    return results, cache_counts, parser.metrics.snapshot() if parser.metrics else None
+
+
 class IrsaliyeParserV2:
-    def __init__(self, html_folder_path):
-        self.html_folder_path = Path(html_folder_path)
-        self.parsed_data = []
+    def __init__(self, html_folder_path, workers=1, chunksize=None, cache_path=None, metrics=None,
+                 file_log='print', prefilter=True, readers=0, prefetch_depth=32, recursive=False):
+        self.html_folder_path = Path(html_folder_path) if html_folder_path is not None else None
+        # Belgeler başlık + kalemler olarak tutulur; satırlar sadece kaydederken üretilir
+        self.documents = []
+        # Satırlar yazıcılara aktığında (documents boş kalır) özet için sadece bunlar tutulur
+        self.streamed_records = 0
+        self.irsaliye_numbers = set()
+        self.sample_records = []
+        # workers > 1 ise dosyalar process havuzunda paralel işlenir
+        self.workers = max(1, workers or 1)
+        self.chunksize = chunksize
+        # cache_path verilirse daha önce görülen içerikler tekrar parse edilmez
+        self.cache_path = cache_path
+        self.cache = ResultCache(cache_path) if cache_path else None
+        # metrics (ParseMetrics) verilirse aşama süreleri ve sayaçlar toplanır
+        self.metrics = metrics
+        # Dosya başına ilerleme satırları: print, logging veya off (hatalar off'ta da yazılır)
+        self.file_log = file_log
+        # prefilter: irsaliye olmayan ve aynı çalışmada tekrar eden (QR no + tarih) dosyalar parse edilmez
+        self.prefilter = prefilter
+        self.batch_filter = None
+        self.skipped_files = {}
+        # readers > 0 ise dosyalar o kadar thread'de önceden okunur (en fazla prefetch_depth dosya) ve
+        # yazıcılar ayrı thread'de beslenir; okuma, parse ve yazma örtüşür
+        self.readers = max(0, readers or 0)
+        self.prefetch_depth = prefetch_depth
+        # recursive: alt klasörler de taranır, dosya_adi klasöre göre göreli yol olur
+        self.recursive = recursive
+    
+    def _log_file(self, message):
+        if self.file_log == 'print':
+            print(message)
+        elif self.file_log == 'logging':
+            logger.info(message)
+    
+    def _log_error(self, message):
+        if self.file_log == 'logging':
+            logger.error(message)
+        else:
+            print(message)
+    
+    @property
+    def parsed_data(self):
+        """Parse edilen belgelerin düz satırları (her erişimde yeniden oluşturulur)"""
+        return list(iter_document_records(self.documents))
+    
+    def record_count(self):
+        """Parse edilen belgelerin toplam satır sayısı"""
+        return sum(document.record_count() for document in self.documents)
+    
+    def close(self):
+        """Önbellek bağlantısını kapatır"""
+        if self.cache:
+            self.cache.close()
     
-    def extract_text_from_cell(self, element):
-        """HTML elementinden temiz metin çıkarır"""
-        if element is None:
-            return ""
-        return element.get_text(strip=True)
+    def parse_html_document(self, html_file_path):
+        """Tek bir HTML dosyasını parse edip Irsaliye döndürür (hata durumunda None)"""
+        raw = self._read_file(html_file_path)
+        if raw is None:
+            return None
+        return self.parse_html_bytes(raw, self.file_name(html_file_path))
+    
+    def parse_html_bytes(self, raw, filename):
+        """Okunmuş HTML baytlarını parse edip Irsaliye döndürür (hata durumunda None)"""
+        try:
+            return parse(raw, filename, self.cache, self.metrics)
+        except Exception as e:
+            # Bir dosyadaki hata diğer dosyaları durdurmamalı
+            self._file_failed(filename, e)
+            return None
+    
+    def _read_file(self, html_file_path):
+        try:
+            return html_file_path.read_bytes()
+        except OSError as e:
+            self._file_failed(self.file_name(html_file_path), e)
+            return None
+    
+    def _file_failed(self, filename, error):
+        if self.metrics:
+            self.metrics.count('errors')
+        self._log_error(f"Hata: {filename} dosyası işlenirken hata oluştu: {str(error)}")
+    
+    def parse_html_records(self, html_file_path):
+        """Tek bir HTML dosyasını parse eder ve satırlarını döndürür (belgelere eklemez)"""
+        document = self.parse_html_document(html_file_path)
+        return document.records() if document is not None else []
     
     def parse_single_html(self, html_file_path):
         """Tek bir HTML dosyasını parse eder"""
+        document = self.parse_html_document(html_file_path)
+        if document is not None:
+            self.documents.append(document)
+    
+    def find_html_files(self):
+        """Klasördeki (recursive ise alt klasörlerle birlikte) HTML dosyalarını sıralı olarak listeler"""
+        # Sıralı liste: seri ve paralel modda aynı kayıt sırası
+        pattern = "**/*.html" if self.recursive else "*.html"
+        return sorted(path for path in self.html_folder_path.glob(pattern) if path.is_file())
+    
+    def file_name(self, html_file):
+        """Çıktılarda ve manifest'te kullanılan ad: klasöre göre göreli yol (alt klasör yoksa dosya adı)"""
+        if self.html_folder_path is None:
+            return html_file.name
         try:
-            # Farklı encoding'leri dene
-            encodings = ['utf-16', 'utf-8', 'utf-16-le', 'utf-16-be', 'latin-1', 'cp1252']
-            content = ""
-            
-            for encoding in encodings:
-                try:
-                    with open(html_file_path, 'r', encoding=encoding) as file:
-                        content = file.read()
-                    break  # Başarılı okuma
-                except UnicodeDecodeError:
-                    continue
-            
-            if not content:
-                print(f"Uyarı: {html_file_path.name} dosyası hiçbir encoding ile okunamadı")
-                return
-            
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # İrsaliye verileri
-            irsaliye_data = {
-                'dosya_adi': html_file_path.name,
-                'irsaliye_no': '',
-                'irsaliye_tarihi': '',
-                'sevk_adresi': '',
-                'sevk_edilen_kisi': '',
-                'sevk_edilen_tel': '',
-                'malzeme_kodu': '',
-                'malzeme_aciklama': '',
-                'adeti': '',
-                'not_bilgileri': ''
-            }
-            
-            # QR code div içindeki JSON veriyi bul
-            qr_div = soup.find('div', id='qrvalue')
-            if qr_div and qr_div.get_text(strip=True):
-                try:
-                    json_text = qr_div.get_text(strip=True)
-                    qr_data = json.loads(json_text)
-                    
-                    # JSON'dan temel bilgileri al
-                    irsaliye_data['irsaliye_no'] = qr_data.get('no', '')
-                    irsaliye_data['irsaliye_tarihi'] = qr_data.get('tarih', '')
-                    
-                    # JSON'dan temel bilgiler başarıyla alındı
-                    
-                except json.JSONDecodeError as e:
-                    print(f"JSON parse hatası: {e}")
-            
-            # Sevk edilen kişi bilgisini bul (customerPartyTable'dan)
-            customer_table = soup.find('table', id='customerPartyTable')
-            if customer_table:
-                # "SAYIN" sonrası kısmı bul
-                sayin_found = False
-                for row in customer_table.find_all('tr'):
-                    cell_text = self.extract_text_from_cell(row.find('td'))
-                    if 'SAYIN' in cell_text:
-                        sayin_found = True
-                        continue
-                    
-                    # SAYIN'dan sonraki satırda isim var
-                    if sayin_found and cell_text and cell_text.strip():
-                        # HTML etiketlerini temizle ve ismi al
-                        clean_text = cell_text.strip()
-                        if clean_text and len(clean_text) > 2:  # Çok kısa metinleri atla
-                            irsaliye_data['sevk_edilen_kisi'] = clean_text
-                            break
-            
-            # Sevk Adresi'ni bul
-            sevk_adresi_pattern = r'Sevk Adresi:(.*?)</span>'
-            match = re.search(sevk_adresi_pattern, content)
-            if match:
-                sevk_adresi_raw = match.group(1).strip()
-                # HTML etiketlerini temizle
-                sevk_adresi_clean = BeautifulSoup(sevk_adresi_raw, 'html.parser').get_text(strip=True)
-                
-                # Telefon numarasını ayır
-                tel_pattern = r'Tel:(\d+)'
-                tel_match = re.search(tel_pattern, sevk_adresi_clean)
-                if tel_match:
-                    irsaliye_data['sevk_edilen_tel'] = tel_match.group(1)
-                    # Telefon numarasını adresten çıkar
-                    irsaliye_data['sevk_adresi'] = re.sub(r'\s*Tel:\d+', '', sevk_adresi_clean).strip()
-                else:
-                    irsaliye_data['sevk_adresi'] = sevk_adresi_clean
-            
-            # Malzeme tablosunu bul ve parse et
-            tables = soup.find_all('table')
-            malzeme_bulundu = False
-            
-            for table in tables:
-                # Malzeme tablosunu tanımla (Malzeme Kodu başlığı olan tablo)
-                headers = table.find_all('th') or table.find_all('td')
-                header_texts = [self.extract_text_from_cell(th) for th in headers]
-                
-                if any('Malzeme Kodu' in header for header in header_texts):
-                    # Bu malzeme tablosu
-                    rows = table.find_all('tr')[1:]  # İlk satır başlık
-                    
-                    for row in rows:
-                        cells = row.find_all('td')
-                        if len(cells) >= 3:
-                            malzeme_kodu = self.extract_text_from_cell(cells[1])  # 2. sütun
-                            malzeme_aciklama = self.extract_text_from_cell(cells[2])  # 3. sütun
-                            miktar_cell = self.extract_text_from_cell(cells[3]) if len(cells) > 3 else ""  # 4. sütun
-                            
-                            # Miktarı temizle (sadece sayıları al)
-                            miktar_match = re.search(r'(\d+)', miktar_cell)
-                            miktar = miktar_match.group(1) if miktar_match else ""
-                            
-                            if malzeme_kodu:  # Boş satırları atla
-                                irsaliye_entry = irsaliye_data.copy()
-                                irsaliye_entry['malzeme_kodu'] = malzeme_kodu
-                                irsaliye_entry['malzeme_aciklama'] = malzeme_aciklama
-                                irsaliye_entry['adeti'] = miktar
-                                self.parsed_data.append(irsaliye_entry)
-                                malzeme_bulundu = True
-            
-            # Açıklamalar tablosunu bul
-            for table in tables:
-                headers = table.find_all('th')
-                if any('Açıklamalar' in self.extract_text_from_cell(th) for th in headers):
-                    rows = table.find_all('tr')[1:]  # İlk satır başlık
-                    for row in rows:
-                        cells = row.find_all('td')
-                        if len(cells) >= 2:
-                            not_label = self.extract_text_from_cell(cells[0])
-                            not_content = self.extract_text_from_cell(cells[1])
-                            if 'Not:' in not_label and not_content:
-                                # Bu not bilgisini tüm malzeme satırlarına ekle
-                                for entry in self.parsed_data:
-                                    if entry['dosya_adi'] == html_file_path.name:
-                                        entry['not_bilgileri'] = not_content
+            return html_file.relative_to(self.html_folder_path).as_posix()
+        except ValueError:
+            return html_file.name
+    
+    def iter_records(self, html_files=None):
+        """Dosyaları sırayla parse edip satırları tek tek üretir (bellekte biriktirmez)"""
+        if html_files is None:
+            html_files = self.find_html_files()
+        
+        for html_file, document in self._iter_file_documents(html_files):
+            if document is not None:
+                yield from document.records()
+    
+    def _iter_file_documents(self, html_files, batch_filter=None):
+        """(dosya, belge) çiftlerini girdi sırasıyla üretir; hatalı veya ön filtreye takılan dosyada belge None
+        
+        Atlanan dosyaların sebebi skipped_files'a, sayıları batch_filter.skipped'a yazılır.
+        batch_filter verilmezse (prefilter açıksa) boş bir BatchFilter kullanılır.
+        """
+        total = len(html_files)
+        if batch_filter is None and self.prefilter:
+            batch_filter = BatchFilter()
+        self.batch_filter = batch_filter
+        if self.workers > 1 and total > 1:
+            file_results = self._iter_files_parallel(html_files)
+            label = "İşlendi"
+        else:
+            file_results = self._iter_files_serial(html_files)
+            label = "İşleniyor"
+        
+        for i, (html_file, document, reason) in enumerate(file_results, 1):
+            name = self.file_name(html_file)
+            if reason:
+                self.skipped_files[name] = reason
+                if self.metrics:
+                    self.metrics.count_labeled('skipped', 'reason', reason)
+                self._log_file(f"Atlandı ({reason}): {name} ({i}/{total})")
+            else:
+                self._log_file(f"{label}: {name} ({i}/{total})")
+            yield html_file, document
+    
+    def _writer_thread(self, export):
+        """readers > 0 ise export'u ayrı thread'de çalıştıran WriterThread, değilse None veren bağlam"""
+        if export is None or not self.readers:
+            return contextlib.nullcontext()
+        return WriterThread(export, self.prefetch_depth)
+    
+    def _iter_raw_files(self, html_files):
+        """(dosya, ham bayt) çiftlerini girdi sırasıyla üretir (okunamayan dosyada None)
+        
+        readers > 0 ise okumalar thread havuzunda önceden yapılır; bellekte en fazla prefetch_depth dosya bekler.
+        """
+        if self.readers:
+            return prefetch(html_files, self._read_file, self.readers, self.prefetch_depth)
+        return ((html_file, self._read_file(html_file)) for html_file in html_files)
+    
+    def _iter_checked_files(self, html_files):
+        """(dosya, ham bayt, atlama sebebi) üretir; her dosya bir kez okunur, ön filtre ve parse aynı baytları kullanır"""
+        for html_file, raw in self._iter_raw_files(html_files):
+            reason = None
+            if self.batch_filter and raw is not None:
+                reason = self.batch_filter.check(raw, self.file_name(html_file))
+            yield html_file, raw, reason
+    
+    def _iter_files_serial(self, html_files):
+        """(dosya, belge, atlama sebebi) üretir"""
+        for html_file, raw, reason in self._iter_checked_files(html_files):
+            if raw is None or reason:
+                yield html_file, None, reason
+            else:
+                yield html_file, self.parse_html_bytes(raw, self.file_name(html_file)), reason
+    
+    def _iter_files_parallel(self, html_files):
+        """(dosya, belge, atlama sebebi) üretir; okuma ve ön filtre ana process'te, parse worker'larda yapılır
+        
+        Tekrar kararı dosya sırasına bağlı olduğundan ön filtre sırayla uygulanır. Worker'lara
+        baytlar gönderilir; dosyalar (ör. ağ paylaşımından) ikinci kez okunmaz.
+        """
+        workers = min(self.workers, len(html_files))
+        # Parça boyutu: her worker'a ~4 parça düşsün, IPC maliyeti dosya başına bölünsün
+        chunksize = self.chunksize or max(1, min(len(html_files) // (workers * 4), 256))
+        # Aynı anda işlemdeki parça sayısı sınırlı: bellek toplu iş boyutuyla büyümez
+        window = workers * 2
+        checked_files = self._iter_checked_files(html_files)
+        
+        def submit_next():
+            """Sıradaki parçayı okuyup atlanmayan dosyalarını gönderir; dosya kalmadıysa None"""
+            chunk = list(itertools.islice(checked_files, chunksize))
+            if not chunk:
+                return None
+            files = [(self.file_name(html_file), raw) for html_file, raw, reason in chunk
+                     if raw is not None and not reason]
+            future = None
+            if files:
+                future = executor.submit(_parse_files_in_worker, files, self.cache_path, self.metrics is not None,
+                                         self.file_log)
+            return chunk, future
+        
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as executor:
+            pending = deque()
+            for _ in range(window):
+                submitted = submit_next()
+                if submitted is None:
+                    break
+                pending.append(submitted)
             
-            # Eğer malzeme bulunamadıysa, en azından temel bilgileri kaydet
-            if not malzeme_bulundu:
-                self.parsed_data.append(irsaliye_data)
-                
-        except Exception as e:
-            print(f"Hata: {html_file_path.name} dosyası işlenirken hata oluştu: {str(e)}")
+            # Parçalar gönderim sırasıyla beklenir; sonuçlar seri yol ile aynı sırada gelir
+            while pending:
+                chunk, future = pending.popleft()
+                submitted = submit_next()
+                if submitted is not None:
+                    pending.append(submitted)
+                results = iter(())
+                if future is not None:
+                    documents, (hits, misses), metrics_snapshot = future.result()
+                    if self.cache:
+                        self.cache.hits += hits
+                        self.cache.misses += misses
+                    if metrics_snapshot:
+                        self.metrics.merge(metrics_snapshot)
+                    results = iter(documents)
+                for html_file, raw, reason in chunk:
+                    if raw is None or reason:
+                        yield html_file, None, reason
+                    else:
+                        yield html_file, next(results), reason
     
-    def parse_all_html_files(self):
-        """Klasördeki tüm HTML dosyalarını parse eder"""
-        html_files = list(self.html_folder_path.glob("*.html"))
+    def parse_all_html_files(self, writers=None, document_writers=()):
+        """Klasördeki tüm HTML dosyalarını parse eder
+        
+        writers verilirse satırlar belleğe alınmadan doğrudan yazıcılara akar.
+        document_writers (ör. Parquet) belgeleri başlık/kalem ayrımıyla parse edildikçe alır.
+        readers > 0 ise yazıcılar ayrı bir thread'de beslenir.
+        """
+        html_files = self.find_html_files()
         
         print(f"{len(html_files)} HTML dosyası bulundu...")
         
-        for i, html_file in enumerate(html_files, 1):
-            print(f"İşleniyor: {html_file.name} ({i}/{len(html_files)})")
-            self.parse_single_html(html_file)
+        def export(document):
+            if self.metrics:
+                started = time.perf_counter()
+            for writer in document_writers:
+                writer.write_document(document)
+            if writers:
+                for record in document.records():
+                    for writer in writers:
+                        writer.write(record)
+            if self.metrics:
+                self.metrics.observe('export', time.perf_counter() - started)
+        
+        exporting = bool(writers or document_writers)
+        count = 0
+        with self._writer_thread(export if exporting else None) as writer_thread:
+            for html_file, document in self._iter_file_documents(html_files):
+                if document is None:
+                    continue
+                if writers:
+                    self._note_streamed(document)
+                else:
+                    self.documents.append(document)
+                if writer_thread:
+                    writer_thread.put(document)
+                elif exporting:
+                    export(document)
+                count += document.record_count()
+        
+        print(f"Toplam {count} kayıt çıkarıldı.")
+        if self.batch_filter and self.batch_filter.skipped:
+            print(f"Ön filtre: {self.batch_filter.summary()}.")
         
-        print(f"Toplam {len(self.parsed_data)} kayıt çıkarıldı.")
+        if self.cache:
+            print(f"Önbellek: {self.cache.hits} isabet, {self.cache.misses} ıska.")
+    
+    def _note_streamed(self, document):
+        """Yazıcılara akan belgeden özet bilgilerini (satır sayısı, irsaliye no, ilk 5 satır) alır"""
+        self.streamed_records += document.record_count()
+        if document.irsaliye_no:
+            self.irsaliye_numbers.add(document.irsaliye_no)
+        if len(self.sample_records) < 5:
+            self.sample_records.extend(itertools.islice(document.records(), 5 - len(self.sample_records)))
     
     def save_to_csv(self, output_file):
         """Verileri CSV formatında kaydeder"""
-        if not self.parsed_data:
+        if not self.documents:
             print("Kaydedilecek veri bulunamadı!")
             return
         
-        fieldnames = [
-            'dosya_adi', 'irsaliye_no', 'irsaliye_tarihi', 'sevk_adresi', 
-            'sevk_edilen_kisi', 'sevk_edilen_tel', 'malzeme_kodu', 'malzeme_aciklama', 'adeti', 'not_bilgileri'
-        ]
-        
-        with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for row in self.parsed_data:
-                writer.writerow(row)
+        started = time.perf_counter()
+        with CsvRecordWriter(output_file) as writer:
+            for row in iter_document_records(self.documents):
+                writer.write(row)
+        if self.metrics:
+            self.metrics.observe('export', time.perf_counter() - started)
         
         print(f"Veriler {output_file} dosyasına kaydedildi.")
     
     def save_to_json(self, output_file):
         """Verileri JSON formatında kaydeder"""
-        if not self.parsed_data:
+        if not self.documents:
             print("Kaydedilecek veri bulunamadı!")
             return
         
-        with open(output_file, 'w', encoding='utf-8') as jsonfile:
-            json.dump(self.parsed_data, jsonfile, ensure_ascii=False, indent=2)
+        # Satırlar tek tek yazılır; çıktı json.dump(indent=2) ile aynıdır
+        started = time.perf_counter()
+        with JsonArrayRecordWriter(output_file) as writer:
+            for row in iter_document_records(self.documents):
+                writer.write(row)
+        if self.metrics:
+            self.metrics.observe('export', time.perf_counter() - started)
         
         print(f"Veriler {output_file} dosyasına kaydedildi.")
     
-    def print_summary(self):
-        """Parse edilen verilerin özetini gösterir"""
-        if not self.parsed_data:
+    def print_summary(self, aggregator=None):
+        """Parse edilen verilerin özetini gösterir; aggregator verilirse malzeme/adres/gün toplamlarını da"""
+        if self.documents:
+            record_total = self.record_count()
+            unique_invoices = len(set(document.irsaliye_no for document in self.documents if document.irsaliye_no))
+            samples = itertools.islice(iter_document_records(self.documents), 5)
+        else:
+            # Satırlar parse sırasında yazıcılara aktı
+            record_total = self.streamed_records
+            unique_invoices = len(self.irsaliye_numbers)
+            samples = self.sample_records
+        if not record_total:
             print("Parse edilen veri bulunamadı!")
             return
         
         print("\n=== İRSALİYE VERİLERİ ÖZETİ ===")
-        print(f"Toplam kayıt sayısı: {len(self.parsed_data)}")
+        print(f"Toplam kayıt sayısı: {record_total}")
         
         # Benzersiz irsaliye sayısı
-        unique_invoices = len(set(entry['irsaliye_no'] for entry in self.parsed_data if entry['irsaliye_no']))
         print(f"Benzersiz irsaliye sayısı: {unique_invoices}")
         
         # İlk 5 kaydı göster
         print("\nİlk 5 kayıt:")
-        for i, entry in enumerate(self.parsed_data[:5], 1):
+        for i, entry in enumerate(samples, 1):
             print(f"{i}. {entry['irsaliye_no']} ({entry['irsaliye_tarihi']}) - {entry['malzeme_kodu']} - {entry['adeti']} adet")
+        
+        if aggregator is not None:
+            aggregator.print_top()
 
-def main():
-    # HTML dosyalarının bulunduğu klasör
-    html_folder = "/Users/esat/Desktop/Yga İrsaliyeler"
+class IncrementalSync:
+    """Klasörü manifest ile karşılaştırıp sadece yeni/değişen dosyaları parse eder
     
-    # Parser'ı başlat
-    parser = IrsaliyeParserV2(html_folder)
+    Manifest her dosya için (boyut, mtime, sha256) -> irsaliye_no bilgisini ve son
+    başarılı çalışmadan sonraki çıktı boyutlarını tutar. Yeni satırlar CSV ve JSON
+    Lines çıktısına eklenir; değişen veya silinen dosyaların eski satırları
+    çıktılardan ayıklanır. store verilirse SQLite deposu da aynı şekilde güncellenir.
+    Okunamayan veya parse edilemeyen dosyalar manifest'e yazılmaz, sonraki
+    çalışmada tekrar denenir. Parse edilen dosyanın girdisinde ön filtrenin QR
+    (no, tarih) anahtarı ('anahtar') tutulur; sonraki çalışmalarda bu irsaliyelerin
+    kopyaları da tekrar sayılır. Tekrar diye atlanan dosyanın girdisinde parse
+    edilen kopyası ('ayni') tutulur; kopya silinir veya değişirse dosya yeniden
+    değerlendirilir.
+    
+    Çıktılar ve manifest birlikte güncellenir. Ayıklanacak satır yoksa yeni satırlar
+    sona eklenir ve manifest en son yazılır; çalışma yarıda kalırsa sonraki çalışma
+    çıktıları manifest'teki boyutlara kırpar. Ayıklanacak satır varsa çıktılar tek
+    geçişte (kalan satırlar + yeni satırlar) .tmp dosyalarına yazılır ve manifest.tmp
+    ile birlikte commit işaret dosyası oluşturulduktan sonra yerlerine taşınır;
+    taşıma yarıda kalırsa sonraki çalışma tamamlar.
+    
+    Manifest'teki dosyaların hiçbiri klasörde bulunamazsa (klasör boş, bağlanmamış
+    ağ paylaşımı) çalışma durdurulur; allow_delete_all verilmedikçe çıktılar ve
+    depo boşaltılmaz.
+    """
+    
+    MANIFEST_VERSION = 2
+    
+    def __init__(self, parser, output_folder, prefix, store=None, allow_delete_all=False):
+        self.parser = parser
+        self.store = store
+        self.allow_delete_all = allow_delete_all
+        self.csv_path = os.path.join(output_folder, f"{prefix}.csv")
+        self.jsonl_path = os.path.join(output_folder, f"{prefix}.jsonl")
+        self.manifest_path = os.path.join(output_folder, f"{prefix}.manifest.json")
+        self.commit_path = os.path.join(output_folder, f"{prefix}.commit")
+    
+    def output_paths(self):
+        return {'csv': self.csv_path, 'jsonl': self.jsonl_path}
     
-    # Tüm HTML dosyalarını parse et
-    parser.parse_all_html_files()
+    def load_manifest(self):
+        """(dosya girdileri, son başarılı çalışmadaki çıktı boyutları) döndürür; eski biçimde boyutlar None"""
+        if not os.path.exists(self.manifest_path):
+            # Manifest yoksa mevcut çıktılar yarıda kalmış ilk çalışmadandır
+            return {}, {'csv': 0, 'jsonl': 0}
+        with open(self.manifest_path, encoding='utf-8') as manifest_file:
+            manifest = json.load(manifest_file)
+        if manifest.get('surum') != self.MANIFEST_VERSION:
+            return manifest, None
+        return manifest['dosyalar'], manifest['cikti']
     
-    # Özet bilgileri göster
-    parser.print_summary()
+    def save_manifest(self, files, output_sizes, replace=True):
+        """Manifest'i .tmp dosyasına yazar; replace ise yerine taşır"""
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump({'surum': self.MANIFEST_VERSION, 'cikti': output_sizes, 'dosyalar': files}, manifest_file,
+                      ensure_ascii=False, indent=1, sort_keys=True)
+        if replace:
+            os.replace(tmp_path, self.manifest_path)
     
-    # Verileri kaydet
-    output_folder = "/Users/esat/yga_html_parser"
-    parser.save_to_csv(f"{output_folder}/irsaliye_verileri_final.csv")
-    parser.save_to_json(f"{output_folder}/irsaliye_verileri_final.json")
+    def recover(self, output_sizes):
+        """Yarıda kalan çalışmanın izlerini temizler
+        
+        Commit işareti varsa taşıma tamamlanır, yoksa .tmp dosyaları silinir; sona
+        eklenip manifest'e girmemiş satırlar output_sizes'a kırpılarak atılır.
+        """
+        paths = list(self.output_paths().values()) + [self.manifest_path]
+        if os.path.exists(self.commit_path):
+            for path in paths:
+                if os.path.exists(path + '.tmp'):
+                    os.replace(path + '.tmp', path)
+            os.remove(self.commit_path)
+            return True
+        for path in paths:
+            if os.path.exists(path + '.tmp'):
+                os.remove(path + '.tmp')
+        if output_sizes is not None:
+            for key, path in self.output_paths().items():
+                if os.path.exists(path) and os.path.getsize(path) > output_sizes[key]:
+                    print(f"Önceki çalışma yarıda kalmış: {path} son kayıtlı boyutuna döndürülüyor.")
+                    os.truncate(path, output_sizes[key])
+        return False
+    
+    def scan(self, manifest):
+        """Değişmeyen girdileri, parse edilecek dosyaları ve silinen dosyaları ayırır"""
+        unchanged = {}
+        to_parse = []
+        files = {}
+        
+        for html_file in self.parser.find_html_files():
+            name = self.parser.file_name(html_file)
+            stat = html_file.stat()
+            files[name] = (html_file, stat)
+            entry = manifest.get(name)
+            if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns:
+                unchanged[name] = entry
+                continue
+            
+            # Boyut/mtime değişti: içerik aynıysa (ör. touch, yeniden kopyalama) parse etme
+            digest = hashlib.sha256(html_file.read_bytes()).hexdigest()
+            if entry and entry['sha256'] == digest:
+                unchanged[name] = dict(entry, size=stat.st_size, mtime=stat.st_mtime_ns)
+                continue
+            to_parse.append((html_file, stat, digest))
+        
+        # Tekrar diye atlanan dosyanın parse edilen kopyası silindi veya değiştiyse dosya tekrar
+        # değerlendirilir; yoksa irsaliye çıktılardan kaybolurdu. Eski manifest'lerdeki hatalı
+        # dosya girdileri (satırsız ve atlanmamış) de tekrar denenir.
+        for name, entry in list(unchanged.items()):
+            twin_gone = entry.get('atlandi') == SKIP_DUPLICATE and entry.get('ayni') not in unchanged
+            legacy_failure = not entry.get('kayit') and not entry.get('atlandi')
+            if twin_gone or legacy_failure:
+                html_file, stat = files[name]
+                to_parse.append((html_file, stat, entry['sha256']))
+                del unchanged[name]
+        
+        deleted = set(manifest) - set(unchanged) - {self.parser.file_name(html_file) for html_file, _, _ in to_parse}
+        return unchanged, to_parse, deleted
+    
+    def write_kept_rows(self, names):
+        """Verilen dosya adlarına ait olmayan satırları çıktıların .tmp kopyalarına yazar"""
+        if os.path.exists(self.csv_path):
+            with open(self.csv_path, newline='', encoding='utf-8') as csvfile, \
+                    CsvRecordWriter(self.csv_path + '.tmp') as writer:
+                for row in csv.DictReader(csvfile):
+                    if row['dosya_adi'] not in names:
+                        writer.write(row)
+        
+        if os.path.exists(self.jsonl_path):
+            with open(self.jsonl_path, encoding='utf-8') as source, \
+                    open(self.jsonl_path + '.tmp', 'w', encoding='utf-8') as target:
+                for line in source:
+                    if json.loads(line)['dosya_adi'] not in names:
+                        target.write(line)
+    
+    def run(self):
+        """Çıktıları günceller; tüm dosyalar silinmiş görünüp allow_delete_all verilmediyse False döndürür"""
+        manifest, output_sizes = self.load_manifest()
+        if self.recover(output_sizes):
+            manifest, output_sizes = self.load_manifest()
+        unchanged, to_parse, deleted = self.scan(manifest)
+        
+        if manifest and not unchanged and not to_parse and not self.allow_delete_all:
+            print(f"Hata: manifest'teki {len(manifest)} dosyanın hiçbiri {self.parser.html_folder_path} "
+                  f"klasöründe bulunamadı; çıktılar değiştirilmedi. Tüm kayıtları silmek için "
+                  f"--allow-delete-all verin.")
+            return False
+        
+        # Değişen ve silinen dosyaların eski satırları çıkarılır, yenileri sona eklenir
+        names = {html_file: self.parser.file_name(html_file) for html_file, _, _ in to_parse}
+        stale = {name for name in deleted | set(names.values()) if manifest.get(name, {}).get('kayit')}
+        print(f"{len(unchanged)} dosya değişmedi, {len(to_parse)} dosya parse edilecek, "
+              f"{len(deleted)} dosya silindi.")
+        
+        if stale and self.store:
+            self.store.delete_files(stale)
+        
+        new_manifest = dict(unchanged)
+        html_files = [html_file for html_file, _, _ in to_parse]
+        batch_filter = None
+        if self.parser.prefilter:
+            # Önceki çalışmalarda parse edilen irsaliyelerin kopyaları da çıktılara tekrar eklenmez
+            batch_filter = BatchFilter()
+            for name, entry in unchanged.items():
+                if entry.get('anahtar'):
+                    batch_filter.seed(entry['anahtar'], name)
+        file_info = {names[html_file]: (stat, digest) for html_file, stat, digest in to_parse}
+        # Satır ayıklanacaksa çıktılar tek geçişte yeniden yazılır, yoksa sona eklenir
+        targets = {key: path + '.tmp' if stale else path for key, path in self.output_paths().items()}
+        
+        count = 0
+        failed = 0
+        if stale:
+            self.write_kept_rows(stale)
+        with CsvRecordWriter(targets['csv'], append=True) as csv_writer, \
+                JsonLinesRecordWriter(targets['jsonl'], append=True) as jsonl_writer:
+            def export(document):
+                if self.store:
+                    self.store.write_document(document)
+                started = time.perf_counter()
+                for record in document.records():
+                    csv_writer.write(record)
+                    jsonl_writer.write(record)
+                if self.parser.metrics:
+                    self.parser.metrics.observe('export', time.perf_counter() - started)
+            
+            # Manifest ana thread'de, çıktılar (readers > 0 ise) yazıcı thread'inde güncellenir
+            with self.parser._writer_thread(export) as writer_thread:
+                for html_file, document in self.parser._iter_file_documents(html_files, batch_filter):
+                    name = names[html_file]
+                    if document is None and name not in self.parser.skipped_files:
+                        # Okunamadı veya parse edilemedi: manifest'e girmez, sonraki çalışmada tekrar denenir
+                        failed += 1
+                        continue
+                    
+                    record_count = 0
+                    if document is not None:
+                        if writer_thread:
+                            writer_thread.put(document)
+                        else:
+                            export(document)
+                        record_count = document.record_count()
+                    count += record_count
+                    
+                    stat, digest = file_info[name]
+                    new_manifest[name] = {
+                        'size': stat.st_size,
+                        'mtime': stat.st_mtime_ns,
+                        'sha256': digest,
+                        'irsaliye_no': document.irsaliye_no if document is not None else '',
+                        'kayit': record_count,
+                    }
+                    if name in self.parser.skipped_files:
+                        new_manifest[name]['atlandi'] = self.parser.skipped_files[name]
+                        if name in batch_filter.duplicate_of:
+                            new_manifest[name]['ayni'] = batch_filter.duplicate_of[name]
+                    elif batch_filter and name in batch_filter.keys:
+                        new_manifest[name]['anahtar'] = list(batch_filter.keys[name])
+        
+        new_sizes = {key: os.path.getsize(path) for key, path in targets.items()}
+        if stale:
+            self.save_manifest(new_manifest, new_sizes, replace=False)
+            # İşaretten sonra yarıda kalan taşıma sonraki çalışmada recover() ile tamamlanır
+            open(self.commit_path, 'w').close()
+            self.recover(None)
+        else:
+            self.save_manifest(new_manifest, new_sizes)
+        
+        print(f"{count} yeni kayıt eklendi, {len(stale)} dosyanın eski kayıtları çıkarıldı.")
+        if failed:
+            print(f"{failed} dosya işlenemedi; sonraki çalışmada tekrar denenecek.")
+        if self.parser.batch_filter and self.parser.batch_filter.skipped:
+            print(f"Ön filtre: {self.parser.batch_filter.summary()}.")
+        print(f"Veriler {self.csv_path} ve {self.jsonl_path} dosyalarına kaydedildi.")
+        return True
+
+
+def run_query(store, args):
+    """SQLite deposunu filtrelerle sorgular, sonucu CSV olarak stdout'a yazar"""
+    started = time.perf_counter()
+    rows = store.query(irsaliye_no=args.irsaliye_no, malzeme_kodu=args.malzeme_kodu, sevk_adresi=args.adres,
+                       tarih_baslangic=args.tarih_baslangic, tarih_bitis=args.tarih_bitis, limit=args.limit)
+    elapsed = (time.perf_counter() - started) * 1000
+    
+    writer = csv.DictWriter(sys.stdout, fieldnames=FIELDNAMES)
+    writer.writeheader()
+    writer.writerows(rows)
+    print(f"{len(rows)} satır bulundu ({elapsed:.1f} ms).", file=sys.stderr)
+
+
+def write_aggregates(aggregator, output_base):
+    """Toplamları grup başına <output_base>.<grup>.csv ve <output_base>.ozet.json dosyalarına yazar"""
+    paths = []
+    for group in AGGREGATE_GROUPS:
+        paths.append(f"{output_base}.{group}.csv")
+        aggregator.write_csv(group, paths[-1])
+    summary_path = f"{output_base}.ozet.json"
+    with open(summary_path, 'w', encoding='utf-8') as summary_file:
+        json.dump(aggregator.summary(), summary_file, ensure_ascii=False, indent=1)
+        summary_file.write('\n')
+    print(f"Toplamlar {', '.join(paths)} ve {summary_path} dosyalarına kaydedildi.")
+
+
+def write_run_summary(path, parser, args, elapsed, files_found):
+    """Çalışmanın makine tarafından okunacak JSON özetini yazar ('-' ise stdout)"""
+    summary = {
+        'input': args.input,
+        'mode': args.mode,
+        'workers': parser.workers,
+        'readers': parser.readers,
+        'files_found': files_found,
+        'elapsed_s': round(elapsed, 3),
+        'docs_per_sec': round(files_found / elapsed, 1) if elapsed else None,
+        **parser.metrics.summary(),
+    }
+    if parser.cache:
+        summary['cache'] = {'hits': parser.cache.hits, 'misses': parser.cache.misses}
+    
+    if path == '-':
+        print(json.dumps(summary, ensure_ascii=False, indent=1))
+        return
+    with open(path, 'w', encoding='utf-8') as summary_file:
+        json.dump(summary, summary_file, ensure_ascii=False, indent=1)
+        summary_file.write('\n')
+    print(f"Çalışma özeti {path} dosyasına kaydedildi.")
+
+
+def build_arg_parser():
+    arg_parser = argparse.ArgumentParser(description="HTML e-irsaliyelerden CSV/JSON veri çıkarır")
+    arg_parser.add_argument('input', nargs='?', help="HTML dosyalarının bulunduğu klasör (query modunda gerekmez)")
+    arg_parser.add_argument('-o', '--output', default='.', help="Çıktı klasörü (varsayılan: .)")
+    arg_parser.add_argument('--prefix', default='irsaliye_verileri_final',
+                            help="Çıktı dosya adlarının ön eki")
+    arg_parser.add_argument('--mode', choices=['full', 'incremental', 'query'], default='full',
+                            help="full: tüm klasörü parse edip CSV/JSON yazar; "
+                                 "incremental: sadece yeni/değişen dosyaları parse edip CSV/JSONL çıktısını günceller; "
+                                 "query: --sqlite deposunu sorgular")
+    arg_parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(),
+                            help="Paralel worker sayısı (varsayılan: çekirdek sayısı)")
+    arg_parser.add_argument('--readers', type=int, default=4,
+                            help="Dosyaları parse'tan önce okuyan thread sayısı; okuma, parse ve yazma örtüşür "
+                                 "(varsayılan: 4, 0: okuma parse ile aynı thread'de)")
+    arg_parser.add_argument('--prefetch', type=int, default=32,
+                            help="Önceden okunup bellekte bekleyebilecek en fazla dosya sayısı (varsayılan: 32)")
+    arg_parser.add_argument('-r', '--recursive', action='store_true',
+                            help="Alt klasörlerdeki HTML dosyalarını da işle (dosya_adi göreli yol olur)")
+    arg_parser.add_argument('--cache', help="Sonuç önbelleği (varsayılan: <output>/irsaliye_cache.sqlite3)")
+    arg_parser.add_argument('--no-cache', action='store_true', help="Sonuç önbelleğini kullanma")
+    arg_parser.add_argument('--columnar', action='append', choices=COLUMNAR_FORMATS, default=[],
+                            help="full modda ayrıca <prefix>.irsaliye.<biçim> ve <prefix>.kalem.<biçim> "
+                                 "tablolarını yaz (pyarrow gerekir, tekrarlanabilir)")
+    arg_parser.add_argument('--aggregate', action='store_true',
+                            help="Malzeme kodu, sevk adresi ve gün toplamlarını <prefix>.<malzeme|adres|gun>.csv ve "
+                                 "<prefix>.ozet.json olarak yaz (full modda parse sırasında hesaplanır)")
+    arg_parser.add_argument('--allow-delete-all', action='store_true',
+                            help="incremental modda manifest'teki dosyaların hiçbiri bulunamazsa da çalış "
+                                 "(tüm eski kayıtlar çıktılardan ve depodan silinir)")
+    arg_parser.add_argument('--no-prefilter', action='store_true',
+                            help="İrsaliye olmayan ve QR no + tarihi tekrar eden dosyaları da parse et")
+    arg_parser.add_argument('--summary', metavar='PATH',
+                            help="Aşama süreleri, sayaçlar ve encoding dağılımını içeren JSON özeti yaz ('-': stdout)")
+    arg_parser.add_argument('--file-log', choices=FILE_LOG_MODES, default='print',
+                            help="Dosya başına ilerleme satırları: print (varsayılan), logging veya off")
+    arg_parser.add_argument('--sqlite', help="İrsaliyeleri bu SQLite deposuna da yaz (irsaliye_no ile tekil) "
+                                             "veya query modunda bu depoyu sorgula")
+    
+    query_group = arg_parser.add_argument_group("query modu filtreleri")
+    query_group.add_argument('--irsaliye-no', help="İrsaliye numarası (tam eşleşme)")
+    query_group.add_argument('--malzeme-kodu', help="Malzeme kodu (tam eşleşme)")
+    query_group.add_argument('--adres', help="Sevk adresinde geçen metin")
+    query_group.add_argument('--tarih-baslangic', help="Bu tarihten itibaren (YYYY-MM-DD)")
+    query_group.add_argument('--tarih-bitis', help="Bu tarihe kadar (YYYY-MM-DD)")
+    query_group.add_argument('--limit', type=int, default=1000, help="En fazla satır (varsayılan: 1000)")
+    return arg_parser
+
+
+def main(argv=None):
+    arg_parser = build_arg_parser()
+    args = arg_parser.parse_args(argv)
+    if args.mode == 'query':
+        if not args.sqlite:
+            arg_parser.error("query modu için --sqlite ile depo verilmeli")
+        if not os.path.exists(args.sqlite):
+            arg_parser.error(f"SQLite deposu bulunamadı: {args.sqlite}")
+        with IrsaliyeStore(args.sqlite) as store:
+            run_query(store, args)
+        return
+    if args.input is None:
+        arg_parser.error("HTML klasörü (input) verilmeli")
+    # Bağlanmamış paylaşım boş klasör gibi görünmesin: artımlı modda tüm kayıtlar silinirdi
+    if not os.path.isdir(args.input):
+        arg_parser.error(f"HTML klasörü bulunamadı: {args.input}")
+    if args.file_log == 'logging':
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    if args.columnar and args.mode == 'incremental':
+        arg_parser.error("--columnar sadece full modda kullanılabilir (Parquet/Arrow dosyalarına ekleme yapılamaz)")
+    if args.columnar and not columnar_available():
+        arg_parser.error("--columnar için pyarrow kurulmalı: pip install pyarrow")
+    os.makedirs(args.output, exist_ok=True)
+    
+    cache_path = None
+    if not args.no_cache:
+        cache_path = args.cache or os.path.join(args.output, 'irsaliye_cache.sqlite3')
+    
+    # Parser'ı başlat
+    # Ölçüm kancaları sadece özet istendiğinde açılır
+    parser = IrsaliyeParserV2(args.input, workers=args.workers, cache_path=cache_path,
+                              metrics=ParseMetrics() if args.summary else None, file_log=args.file_log,
+                              prefilter=not args.no_prefilter, readers=args.readers, prefetch_depth=args.prefetch,
+                              recursive=args.recursive)
+    store = IrsaliyeStore(args.sqlite) if args.sqlite else None
+    started = time.perf_counter()
+    
+    try:
+        if args.mode == 'incremental':
+            sync = IncrementalSync(parser, args.output, args.prefix, store=store,
+                                   allow_delete_all=args.allow_delete_all)
+            if not sync.run():
+                sys.exit(1)
+            if args.aggregate:
+                # Toplamlar tüm çıktıya göre olmalı; güncellenmiş JSON Lines dosyası bir kez okunur
+                with Aggregator() as aggregator, open(sync.jsonl_path, encoding='utf-8') as records_file:
+                    for line in records_file:
+                        aggregator.write(json.loads(line))
+                aggregator.print_top()
+                write_aggregates(aggregator, os.path.join(args.output, args.prefix))
+            if args.summary:
+                write_run_summary(args.summary, parser, args, time.perf_counter() - started,
+                                  parser.metrics.counters['files'])
+            return
+        
+        # Tüm HTML dosyalarını parse et; kolon bazlı çıktılar, SQLite deposu ve toplamlar parse sırasında yazılır
+        output_base = os.path.join(args.output, args.prefix)
+        document_writers = [ColumnarDocumentWriter.for_base(output_base, file_format) for file_format in args.columnar]
+        if store:
+            document_writers.append(store)
+        # Toplamlar sadece istendiğinde hesaplanır
+        aggregator = Aggregator() if args.aggregate else None
+        if aggregator:
+            document_writers.append(aggregator)
+        # CSV ve JSON satırları da parse sırasında .tmp dosyalarına akar; belgeler bellekte birikmez
+        record_paths = [f"{output_base}.csv", f"{output_base}.json"]
+        writers = [CsvRecordWriter(record_paths[0] + '.tmp'), JsonArrayRecordWriter(record_paths[1] + '.tmp')]
+        try:
+            parser.parse_all_html_files(writers=writers, document_writers=document_writers)
+        finally:
+            for writer in writers + document_writers:
+                if writer is not store:
+                    writer.close()
+        for file_format in args.columnar:
+            print(f"Veriler {' ve '.join(columnar_paths(output_base, file_format))} dosyalarına kaydedildi.")
+        
+        # Özet bilgileri göster
+        parser.print_summary(aggregator)
+        
+        # Verileri kaydet (veri yoksa dosya oluşturulmaz)
+        for path in record_paths:
+            if parser.streamed_records:
+                os.replace(path + '.tmp', path)
+                print(f"Veriler {path} dosyasına kaydedildi.")
+            else:
+                os.remove(path + '.tmp')
+                print("Kaydedilecek veri bulunamadı!")
+        if aggregator:
+            write_aggregates(aggregator, output_base)
+        if args.summary:
+            write_run_summary(args.summary, parser, args, time.perf_counter() - started,
+                              len(parser.find_html_files()))
+    finally:
+        parser.close()
+        if store:
+            store.flush()
+            stats = store.stats()
+            store.close()
+            print(f"SQLite deposu {args.sqlite}: {stats['irsaliye']} irsaliye, {stats['kalem']} kalem"
+                  + (f" ({store.skipped} belge irsaliye_no olmadığı için atlandı)" if store.skipped else ""))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file